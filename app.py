@@ -1,13 +1,24 @@
+import os
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 from matplotlib import colors as mcolors
-from matplotlib.patches import FancyArrowPatch
 import seaborn as sns
-import community as community_louvain  # Certifique-se de ter isso no início
-from collections import Counter
+from graph_cache import GraphCache, edge_list_fingerprint
+from ingest import PARQUET_DISPONIVEL, read_edge_list, read_edge_parquet
+from preprocess import preprocess_frame
+from incremental import LiveGraph
+from layout import ProgressiveLayout, force_layout, subgraph_positions
+import graph_store
+from render import MAX_ARESTAS_DETALHADAS, draw_edges, positions_array
+from metric_engine import MetricEngine, undirected_copy
+from metric_jobs import DONE, FAILED, MetricJobs
+import community_service
+import degree_stats
+from network_view import MAX_NOS_INTERATIVO, build_payload, reduce_graph, render_html
 
 # Configuração da página
 st.set_page_config(layout="wide", page_title="Análise de Redes")
@@ -19,10 +30,155 @@ Carregue um arquivo CSV com colunas 'source' e 'target' para começar.
 """
 )
 
+# Colunas opcionais aproveitadas na leitura (as demais, como tweet_text, são ignoradas)
+COLUNA_PESO = "weight"
+COLUNA_DATA = "tweet_date"
+
+
+def carregar_arestas(origem):
+    """Lê apenas as colunas do grafo, em blocos, de um arquivo, buffer ou URL."""
+    nome = str(getattr(origem, "name", origem))
+    if nome.lower().endswith(".parquet"):
+        return read_edge_parquet(origem, weight=COLUNA_PESO, time=COLUNA_DATA)
+    return read_edge_list(origem, weight=COLUNA_PESO, time=COLUNA_DATA)
+
+
+# CSV gravado pelo scraper (ver scrapper_tweet_sel_rouanet.py), sugerido no monitoramento
+CSV_MONITORADO_PADRAO = "tweets_rouanet_graph.csv"
+# Diretório Parquet particionado por janela gravado pelo scraper (ver parquet_store.py)
+PARQUET_DIR_PADRAO = "tweets_rouanet_parquet"
+
+# Diretório dos grafos exportados no formato binário (.rgraph)
+GRAFOS_DIR = "grafos_binarios"
+
+# Grafos a partir deste tamanho têm o layout exibido progressivamente,
+# com um quadro novo a cada QUADROS_A_CADA iterações
+MIN_NOS_LAYOUT_PROGRESSIVO = 1000
+QUADROS_A_CADA = 10
+
+
+@st.cache_resource
+def abrir_grafo_binario(caminho, modificado_em):
+    """
+    Abre um .rgraph por memory-map, uma única vez por arquivo e versão.
+
+    O objeto é compartilhado entre as sessões; `modificado_em` só entra na
+    chave do cache para que um arquivo regravado seja reaberto.
+    """
+    return graph_store.load_graph(caminho)
+
+
 # Inicializa session_state se necessário
 if "df" not in st.session_state:
     st.session_state.df = None
 
+
+@st.cache_resource
+def obter_cache_de_grafos():
+    """Cache de grafos compartilhado entre reexecuções e sessões."""
+    return GraphCache(max_entries=4, max_bytes=2 * 1024**3)
+
+
+@st.cache_resource
+def obter_motor_de_metricas():
+    """Motor de métricas memoizado, compartilhado por todos os painéis."""
+    return MetricEngine(max_entries=256)
+
+
+def obter_tarefas_da_sessao():
+    """Fila de métricas em segundo plano desta sessão (ver metric_jobs)."""
+    if "metric_jobs" not in st.session_state:
+        st.session_state.metric_jobs = MetricJobs(obter_motor_de_metricas())
+    return st.session_state.metric_jobs
+
+
+# Intervalo (s) com que o painel de métricas confere as tarefas em andamento
+INTERVALO_DAS_TAREFAS = 1.0
+
+# Partição usada pelo painel de métricas e pelos super-nós da visualização
+# interativa (a mesma do painel de comunidades com as opções padrão)
+PARTICAO_PADRAO = {"algorithm": "louvain", "resolution": 1.0, "seed": 42}
+ALGORITMOS_DE_COMUNIDADES = {
+    "Louvain": "louvain",
+    "Propagação de rótulos (rápido)": "label_propagation",
+}
+RESOLUCOES_DA_VARREDURA = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+# Métricas do painel estrutural calculadas em segundo plano: (nome, parâmetros)
+METRICAS_EM_SEGUNDO_PLANO = (
+    ("clustering", {}),
+    ("katz", {}),
+    ("pagerank", {}),
+    ("partition", PARTICAO_PADRAO),
+    ("scc", {}),
+    ("wcc", {}),
+    ("distances", {}),
+)
+# Acima destes tamanhos as distâncias (varredura de todos os pares) só são
+# calculadas quando pedidas no painel, e não a cada carregamento
+MAX_NOS_DISTANCIAS_AUTOMATICAS = 20000
+MAX_ARESTAS_DISTANCIAS_AUTOMATICAS = 200000
+# Acima deste número de nós o painel de comunidades abre no modo super-grafo
+MAX_NOS_DESENHO_INDIVIDUAL = 2000
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def layout_em_cache(chave, _grafo):
+    """
+    Layout multinível de um grafo derivado (super-grafo ou uma comunidade).
+
+    `chave` identifica o grafo (fingerprint, partição, filtro...); `_grafo`
+    não entra no hash do cache.
+    """
+    return force_layout(_grafo, seed=42)
+
+# Reduções oferecidas na visualização interativa (rótulo -> método de network_view)
+REDUCOES_INTERATIVAS = {
+    "Núcleo k (k-core)": "kcore",
+    "Nós de maior PageRank": "top",
+    "Comunidades como super-nós": "communities",
+}
+
+
+@st.cache_data(max_entries=16, show_spinner="Montando a visualização interativa...")
+def montar_visao_interativa(fingerprint, metodo, max_nos, _compacto, _pontuacoes, _grupos=None):
+    """
+    HTML da visualização interativa, montado uma vez por grafo, redução e limite.
+
+    Os argumentos com "_" não entram na chave do cache: o fingerprint já
+    identifica o grafo do qual eles derivam.
+
+    Returns:
+        tuple: (html, descrição da redução, nós enviados, arestas enviadas)
+    """
+    visao = reduce_graph(_compacto, metodo, max_nos, scores=_pontuacoes, groups=_grupos)
+    reduzido = visao.graph
+    if metodo == "communities":
+        valores = visao.members
+        rotulos = _compacto.labels.to_numpy()
+        titulos = []
+        for grupo, tamanho in zip(visao.original_ids, visao.members):
+            membros = np.flatnonzero(_grupos == grupo)
+            principais = membros[np.argsort(-_pontuacoes[membros])[:3]]
+            titulos.append(
+                f"Comunidade {grupo}\n{tamanho} nós\nPrincipais: "
+                + ", ".join(str(r) for r in rotulos[principais])
+            )
+    else:
+        valores = _pontuacoes[visao.original_ids]
+        graus = _compacto.degree()[visao.original_ids]
+        titulos = [
+            f"{rotulo}\nPageRank: {valor:.4f}\nGrau: {grau}"
+            for rotulo, valor, grau in zip(reduzido.labels, valores, graus)
+        ]
+    payload = build_payload(visao, valores, titulos, directed=metodo != "communities")
+    return (
+        render_html(payload, height=700),
+        visao.note,
+        reduzido.number_of_nodes(),
+        len(payload["edges"]["from"]),
+    )
+
+
 # Upload do arquivo - versão com opções
 st.markdown("### 📁 Selecione a fonte dos dados")
 load_option = st.radio(
@@ -30,23 +186,65 @@ load_option = st.radio(
     options=[
         "📤 Upload manual (seu arquivo CSV)",
         "🌐 URL do GitHub (raw)",
-        "📦 Exemplos pré-configurados"
+        "📦 Exemplos pré-configurados",
+        "💾 Grafo binário (.rgraph)",
+        "🗂️ Parquet particionado (local)",
+        "📡 Monitorar coleta (CSV ao vivo)"
     ],
     horizontal=True,
     label_visibility="collapsed"
 )
 
+# Pré-processamento aplicado a toda lista de arestas carregada (upload, URL,
+# exemplos, Parquet e o estado da coleta ao vivo); um .rgraph já vem limpo
+preprocessar, minusculas, colapsar_pesos = True, False, False
+if load_option != "💾 Grafo binário (.rgraph)":
+    with st.expander("🧹 Pré-processamento ao carregar"):
+        preprocessar = st.checkbox(
+            "Remover linhas sem destino, auto-laços e duplicatas",
+            value=True,
+            key="preprocess_enabled",
+            help="Dispensa gerar cópias *_filtrado.csv com o solo_node_remover.py"
+        )
+        minusculas = st.checkbox(
+            "Normalizar os @ para minúsculas", value=False,
+            key="preprocess_lowercase", disabled=not preprocessar,
+            help="Só para @ do Twitter, que não diferenciam maiúsculas. Deixe desmarcado "
+            "para rótulos em que a caixa importa (ex: títulos da Wikipedia)."
+        )
+        colapsar_pesos = st.checkbox(
+            f"Colapsar arestas paralelas numa coluna '{COLUNA_PESO}'", value=False,
+            key="preprocess_weights", disabled=not preprocessar
+        )
+
+
+def preprocessar_arestas(df):
+    """Aplica o pré-processamento escolhido acima a uma lista de arestas recém-carregada."""
+    st.session_state.preprocess_summary = None
+    if not preprocessar:
+        return df
+    df, resumo = preprocess_frame(df, lowercase=minusculas, weights=colapsar_pesos, weight=COLUNA_PESO)
+    st.session_state.preprocess_summary = resumo.summary()
+    return df
+
+
 if load_option == "📤 Upload manual (seu arquivo CSV)":
     st.markdown("#### Faça upload do seu arquivo CSV")
     uploaded_file = st.file_uploader(
         "Arraste e solte ou clique para procurar",
-        type="csv",
+        type=["csv", "parquet"] if PARQUET_DISPONIVEL else "csv",
         key="file_uploader",
-        help="Formatos suportados: CSV com colunas 'source' e 'target'"
+        help="Formatos suportados: CSV (ou Parquet) com colunas 'source' e 'target'"
     )
     if uploaded_file:
-        df = pd.read_csv(uploaded_file)
-        st.session_state.df = df
+        # Só relê o arquivo quando um novo upload é feito (ou as opções mudam)
+        chave_upload = (uploaded_file.file_id, preprocessar, minusculas, colapsar_pesos)
+        if st.session_state.get("uploaded_file_id") != chave_upload:
+            try:
+                st.session_state.df = preprocessar_arestas(carregar_arestas(uploaded_file))
+                st.session_state.uploaded_file_id = chave_upload
+            except Exception as e:
+                st.error(f"❌ Erro ao ler o arquivo: {str(e)}")
 
 elif load_option == "🌐 URL do GitHub (raw)":
     st.markdown("#### Carregar de URL GitHub (raw)")
@@ -70,8 +268,7 @@ elif load_option == "🌐 URL do GitHub (raw)":
                 with st.spinner("Carregando..."):
                     try:
                         if "raw.githubusercontent.com" in github_url:
-                            df = pd.read_csv(github_url)
-                            st.session_state.df = df
+                            st.session_state.df = preprocessar_arestas(carregar_arestas(github_url))
                             st.success("✅ Arquivo carregado com sucesso!")
                         else:
                             st.warning("⚠️ Use uma URL raw do GitHub (raw.githubusercontent.com)")
@@ -80,6 +277,142 @@ elif load_option == "🌐 URL do GitHub (raw)":
             else:
                 st.warning("⚠️ Por favor, insira uma URL válida")
 
+elif load_option == "💾 Grafo binário (.rgraph)":
+    st.markdown("#### Abrir grafo exportado (leitura instantânea via memory-map)")
+    arquivos = graph_store.list_graphs(GRAFOS_DIR)
+    if not arquivos:
+        st.info(
+            f"Nenhum grafo binário em '{GRAFOS_DIR}/'. Carregue um CSV e use "
+            "'💾 Exportar grafo binário' para criar um."
+        )
+    else:
+        arquivo = st.selectbox("Selecione o arquivo:", arquivos, key="rgraph_file")
+        if st.button("Abrir", key="load_rgraph_btn"):
+            caminho = os.path.join(GRAFOS_DIR, arquivo)
+            try:
+                # Só mapeia o arquivo: a lista de arestas e o DiGraph não são
+                # montados ao abrir (ver a visualização dos dados abaixo)
+                abrir_grafo_binario(caminho, os.path.getmtime(caminho))
+                st.session_state.df = None
+                st.session_state.grafo_binario = caminho
+                st.session_state.preprocess_summary = None
+                st.success(f"✅ {arquivo} aberto com sucesso!")
+            except Exception as e:
+                st.error(f"❌ Erro ao abrir o grafo binário: {str(e)}")
+
+elif load_option == "🗂️ Parquet particionado (local)":
+    st.markdown("#### Abrir a coleta em Parquet (só as colunas e o período necessários)")
+    if not PARQUET_DISPONIVEL:
+        st.info("Instale o pyarrow (`pip install pyarrow`) para ler arquivos Parquet.")
+    else:
+        caminho_parquet = st.text_input(
+            "Arquivo ou diretório Parquet",
+            value=PARQUET_DIR_PADRAO,
+            key="parquet_path",
+            help="Diretórios particionados (janela=AAAA-MM-DD) são lidos como um único conjunto"
+        )
+        filtrar_periodo = st.checkbox("Filtrar por período", key="parquet_filter_dates")
+        periodo = None
+        if filtrar_periodo:
+            periodo = st.date_input(
+                "Período (data dos tweets)",
+                value=(pd.Timestamp("2017-01-01"), pd.Timestamp("2022-12-31")),
+                key="parquet_dates",
+                help="Janelas fora do período são puladas sem serem lidas"
+            )
+        if st.button("Carregar", key="load_parquet_btn"):
+            if not os.path.exists(caminho_parquet):
+                st.warning(f"⚠️ Caminho não encontrado: {caminho_parquet}")
+            elif periodo is not None and len(periodo) != 2:
+                st.warning("⚠️ Selecione a data inicial e a final do período")
+            else:
+                with st.spinner("Carregando..."):
+                    try:
+                        inicio, fim = periodo if periodo is not None else (None, None)
+                        df = read_edge_parquet(
+                            caminho_parquet, weight=COLUNA_PESO, time=COLUNA_DATA,
+                            since=inicio, until=fim,
+                        )
+                        st.session_state.df = preprocessar_arestas(df)
+                        st.success(f"✅ {len(st.session_state.df)} arestas carregadas de {caminho_parquet}")
+                    except Exception as e:
+                        st.error(f"❌ Erro ao ler o Parquet: {str(e)}")
+
+elif load_option == "📡 Monitorar coleta (CSV ao vivo)":
+    st.markdown("#### Acompanhar um CSV que o scraper ainda está escrevendo")
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        caminho_monitorado = st.text_input(
+            "Caminho do CSV",
+            value=CSV_MONITORADO_PADRAO,
+            key="live_csv_path",
+            help="Só as linhas acrescentadas desde a última leitura são processadas"
+        )
+    with col2:
+        st.write("")  # Espaçamento
+        st.write("")  # Espaçamento
+        if st.button("Iniciar / reiniciar", key="live_start_btn"):
+            if os.path.exists(caminho_monitorado):
+                st.session_state.live_graph = LiveGraph(caminho_monitorado)
+            else:
+                st.warning(f"⚠️ Arquivo não encontrado: {caminho_monitorado}")
+
+    monitor = st.session_state.get("live_graph")
+    if monitor is not None:
+        intervalo = st.slider(
+            "Atualizar a cada (segundos)", 2, 60, 5, key="live_interval"
+        )
+        pausado = st.toggle("Pausar", key="live_paused")
+
+        @st.fragment(run_every=None if pausado else intervalo)
+        def painel_ao_vivo():
+            """Lê as linhas novas e mostra o estado do grafo sem recarregar a página."""
+            try:
+                atualizacao = monitor.poll()
+            except (OSError, ValueError) as e:
+                st.error(f"❌ Erro ao ler {monitor.path}: {str(e)}")
+                return
+            grafo = monitor.graph
+            if atualizacao.restarted:
+                st.info("ℹ️ O arquivo foi recriado; o grafo recomeçou do zero.")
+
+            n_comp, _ = grafo.components()
+            tamanhos = grafo.component_sizes()
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Nós", grafo.number_of_nodes(), delta=atualizacao.nodes or None)
+            c2.metric("Arestas", grafo.number_of_edges(), delta=atualizacao.edges or None)
+            c3.metric("Componentes fracos", n_comp)
+            c4.metric("Maior componente", int(tamanhos[0]) if len(tamanhos) else 0)
+            st.caption(
+                f"{atualizacao.rows} linhas novas nesta leitura • PageRank atualizado em "
+                f"{grafo.pagerank_iterations} iterações (partindo do vetor anterior)"
+            )
+
+            if grafo.number_of_nodes():
+                pagerank = grafo.pagerank()
+                topo = np.argsort(-pagerank)[:10]
+                st.dataframe(
+                    pd.DataFrame(
+                        {
+                            "Nó": grafo.labels[topo],
+                            "PageRank": pagerank[topo],
+                            "Grau de entrada": grafo.in_degree()[topo],
+                            "Grau de saída": grafo.out_degree()[topo],
+                        }
+                    ),
+                    hide_index=True,
+                )
+            if len(monitor.history) > 1:
+                historico = pd.DataFrame(monitor.history)
+                historico["time"] = pd.to_datetime(historico["time"], unit="s")
+                st.line_chart(historico.set_index("time")[["nodes", "edges"]])
+
+            if st.button("📥 Analisar o estado atual", key="live_snapshot_btn"):
+                st.session_state.df = preprocessar_arestas(grafo.to_edge_frame())
+                st.rerun()
+
+        painel_ao_vivo()
+
 else:  # Opções pré-definidas
     st.markdown("#### Exemplos disponíveis")
     example_option = st.selectbox(
@@ -101,30 +434,181 @@ else:  # Opções pré-definidas
     if st.button("Carregar Exemplo", key="load_example_btn"):
         with st.spinner(f"Carregando {example_option.split('(')[0].strip()}..."):
             try:
-                df = pd.read_csv(file_urls[example_option])
-                st.session_state.df = df
+                st.session_state.df = preprocessar_arestas(carregar_arestas(file_urls[example_option]))
                 st.success(f"✅ {example_option} carregado com sucesso!")
             except Exception as e:
                 st.error(f"❌ Falha no carregamento: {str(e)}")
 
-# Visualização dos dados (para todas as opções)
-if st.session_state.df is not None:
-    df = st.session_state.df
+# Visualização dos dados (para todas as opções). Um .rgraph aberto só vale
+# enquanto nenhuma lista de arestas for carregada depois dele
+grafo_binario = st.session_state.get("grafo_binario") if st.session_state.df is None else None
+if grafo_binario is not None and not os.path.exists(grafo_binario):
+    st.warning(f"⚠️ Arquivo não encontrado: {grafo_binario}")
+    grafo_binario = None
+if st.session_state.df is not None or grafo_binario is not None:
+    if grafo_binario is not None:
+        # Grafo compacto mapeado direto do arquivo: a lista de arestas não é
+        # reconstruída, e a amostra lê só as primeiras arestas e atributos
+        modificado_em = os.path.getmtime(grafo_binario)
+        compacto, atributos_de_aresta, meta = abrir_grafo_binario(grafo_binario, modificado_em)
+        graph_fingerprint = meta.get("fingerprint") or f"{grafo_binario}@{modificado_em}"
+        amostra = graph_store.edge_frame(compacto, atributos_de_aresta, rows=3)
+        total_de_registros = compacto.number_of_edges()
+        colunas = list(amostra.columns)
+    else:
+        df = st.session_state.df
+        # Processamento do grafo (reaproveitado do cache enquanto os dados não mudam)
+        if st.session_state.get("df_fingerprint_id") != id(df):
+            st.session_state.df_fingerprint = edge_list_fingerprint(df)
+            st.session_state.df_fingerprint_id = id(df)
+        # Grafo compacto (IDs inteiros em CSR/CSC) usado pelas métricas vetorizadas
+        graph_fingerprint, compacto = obter_cache_de_grafos().get_or_build(
+            df, fingerprint=st.session_state.df_fingerprint
+        )
+        atributos_de_aresta = None  # calculados só ao exportar
+        amostra, total_de_registros, colunas = df.head(3), len(df), list(df.columns)
 
     with st.expander("🔍 Visualizar amostra dos dados", expanded=True):
-        st.dataframe(df.head(3))
-        st.caption(f"📊 Total: {len(df)} registros | 🏷️ Colunas: {', '.join(df.columns)}")
+        st.dataframe(amostra)
+        st.caption(f"📊 Total: {total_de_registros} registros | 🏷️ Colunas: {', '.join(colunas)}")
+        if st.session_state.get("preprocess_summary"):
+            st.caption(f"🧹 {st.session_state.preprocess_summary}")
 
-    # Processamento do grafo
-    df.dropna(subset=["source", "target"], inplace=True)
-    G = nx.from_pandas_edgelist(
-        df, source="source", target="target", create_using=nx.DiGraph()
+    st.success(
+        f"🎉 Grafo carregado: {compacto.number_of_nodes()} nós e {compacto.number_of_edges()} arestas"
     )
-    G.remove_edges_from(nx.selfloop_edges(G))
 
-    st.success(
-        f"🎉 Grafo carregado: {G.number_of_nodes()} nós e {G.number_of_edges()} arestas"
+    # O DiGraph do NetworkX só é construído pelo motor quando uma métrica ou
+    # painel depende dele (ex: closeness exata, desenho das comunidades)
+    motor = obter_motor_de_metricas()
+
+    # Graus de entrada/saída numa só passada sobre as arestas (ver degree_stats)
+    graus = degree_stats.graph_degrees(compacto)
+
+    with st.expander("💾 Exportar grafo binário", expanded=False):
+        st.markdown(
+            "Salva o grafo processado (tabela de nós + CSR/CSC) num arquivo `.rgraph` "
+            "que pode ser reaberto quase instantaneamente pela opção **💾 Grafo binário**."
+        )
+        if st.button("Exportar .rgraph", key="export_rgraph_btn"):
+            os.makedirs(GRAFOS_DIR, exist_ok=True)
+            caminho = os.path.join(GRAFOS_DIR, f"grafo_{graph_fingerprint[:16]}{graph_store.EXTENSION}")
+            if grafo_binario is not None and os.path.abspath(caminho) == os.path.abspath(grafo_binario):
+                # É o próprio arquivo aberto (mapeado em memória): nada a regravar
+                tamanho = os.path.getsize(caminho)
+            else:
+                if atributos_de_aresta is None:
+                    # Peso e data opcionais, um valor por aresta do grafo compacto
+                    atributos_de_aresta = graph_store.edge_attrs_from_frame(
+                        compacto, df, [c for c in (COLUNA_PESO, COLUNA_DATA) if c in df.columns]
+                    )
+                tamanho = graph_store.save_graph(
+                    compacto,
+                    caminho,
+                    edge_attrs=atributos_de_aresta,
+                    meta={"fingerprint": graph_fingerprint, "columns": colunas},
+                )
+            st.success(f"✅ Grafo salvo em {caminho} ({tamanho / 1024:.1f} KB)")
+            with open(caminho, "rb") as f:
+                st.download_button(
+                    "⬇️ Baixar arquivo",
+                    f.read(),
+                    file_name=os.path.basename(caminho),
+                    key="download_rgraph_btn",
+                )
+
+    # Métricas caras vão para a fila da sessão logo no início, para que os
+    # painéis abaixo sejam desenhados enquanto elas são calculadas; trocar de
+    # grafo cancela as que ainda estavam na fila
+    tarefas = obter_tarefas_da_sessao()
+    tarefas.bind(compacto, graph_fingerprint)
+    distancias_automaticas = (
+        compacto.number_of_nodes() <= MAX_NOS_DISTANCIAS_AUTOMATICAS
+        and compacto.number_of_edges() <= MAX_ARESTAS_DISTANCIAS_AUTOMATICAS
     )
+    for nome_da_metrica, parametros in METRICAS_EM_SEGUNDO_PLANO:
+        if nome_da_metrica == "distances" and not distancias_automaticas:
+            continue
+        tarefas.submit(nome_da_metrica, **parametros)
+
+    def metrica(nome, **params):
+        """
+        Atalho para obter uma métrica do grafo atual pelo motor memoizado.
+
+        Se a métrica estiver na fila de segundo plano, espera por ela em vez
+        de calculá-la de novo.
+        """
+        return tarefas.result(nome, **params)
+
+    def tamanho_do_componente(tipo):
+        """Dict nó -> tamanho do seu componente ("scc" ou "wcc")."""
+        _, rotulos = metrica(tipo)
+        return compacto.to_dict(np.bincount(rotulos)[rotulos])
+
+    def previa_do_layout(quadro):
+        """Figura leve (nós e arestas retas) de um quadro do layout progressivo."""
+        plt.style.use("dark_background")
+        fig, ax = plt.subplots(figsize=(12, 8), facecolor="#0D1117")
+        ax.set_facecolor("#0D1117")
+        draw_edges(ax, quadro.positions, compacto.edge_sources(), compacto.out_indices)
+        ax.scatter(quadro.positions[:, 0], quadro.positions[:, 1], s=4, color="#F0A030")
+        ax.set_title(
+            f"Refinando o layout (nível {quadro.level}, iteração {quadro.iteration})",
+            fontsize=12, color="white",
+        )
+        ax.axis("off")
+        return fig
+
+    def layout_de_forca(area=None):
+        """
+        Layout multinível do grafo completo, compartilhado pelos painéis.
+
+        Com `area` (um st.empty), um layout ainda não calculado de um grafo
+        grande é exibido nela progressivamente enquanto é refinado.
+        """
+        k_value = 1.5 / np.sqrt(max(len(compacto), 1))  # Valor maior → nós mais afastados
+        params = {"method": "force", "seed": 42, "k": k_value}
+        if (
+            area is not None
+            and len(compacto) >= MIN_NOS_LAYOUT_PROGRESSIVO
+            and not motor.is_cached(graph_fingerprint, "layout", **params)
+        ):
+            progresso = ProgressiveLayout(
+                compacto, every=QUADROS_A_CADA, seed=params["seed"], k=k_value
+            )
+            for quadro in progresso.frames():
+                if not quadro.done:
+                    fig = previa_do_layout(quadro)
+                    area.pyplot(fig)
+                    plt.close(fig)
+            # O quadro final é exatamente o layout que o motor calcularia
+            motor.store(
+                graph_fingerprint, "layout", dict(zip(compacto.labels, quadro.positions)), **params
+            )
+        return metrica("layout", **params)
+
+    def particoes_por_resolucao(resolucoes, algoritmo="louvain", semente=42):
+        """
+        Partições para várias resoluções; as que faltam no cache são
+        calculadas em paralelo, uma por processo, e guardadas no motor.
+        """
+        faltando = [
+            r for r in resolucoes
+            if not motor.is_cached(
+                graph_fingerprint, "partition", algorithm=algoritmo, resolution=r, seed=semente
+            )
+        ]
+        if faltando:
+            adj = motor.representation(compacto, graph_fingerprint, "csr_undirected")
+            for r, particao in zip(faltando, community_service.sweep(adj, faltando, algoritmo, semente)):
+                motor.store(
+                    graph_fingerprint, "partition", particao,
+                    algorithm=algoritmo, resolution=r, seed=semente,
+                )
+        return [
+            metrica("partition", algorithm=algoritmo, resolution=r, seed=semente)
+            for r in resolucoes
+        ]
 
 
     # =============================================
@@ -153,6 +637,14 @@ if st.session_state.df is not None:
         "- Valor próximo de 0: pouca ou nenhuma formação de grupos\n\n"
         "Comum em redes sociais e redes pequenas-mundo."
     )
+    help_transitividade = (
+        "Fração das cunhas (pares de vizinhos de um mesmo nó) que fecham um triângulo: "
+        "3 x triângulos / cunhas. Varia de 0 a 1.\n\n"
+        "- Diferente do coeficiente médio, dá mais peso aos nós de grau alto.\n"
+        "- Os triângulos são contados com produtos de matrizes esparsas; em grafos muito "
+        "grandes o valor é estimado por amostragem de cunhas e aparece com a margem de erro "
+        "(95% de confiança)."
+    )
     help_scc = (
         "Número de subgrafos nos quais **cada nó pode alcançar todos os outros seguindo a direção das arestas**.\n\n"
         "- Relevante em redes dirigidas (como grafos de citações ou hyperlinks).\n"
@@ -172,7 +664,9 @@ if st.session_state.df is not None:
         "A centralidade de Katz mede a influência de um nó, considerando todas as caminhadas possíveis até ele, "
         "mas penalizando caminhos mais longos com um fator de atenuação.\n\n"
         "- Diferente do PageRank, ela atribui importância inclusive a conexões indiretas.\n"
-        "- Requer um parâmetro alfa (menor que o inverso do maior autovalor do grafo) para garantir convergência.\n\n"
+        "- Requer um parâmetro alfa (menor que o inverso do maior autovalor do grafo) para garantir convergência.\n"
+        "- O alfa é derivado automaticamente de uma estimativa esparsa do raio espectral, "
+        "o que permite calcular a métrica mesmo em redes grandes.\n\n"
         "⚠️ Se o grafo for grande, muito esparso ou desconexo, ou se o parâmetro não for adequado, "
         "o cálculo pode falhar por não convergir ou por gerar números instáveis, resultando em 'N/A'."
     )
@@ -217,108 +711,212 @@ if st.session_state.df is not None:
     
 
 
-    def calcular_assortatividade_segura(grafo):
+    # Acima deste número de nós, closeness/betweenness usam amostragem por padrão
+    LIMITE_CALCULO_EXATO = 5000
+
+    def opcoes_de_aproximacao(chave):
         """
-        Calcula o coeficiente de assortatividade de forma segura, evitando erros em grafos esparsos.
+        Mostra as opções do modo aproximado de closeness/betweenness.
 
         Args:
-            grafo: Um grafo NetworkX (Graph ou DiGraph)
+            chave: Prefixo único para as chaves dos widgets do painel
 
         Returns:
-            float: Valor da assortatividade ou None se não for possível calcular
+            dict: Parâmetros da amostragem, ou None no modo exato
         """
-        try:
-            # Verifica se o grafo tem nós suficientes e variação de graus
-            if grafo.number_of_nodes() < 2:
-                return None
+        n = compacto.number_of_nodes()
+        modo = st.radio(
+            "Modo de cálculo",
+            ["Exato", "Aproximado (amostragem)"],
+            index=1 if n > LIMITE_CALCULO_EXATO else 0,
+            horizontal=True,
+            key=f"{chave}_modo",
+            help="O modo aproximado usa buscas a partir de uma amostra de nós (pivôs) "
+            "e informa o erro máximo garantido para a amostra obtida.",
+        )
+        if modo == "Exato":
+            return None
+        c1, c2, c3, c4 = st.columns(4)
+        k = c1.number_input("Pivôs (0 = automático)", 0, max(n, 1), 0, key=f"{chave}_k")
+        epsilon = c2.number_input(
+            "Erro alvo (ε)", 0.005, 0.5, 0.05, step=0.005, format="%.3f", key=f"{chave}_eps"
+        )
+        delta = c3.number_input(
+            "Prob. de falha (δ)", 0.01, 0.5, 0.1, step=0.01, key=f"{chave}_delta"
+        )
+        orcamento = c4.number_input(
+            "Tempo máximo (s)", 1, 600, 30, key=f"{chave}_budget"
+        )
+        return {
+            "k": int(k),
+            "epsilon": float(epsilon),
+            "delta": float(delta),
+            "time_budget": float(orcamento),
+        }
+
+    def centralidade_de_caminhos(nome, aproximacao):
+        """
+        Closeness/betweenness exata ou aproximada, com o limite de erro na tela.
 
-            degrees = [d for _, d in grafo.degree()]
-            if len(set(degrees)) < 2:  # Todos os nós têm o mesmo grau
-                return None
+        Args:
+            nome: "closeness" ou "betweenness"
+            aproximacao: Parâmetros de `opcoes_de_aproximacao` (None = exato)
 
-            return nx.degree_assortativity_coefficient(grafo)
-        except (ZeroDivisionError, nx.NetworkXError):
-            return None
+        Returns:
+            dict: Nó -> centralidade
+        """
+        if aproximacao is None:
+            return metrica(nome)
+        resultado = metrica(f"{nome}_approx", **aproximacao)
+        if resultado.exact:
+            st.caption(
+                f"🎯 Todos os {resultado.samples} nós foram usados como pivô: resultado exato."
+            )
+        else:
+            unidade = " na distância média (saltos)" if nome == "closeness" else ""
+            st.caption(
+                f"🎲 Estimativa com {resultado.samples} pivôs em {resultado.elapsed:.1f}s — "
+                f"erro ≤ ±{resultado.epsilon:.4f}{unidade} com "
+                f"{100 * (1 - resultado.delta):.0f}% de confiança."
+            )
+        return resultado.values
 
     # =============================================
     # MÉTRICAS ESTRUTURAIS E VISUALIZAÇÃO ESTÁTICA
     # =============================================
     with st.expander("📊 Métricas Estruturais da Rede", expanded=False):
-        col1, col2 = st.columns(2)
 
-        with col1:
-            st.metric("Densidade", f"{nx.density(G):.4f}", help=help_densidade)
-
-            assort = calcular_assortatividade_segura(G)
-            st.metric(
-                "Assortatividade (grau do nó)",
-                f"{assort:.4f}" if assort is not None else "N/A",
-                help=help_assortatividade,
-            )
+        def mostrar_metrica(nome, campos, **params):
+            """
+            Mostra os campos de uma métrica da fila assim que ela fica pronta.
 
-            st.metric(
-                "Coef. Clustering",
-                f"{nx.average_clustering(G.to_undirected()):.4f}",
-                help=help_clustering,
-            )
+            Args:
+                nome: Nome da métrica no motor
+                campos: Lista de (rótulo, função que formata o valor, ajuda)
+                **params: Parâmetros da métrica
+            """
+            estado = tarefas.state(nome, **params)
+            for rotulo, formatar, ajuda in campos:
+                if estado.status == DONE:
+                    try:
+                        valor = formatar(estado.value)
+                    except Exception:
+                        valor = "N/A"
+                elif estado.status == FAILED:
+                    valor = "N/A"
+                else:
+                    valor = "⏳"
+                st.metric(rotulo, valor, help=ajuda)
+
+        def media(valores):
+            return f"{sum(valores.values()) / len(valores):.4f}"
+
+        def formatar_clustering(campo):
+            """Formata um campo do ClusteringResult, com a margem de erro se for estimado."""
+            def formatar(resultado):
+                valor = f"{getattr(resultado, campo):.4f}"
+                return valor if resultado.exact else f"{valor} ±{resultado.epsilon:g}"
+            return formatar
+
+        ajuda_scc_isolados = "Nós que não fazem parte de componentes fortemente conectados com outros"
+
+        # Enquanto houver tarefas em andamento, o fragmento se redesenha sozinho
+        # a cada INTERVALO_DAS_TAREFAS segundos, sem reexecutar o app inteiro
+        @st.fragment(run_every=INTERVALO_DAS_TAREFAS if tarefas.pending() else None)
+        def painel_de_metricas():
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.metric("Densidade", f"{nx.density(compacto):.4f}", help=help_densidade)
+
+                assort = degree_stats.assortativity(compacto.edge_sources(), compacto.out_indices, graus)
+                st.metric(
+                    "Assortatividade (grau do nó)",
+                    f"{assort:.4f}" if assort is not None else "N/A",
+                    help=help_assortatividade,
+                )
 
-            try:
-                katz = nx.katz_centrality_numpy(G)
-                katz_avg = sum(katz.values()) / len(katz)
-                st.metric("Centralidade de Katz (média)", f"{katz_avg:.4f}", help=help_katz)
-            except Exception as e:
-                st.metric("Centralidade de Katz (média)", "N/A", help=help_katz)
+                mostrar_metrica(
+                    "clustering",
+                    [
+                        ("Coef. Clustering", formatar_clustering("average"), help_clustering),
+                        ("Transitividade", formatar_clustering("transitivity"), help_transitividade),
+                    ],
+                )
+                mostrar_metrica("katz", [("Centralidade de Katz (média)", media, help_katz)])
+                mostrar_metrica("pagerank", [("PageRank (médio)", media, help_pagerank)])
+                mostrar_metrica(
+                    "partition",
+                    [("Modularidade", lambda p: f"{p.modularity:.4f}", help_modularidade)],
+                    **PARTICAO_PADRAO,
+                )
 
-            try:
-                pagerank = nx.pagerank(G)
-                pr_avg = sum(pagerank.values()) / len(pagerank)
-                st.metric("PageRank (médio)", f"{pr_avg:.4f}", help=help_pagerank)
-            except Exception as e:
-                st.metric("PageRank (médio)", "N/A", help=help_pagerank)
-            try:
-                from networkx.algorithms.community import greedy_modularity_communities
-                communities = list(greedy_modularity_communities(G.to_undirected()))
-                modularity = nx.algorithms.community.quality.modularity(G.to_undirected(), communities)
-                st.metric("Modularidade", f"{modularity:.4f}", help=help_modularidade)
-            except Exception as e:
-                st.metric("Modularidade", "N/A", help=help_modularidade)
-                
+            with col2:
+                if nx.is_directed(compacto):
+                    mostrar_metrica(
+                        "scc",
+                        [
+                            ("SCCs com ≥2 nós", lambda r: int((np.bincount(r[1]) >= 2).sum()), help_scc),
+                            (
+                                "Nós isolados (SCCs tamanho 1)",
+                                lambda r: int((np.bincount(r[1]) == 1).sum()),
+                                ajuda_scc_isolados,
+                            ),
+                        ],
+                    )
+                else:
+                    st.metric("SCCs com ≥2 nós", "N/A", help=help_scc)
+                    st.metric("Nós isolados (SCCs tamanho 1)", "N/A", help=ajuda_scc_isolados)
 
-        with col2:
-            if nx.is_directed(G):
-                sccs = list(nx.strongly_connected_components(G))
-                scc_count = sum(1 for c in sccs if len(c) >= 2)
-                isolated_scc_count = sum(1 for c in sccs if len(c) == 1)
-                st.metric("SCCs com ≥2 nós", scc_count, help=help_scc)
-                st.metric("Nós isolados (SCCs tamanho 1)", isolated_scc_count, help="Nós que não fazem parte de componentes fortemente conectados com outros")
-            else:
-                st.metric("SCCs com ≥2 nós", "N/A", help=help_scc)
-                st.metric("Nós isolados (SCCs tamanho 1)", "N/A", help="Nós que não fazem parte de componentes fortemente conectados com outros")
+                mostrar_metrica(
+                    "wcc", [("Componentes Fracamente Conectados", lambda r: r[0], help_wcc)]
+                )
 
-            st.metric(
-                "Componentes Fracamente Conectados",
-                nx.number_weakly_connected_components(G),
-                help=help_wcc,
+                # Diâmetro e comprimento médio do caminho (N/A se não for possível);
+                # em grafos grandes, só depois de pedidos pelo botão
+                if tarefas.submitted("distances"):
+                    mostrar_metrica(
+                        "distances",
+                        [
+                            ("Diâmetro", lambda d: f"{d['diameter']}", help_diametro),
+                            ("Caminho Médio", lambda d: f"{d['average_path']:.4f}", help_caminho_medio),
+                            (
+                                "Excentricidade Média",
+                                lambda d: f"{d['eccentricity_avg']:.2f}",
+                                help_excentricidade,
+                            ),
+                        ],
+                    )
+                else:
+                    st.caption(
+                        f"Diâmetro, caminho médio e excentricidade percorrem todos os pares de nós "
+                        f"e não são calculados automaticamente acima de "
+                        f"{MAX_NOS_DISTANCIAS_AUTOMATICAS} nós ou {MAX_ARESTAS_DISTANCIAS_AUTOMATICAS} arestas."
+                    )
+                    if st.button("📏 Calcular distâncias", key="distances_btn"):
+                        tarefas.submit("distances")
+                        st.rerun()
+
+            pendentes = tarefas.pending()
+            if pendentes:
+                st.caption(
+                    f"⏳ {pendentes} métrica(s) em cálculo em segundo plano; trocar de "
+                    "conjunto de dados descarta as da fila e interrompe as de distâncias."
+                )
+            elif st.session_state.get("metric_jobs_waiting"):
+                # Tudo pronto: uma reexecução completa desliga a atualização automática
+                st.session_state.metric_jobs_waiting = False
+                st.rerun()
+            st.session_state.metric_jobs_waiting = bool(pendentes)
+
+            stats = motor.stats()
+            st.caption(
+                f"🗄️ Cache de métricas: {stats['hits']} acertos | {stats['misses']} cálculos | "
+                f"{stats['entries']} resultados armazenados"
             )
 
-            # Diâmetro e comprimento médio do caminho (se conexa)
-            try:
-                if nx.is_connected(G.to_undirected()):
-                    diameter = nx.diameter(G.to_undirected())
-                    avg_path = nx.average_shortest_path_length(G.to_undirected())
-                    eccentricity = nx.eccentricity(G.to_undirected())
-                    ecc_avg = sum(eccentricity.values()) / len(eccentricity)
-                    st.metric("Diâmetro", f"{diameter}", help=help_diametro)
-                    st.metric("Caminho Médio", f"{avg_path:.4f}", help=help_caminho_medio)
-                    st.metric("Excentricidade Média", f"{ecc_avg:.2f}", help=help_excentricidade)
-                else:
-                    st.metric("Diâmetro", "N/A", help=help_diametro)
-                    st.metric("Caminho Médio", "N/A", help=help_caminho_medio)
-                    st.metric("Excentricidade Média", "N/A", help=help_excentricidade)
-            except Exception as e:
-                st.metric("Diâmetro", "Erro", help=help_diametro)
-                st.metric("Caminho Médio", "Erro", help=help_caminho_medio)
-                st.metric("Excentricidade Média", "Erro", help=help_excentricidade)
+        painel_de_metricas()
+
     # =============================================
     # VISUALIZAÇÃO ESTÁTICA
     # =============================================
@@ -350,20 +948,24 @@ if st.session_state.df is not None:
             key="static_viz_metric",
         )
 
+        aproximacao = None
+        if metric_option in ("Closeness Centrality", "Betweenness Centrality"):
+            aproximacao = opcoes_de_aproximacao("static_viz")
+
         # Calcular centralidades com tratamento de erro robusto
         try:
             if metric_option == "Degree Centrality":
-                centrality = nx.degree_centrality(G)
+                centrality = metrica("degree")
                 title = "Degree Centrality (Nós mais conectados)"
             elif metric_option == "Closeness Centrality":
-                centrality = nx.closeness_centrality(G)
+                centrality = centralidade_de_caminhos("closeness", aproximacao)
                 title = "Closeness Centrality (Nós que alcançam outros mais rapidamente)"
             elif metric_option == "Betweenness Centrality":
-                centrality = nx.betweenness_centrality(G)
+                centrality = centralidade_de_caminhos("betweenness", aproximacao)
                 title = "Betweenness Centrality (Nós que atuam como pontes)"
             elif metric_option == "Eigenvector Centrality":
                 try:
-                    centrality = nx.eigenvector_centrality(G, max_iter=1000)
+                    centrality = metrica("eigenvector")
                     title = "Eigenvector Centrality (Nós conectados a outros importantes)"
                 except nx.PowerIterationFailedConvergence:
                     st.error(
@@ -371,23 +973,34 @@ if st.session_state.df is not None:
                     )
                     centrality = None
             elif metric_option == "Strongly Connected Component":
-                sccs = list(nx.strongly_connected_components(G))
-                centrality = {node: len(c) for c in sccs for node in c}
+                centrality = tamanho_do_componente("scc")
                 title = "Componentes Fortemente Conectados (tamanho do SCC de cada nó)"
             elif metric_option == "Weakly Connected Component":
-                wccs = list(nx.weakly_connected_components(G))
-                centrality = {node: len(c) for c in wccs for node in c}
+                centrality = tamanho_do_componente("wcc")
                 title = "Componentes Fracamente Conectados (tamanho do WCC de cada nó)"
         except Exception as e:
             st.error(f"Erro ao calcular {metric_option}: {str(e)}")
             centrality = None
 
-        layout_option = st.selectbox(
-            "Escolha o layout da visualização",
-            ["spring", "circular", "random"],
-            index=0,
-            help="Escolha o algoritmo de layout para distribuir os nós na visualização."
-        )
+        col_layout, col_lod = st.columns(2)
+        with col_layout:
+            layout_option = st.selectbox(
+                "Escolha o layout da visualização",
+                ["spring", "circular", "random"],
+                index=0,
+                help="Escolha o algoritmo de layout para distribuir os nós na visualização. "
+                "O spring usa um layout força-direcionado multinível, calculado uma vez por grafo."
+            )
+        with col_lod:
+            max_arestas = st.number_input(
+                "Máximo de arestas desenhadas individualmente",
+                min_value=100,
+                value=MAX_ARESTAS_DETALHADAS,
+                step=1000,
+                key="static_viz_max_edges",
+                help="Acima deste limite é desenhada uma amostra das arestas; "
+                "em grafos muito maiores, um mapa de densidade.",
+            )
 
 
         if centrality and len(centrality) > 0:
@@ -407,15 +1020,12 @@ if st.session_state.df is not None:
                 )
                 colors = (cent_values - cent_values.min()) / (np.ptp(cent_values) + 1e-10)
 
-            # Layout e figura
-            k_value = 1.5 / np.sqrt(len(G))  # Valor maior → nós mais afastados
+            # Layout e figura (memoizados por grafo, layout e semente)
+            area_do_grafo = st.empty()
             if layout_option == "spring":
-                k_value = 1.5 / np.sqrt(len(G)) if len(G) > 0 else 0.1
-                pos = nx.spring_layout(G, seed=42, k=k_value, iterations=100)
-            elif layout_option == "circular":
-                pos = nx.circular_layout(G)
-            elif layout_option == "random":
-                pos = nx.random_layout(G, seed=42)
+                pos = layout_de_forca(area_do_grafo)
+            else:
+                pos = metrica("layout", method=layout_option, seed=42)
 
 
             plt.style.use("dark_background")  # Define fundo escuro
@@ -429,8 +1039,9 @@ if st.session_state.df is not None:
             cax.set_facecolor("#0D1117")
 
             nodes_draw = nx.draw_networkx_nodes(
-                G,
+                compacto,
                 pos,
+                nodelist=nodes_list,
                 node_size=sizes,
                 node_color=colors,
                 cmap=plt.cm.plasma,# mapa de cores
@@ -438,20 +1049,18 @@ if st.session_state.df is not None:
                 ax=ax,# ax do gráfico principal
             )
 
-            for u, v in G.edges():
-                if u == v:
-                    continue  # opcional: pula auto-laços
-                rad = 0.2  # quanto mais alto, mais curvado
-                arrow = FancyArrowPatch(
-                    posA=pos[u],
-                    posB=pos[v],
-                    connectionstyle=f"arc3,rad={rad}",
-                    arrowstyle='-',
-                    color="#BBBBBB",
-                    linewidth=0.4,
-                    alpha=0.5
-                )
-                ax.add_patch(arrow)
+            # Todas as arestas em lote (o grafo compacto não tem auto-laços)
+            modo_arestas = draw_edges(
+                ax,
+                positions_array(pos, compacto.labels),
+                compacto.edge_sources(),
+                compacto.out_indices,
+                curvature=0.2,  # quanto mais alto, mais curvado
+                color="#BBBBBB",
+                linewidth=0.4,
+                alpha=0.5,
+                max_edges=int(max_arestas),
+            )
 
 
             # Rótulo dos top 10
@@ -483,8 +1092,14 @@ if st.session_state.df is not None:
             plt.setp(plt.getp(cbar.ax.axes, 'yticklabels'), color='white')
 
             plt.tight_layout()
-            st.pyplot(fig)
+            area_do_grafo.pyplot(fig)
             plt.close()
+            if modo_arestas == "amostra":
+                st.caption(
+                    f"✂️ Exibindo uma amostra de {int(max_arestas)} das {compacto.number_of_edges()} arestas."
+                )
+            elif modo_arestas == "densidade":
+                st.caption("🌫️ Arestas exibidas como mapa de densidade (grafo muito grande).")
 
             # Interpretação e tabela
             st.markdown(
@@ -506,6 +1121,58 @@ if st.session_state.df is not None:
                 "Não foi possível gerar a visualização para esta métrica ou todos os nós têm o mesmo valor."
             )
 
+    # =============================================
+    # VISUALIZAÇÃO INTERATIVA
+    # =============================================
+
+    with st.expander("🕸️ Visualização Interativa", expanded=False):
+        st.markdown(
+            """
+            Rede navegável: arraste, aproxime, clique num nó para destacar a vizinhança
+            ou busque um nó pelo nome. Grafos grandes são reduzidos no servidor antes de
+            ir para o navegador, então a página continua leve qualquer que seja o tamanho
+            da rede.
+            """
+        )
+        col_reducao, col_limite = st.columns(2)
+        with col_reducao:
+            reducao = st.selectbox(
+                "Redução do grafo",
+                list(REDUCOES_INTERATIVAS),
+                key="interactive_reduction",
+                help="k-core: o núcleo mais denso que cabe no limite. PageRank: os nós mais "
+                "centrais. Comunidades: cada comunidade Louvain vira um único nó, com "
+                "tamanho proporcional ao número de membros.",
+            )
+        with col_limite:
+            max_nos_interativo = st.slider(
+                "Máximo de nós enviados ao navegador",
+                50, 1000, MAX_NOS_INTERATIVO, step=50,
+                key="interactive_max_nodes",
+            )
+
+        metodo = REDUCOES_INTERATIVAS[reducao]
+        try:
+            pagerank = metrica("pagerank")
+            pontuacoes = np.array([pagerank[no] for no in compacto.labels])
+        except Exception:
+            # Sem convergência do PageRank: usa o grau como pontuação
+            pontuacoes = compacto.degree().astype(np.float64)
+        grupos = None
+        if metodo == "communities":
+            grupos = metrica("partition", **PARTICAO_PADRAO).labels
+
+        try:
+            html, nota, nos_enviados, arestas_enviadas = montar_visao_interativa(
+                graph_fingerprint, metodo, max_nos_interativo, compacto, pontuacoes, grupos
+            )
+            components.html(html, height=760, scrolling=False)
+            st.caption(
+                f"🔎 {nota} | {nos_enviados} nós e {arestas_enviadas} arestas enviados ao navegador"
+            )
+        except Exception as e:
+            st.error(f"Erro ao montar a visualização interativa: {str(e)}")
+
     # =============================================
     # DISTRIBUIÇÃO DE GRAU
     # =============================================
@@ -513,43 +1180,70 @@ if st.session_state.df is not None:
     with st.expander("📈 Distribuição de Grau", expanded=False):
         plt.style.use("dark_background")  # Define fundo escuro
 
-        fig, ax = plt.subplots(1, 2, figsize=(12, 4), facecolor="#121222")
-
-        # Grau de entrada
-        sns.histplot(
-            list(dict(G.in_degree()).values()),
-            bins=30,
-            ax=ax[0],
-            color="skyblue",
-            edgecolor="#111111",
+        total = graus.total
+        ajuste = degree_stats.power_law_fit(total)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Grau médio", f"{total.mean():.2f}" if len(total) else "N/A")
+        col2.metric("Grau máximo", int(total.max(initial=0)))
+        col3.metric(
+            "Expoente da lei de potência (α)",
+            f"{ajuste.alpha:.2f}" if ajuste else "N/A",
+            help="Ajuste por máxima verossimilhança de P(k) ~ k^-α na cauda k ≥ k_min, "
+            "com k_min escolhido pela menor distância de Kolmogorov-Smirnov.",
+        )
+        col4.metric(
+            "k_min (nós na cauda)",
+            f"{ajuste.kmin} ({ajuste.tail})" if ajuste else "N/A",
         )
-        ax[0].set_title("Distribuição do Grau de Entrada", color="white")
-        ax[0].set_xlabel("Grau de entrada", color="white")
-        ax[0].set_ylabel("Frequência", color="white")
-        ax[0].set_yscale("log")
-        ax[0].tick_params(colors="white")
-
-        # Grau de saída
-        sns.histplot(
-            list(dict(G.out_degree()).values()),
-            bins=30,
-            ax=ax[1],
-            color="salmon",
-            edgecolor="black",
+
+        fig, ax = plt.subplots(1, 3, figsize=(15, 4), facecolor="#121222")
+
+        # Histogramas com classes logarítmicas (graus de entrada e de saída)
+        for eixo, valores, cor, nome in (
+            (ax[0], graus.in_degree, "skyblue", "Entrada"),
+            (ax[1], graus.out_degree, "salmon", "Saída"),
+        ):
+            histograma = degree_stats.log_histogram(valores)
+            visiveis = histograma.counts > 0
+            eixo.loglog(
+                histograma.centers[visiveis], histograma.density[visiveis],
+                "o-", color=cor, markersize=4,
+            )
+            eixo.set_title(f"Distribuição do Grau de {nome}", color="white")
+            eixo.set_xlabel(f"Grau de {nome.lower()}", color="white")
+            eixo.set_ylabel("P(k) (classes logarítmicas)", color="white")
+            eixo.tick_params(colors="white")
+
+        # CCDF do grau total com o ajuste da lei de potência
+        graus_presentes, probabilidades = degree_stats.ccdf(total)
+        positivos = graus_presentes > 0
+        ax[2].loglog(
+            graus_presentes[positivos], probabilidades[positivos],
+            ".", color="mediumseagreen", label="Observado",
         )
-        ax[1].set_title("Distribuição do Grau de Saída", color="white")
-        ax[1].set_xlabel("Grau de saída", color="white")
-        ax[1].set_ylabel("Frequência", color="white")
-        ax[1].set_yscale("log")
-        ax[1].tick_params(colors="white")
+        if ajuste:
+            k = graus_presentes[graus_presentes >= ajuste.kmin]
+            cauda = ajuste.tail / len(total)
+            ax[2].loglog(
+                k, cauda * ((k - 0.5) / (ajuste.kmin - 0.5)) ** (1 - ajuste.alpha),
+                "--", color="white", label=f"Ajuste α = {ajuste.alpha:.2f}",
+            )
+            ax[2].legend(facecolor="#222222", edgecolor="white", fontsize=8)
+        ax[2].set_title("CCDF do Grau Total", color="white")
+        ax[2].set_xlabel("Grau total k", color="white")
+        ax[2].set_ylabel("P(K ≥ k)", color="white")
+        ax[2].tick_params(colors="white")
 
+        plt.tight_layout()
         st.pyplot(fig)
+        plt.close()
 
         st.markdown(
             """
             - A distribuição de grau mostra como os nós estão conectados na rede.
             - Redes reais muitas vezes têm poucos nós com alto grau e muitos com baixo grau.
-            - A escala logarítmica evidencia essa estrutura com cauda longa.
+            - A escala logarítmica evidencia essa estrutura com cauda longa; as classes
+              logarítmicas evitam que a cauda se perca em classes quase vazias.
             """
         )
 
@@ -565,6 +1259,7 @@ if st.session_state.df is not None:
         - **Closeness**: Nós que podem alcançar outros mais rapidamente
         - **Betweenness**: Nós que atuam como pontes
         - **Eigenvector**: Nós conectados a outros nós importantes
+        - **PageRank**: Nós apontados por outros nós importantes
         """
         )
 
@@ -572,22 +1267,35 @@ if st.session_state.df is not None:
         with col1:
             metric = st.selectbox(
                 "Métrica de Centralidade",
-                ["Degree", "Closeness", "Betweenness", "Eigenvector"],
+                ["Degree", "Closeness", "Betweenness", "Eigenvector", "PageRank"],
                 key="centrality_metric"
             )
         with col2:
             k = st.slider("Número de nós para mostrar", 1, 100, 10, key="top_k_nodes")
 
+        aproximacao = None
+        if metric in ("Closeness", "Betweenness"):
+            aproximacao = opcoes_de_aproximacao("centrality_panel")
+        elif metric == "PageRank":
+            amortecimento = st.slider(
+                "Fator de amortecimento (alfa)", 0.50, 0.99, 0.85, 0.01,
+                key="pagerank_alpha",
+                help="Probabilidade de seguir uma aresta em vez de saltar para um nó aleatório. "
+                "Cada novo valor parte do PageRank já calculado, o que reduz as iterações."
+            )
+
         # Cálculo de centralidade com tratamento de erros
         try:
             if metric == "Degree":
-                centrality = nx.degree_centrality(G)
+                centrality = metrica("degree")
             elif metric == "Closeness":
-                centrality = nx.closeness_centrality(G)
+                centrality = centralidade_de_caminhos("closeness", aproximacao)
             elif metric == "Betweenness":
-                centrality = nx.betweenness_centrality(G)
+                centrality = centralidade_de_caminhos("betweenness", aproximacao)
             elif metric == "Eigenvector":
-                centrality = nx.eigenvector_centrality(G, max_iter=1000)
+                centrality = metrica("eigenvector")
+            elif metric == "PageRank":
+                centrality = metrica("pagerank", alpha=amortecimento)
         except Exception as e:
             st.error(f"Erro ao calcular {metric} centrality: {str(e)}")
             centrality = None
@@ -599,15 +1307,16 @@ if st.session_state.df is not None:
             
             # Visualização estática
             st.markdown("### 📌 Visualização dos Nós Mais Centrais")
-            H = G.subgraph([n for n, _ in top_nodes])
+            # Subgrafo induzido pelos top k, montado a partir do grafo compacto
+            H = compacto.subgraph(np.sort(compacto.labels.get_indexer([n for n, _ in top_nodes]))).to_networkx()
             
             # Configuração do plot
             plt.style.use('dark_background')
             fig, ax = plt.subplots(figsize=(12, 8))
             ax.set_facecolor('#0D1117')
             
-            # Layout e cores
-            pos = nx.spring_layout(H, seed=42)
+            # Layout e cores: reaproveita as coordenadas do grafo completo
+            pos = subgraph_positions(layout_de_forca(), H.nodes())
             node_values = [centrality[n] for n in H.nodes()]
             node_sizes = [100 + 500 * (val - min(node_values))/(max(node_values) - min(node_values)) for val in node_values]
             
@@ -654,112 +1363,179 @@ if st.session_state.df is not None:
     with st.expander("🧩 Detecção de Comunidades", expanded=False):
         st.markdown(
             """
-            ## Detecção de Comunidades (Algoritmo Louvain)
+            ## Detecção de Comunidades
             
             Grupos de nós mais densamente conectados entre si do que com o resto da rede.
             """
         )
 
-        # Converte para grafo não direcionado
-        G_undirected = G.to_undirected() if nx.is_directed(G) else G
+        col_algoritmo, col_resolucao = st.columns(2)
+        with col_algoritmo:
+            nome_algoritmo = st.selectbox(
+                "Algoritmo",
+                list(ALGORITMOS_DE_COMUNIDADES),
+                key="community_algorithm",
+                help="O Louvain maximiza a modularidade. A propagação de rótulos é bem mais "
+                "rápida em grafos grandes, mas costuma encontrar comunidades menos nítidas.",
+            )
+        algoritmo = ALGORITMOS_DE_COMUNIDADES[nome_algoritmo]
+        with col_resolucao:
+            resolucao = st.slider(
+                "Resolução",
+                0.2, 3.0, 1.0, step=0.05,
+                key="community_resolution",
+                disabled=algoritmo != "louvain",
+                help="Valores maiores produzem mais comunidades, e menores. Só se aplica ao Louvain.",
+            )
 
-        # Detecta comunidades
-        partition = community_louvain.best_partition(G_undirected)
-        community_sizes = Counter(partition.values())
+        # Partição memoizada por grafo, algoritmo e resolução: mover os
+        # controles abaixo não recalcula as comunidades
+        particao = metrica("partition", algorithm=algoritmo, resolution=resolucao, seed=42)
+        partition = particao.to_dict(compacto.labels)
+        community_sizes = dict(enumerate(particao.sizes.tolist()))
         
         # Filtra comunidades pequenas (opcional)
         min_community_size = st.slider("Tamanho mínimo da comunidade", 3, 10, 10)
-        communities_to_keep = {comm for comm, size in community_sizes.items() if size >= min_community_size}
+        communities_to_keep = set(np.flatnonzero(particao.sizes >= min_community_size).tolist())
         
         # Filtra nós e arestas
-        nodes_to_keep = [node for node in G_undirected.nodes() if partition[node] in communities_to_keep]
-        G_filtered = G_undirected.subgraph(nodes_to_keep)
+        mascara = particao.mask(min_community_size)
+        nodes_to_keep = compacto.labels[mascara]
         
+        # Usa seaborn para gerar cores das comunidades
+        community_list = sorted(communities_to_keep)
+        palette = sns.color_palette("hls", len(community_list))
+        community_colors = {comm: mcolors.to_hex(c) for comm, c in zip(community_list, palette)}
+
+        # Com muitos nós, o padrão é o super-grafo: uma bolinha por comunidade
+        modo_super = st.radio(
+            "Modo de visualização",
+            ["Super-grafo (uma bolinha por comunidade)", "Nós individuais"],
+            index=0 if len(nodes_to_keep) > MAX_NOS_DESENHO_INDIVIDUAL else 1,
+            horizontal=True,
+            key="community_view_mode",
+            help="No super-grafo cada comunidade vira um único nó, com tamanho proporcional "
+            "ao número de membros, e a espessura das ligações indica quantas arestas "
+            "existem entre duas comunidades.",
+        ).startswith("Super")
+
         # Configurações do plot
         plt.style.use('dark_background')
         fig, ax = plt.subplots(figsize=(12, 8))
         ax.set_facecolor('#121212')
         
-                # Layout
-        # Calcula um k adaptativo com base no número de nós (quanto mais nós, mais espaçado)
-        k_val = 1.2 / np.sqrt(G_filtered.number_of_nodes())  # experimente valores como 0.3, 0.5, 0.8 também
+        if modo_super:
+            supergrafo = community_service.super_graph(compacto, particao, min_community_size)
+            comunidades = supergrafo.graph.labels.to_numpy()
+            if len(comunidades):
+                xy = layout_em_cache(
+                    ("super", graph_fingerprint, algoritmo, resolucao, min_community_size),
+                    supergrafo.graph,
+                )
+                pesos = supergrafo.weights
+                draw_edges(
+                    ax, xy, supergrafo.graph.edge_sources(), supergrafo.graph.out_indices,
+                    curvature=0.2,
+                    color="#CCCCCC",
+                    linewidth=0.5 + 5 * pesos / max(pesos.max(initial=0), 1),
+                    alpha=0.4,
+                )
+                ax.scatter(
+                    xy[:, 0], xy[:, 1],
+                    s=80 + 1500 * supergrafo.members / supergrafo.members.max(),
+                    c=[community_colors[comm] for comm in comunidades],
+                    alpha=0.9, edgecolors="white", linewidths=0.5, zorder=2,
+                )
+                # Rótulos das maiores comunidades (numeradas por tamanho)
+                for i in np.argsort(-supergrafo.members)[:20]:
+                    ax.text(
+                        xy[i, 0], xy[i, 1], f"{comunidades[i]}\n({supergrafo.members[i]})",
+                        fontsize=7, color="white", ha="center", va="center", zorder=3,
+                    )
+            ax.axis("off")
+            plt.title(
+                f"Super-grafo de Comunidades ({nome_algoritmo}) - {len(communities_to_keep)} comunidades com ≥{min_community_size} nós",
+                color='white'
+            )
+        else:
+            # Subgrafo não dirigido das comunidades mantidas, montado a partir
+            # do grafo compacto (sem converter o grafo inteiro)
+            G_filtered = undirected_copy(compacto.subgraph(np.flatnonzero(mascara)).to_networkx())
 
-        pos = nx.spring_layout(G_filtered, seed=42, k=k_val)
+            # Layout: reaproveita as coordenadas do grafo completo
+            pos = subgraph_positions(layout_de_forca(), G_filtered.nodes())
         
-        # Usa seaborn para gerar cores das comunidades
-        community_list = sorted(communities_to_keep)
-        palette = sns.color_palette("hls", len(community_list))
-        community_colors = {comm: mcolors.to_hex(c) for comm, c in zip(community_list, palette)}
-        node_colors = [community_colors[partition[node]] for node in G_filtered.nodes()]
+            node_colors = [community_colors[partition[node]] for node in G_filtered.nodes()]
 
-        # Tamanho dos nós proporcional ao grau
-        degrees = dict(G_filtered.degree())
-        node_sizes = [50 + degrees[node]*5 for node in G_filtered.nodes()]
+            # Tamanho dos nós proporcional ao grau
+            degrees = dict(G_filtered.degree())
+            node_sizes = [50 + degrees[node]*5 for node in G_filtered.nodes()]
         
-        # Desenha o grafo
-        nx.draw_networkx_nodes(
-            G_filtered, pos,
-            node_color=node_colors,
-            node_size=node_sizes,
-            alpha=0.9,
-            ax=ax
-        )
+            # Desenha o grafo
+            nx.draw_networkx_nodes(
+                G_filtered, pos,
+                node_color=node_colors,
+                node_size=node_sizes,
+                alpha=0.9,
+                ax=ax
+            )
         
-        nx.draw_networkx_edges(
-            G_filtered, pos,
-            edge_color='#CCCCCC',
-            width=0.3,
-            alpha=0.3,
-            ax=ax
-        )
+            nx.draw_networkx_edges(
+                G_filtered, pos,
+                edge_color='#CCCCCC',
+                width=0.3,
+                alpha=0.3,
+                ax=ax
+            )
         
-        # Adiciona labels para os nós mais centrais
-        top_degree_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)[:20]
-        for node, _ in top_degree_nodes:
-            x, y = pos[node]
-            ax.text(x, y, str(node), 
-                fontsize=6, 
-                ha='center', 
-                va='center',
-                bbox=dict(facecolor='black', alpha=0.15, edgecolor='none'))
+            # Adiciona labels para os nós mais centrais
+            top_degree_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)[:20]
+            for node, _ in top_degree_nodes:
+                x, y = pos[node]
+                ax.text(x, y, str(node), 
+                    fontsize=6, 
+                    ha='center', 
+                    va='center',
+                    bbox=dict(facecolor='black', alpha=0.15, edgecolor='none'))
         
-        # Legenda de comunidades
-        legend_elements = [
-            plt.Line2D([0], [0], 
-                    marker='o', 
-                    color='w', 
-                    label=f'Comunidade {comm} ({size} nós)',
-                    markerfacecolor=community_colors[comm], 
-                    markersize=10)
-            for comm, size in sorted(community_sizes.items(), key=lambda x: x[1], reverse=True)
-            if comm in communities_to_keep
-        ]
+            # Legenda de comunidades
+            legend_elements = [
+                plt.Line2D([0], [0], 
+                        marker='o', 
+                        color='w', 
+                        label=f'Comunidade {comm} ({size} nós)',
+                        markerfacecolor=community_colors[comm], 
+                        markersize=10)
+                for comm, size in sorted(community_sizes.items(), key=lambda x: x[1], reverse=True)
+                if comm in communities_to_keep
+            ]
         
-        ax.legend(
-            handles=legend_elements,
-            title="Comunidades Detectadas",
-            loc='upper left',
-            bbox_to_anchor=(1.02, 1),  # um pouco à direita e alinhado ao topo
-            borderaxespad=0.0, # espaçamento entre a legenda e o gráfico
-            frameon=True, # ativa borda
-            framealpha=0.8, # transparência da borda
-            facecolor='#222222',
-            edgecolor='white',
-            fontsize=8
-        )
+            ax.legend(
+                handles=legend_elements,
+                title="Comunidades Detectadas",
+                loc='upper left',
+                bbox_to_anchor=(1.02, 1),  # um pouco à direita e alinhado ao topo
+                borderaxespad=0.0, # espaçamento entre a legenda e o gráfico
+                frameon=True, # ativa borda
+                framealpha=0.8, # transparência da borda
+                facecolor='#222222',
+                edgecolor='white',
+                fontsize=8
+            )
         
-        plt.title(
-            f"Detecção de Comunidades (Louvain) - {len(communities_to_keep)} comunidades com ≥{min_community_size} nós",
-            color='white'
-        )
+            plt.title(
+                f"Detecção de Comunidades ({nome_algoritmo}) - {len(communities_to_keep)} comunidades com ≥{min_community_size} nós",
+                color='white'
+            )
         plt.tight_layout()# evita corte na figura e na legenda
         st.pyplot(fig)
         plt.close()
         
         # Estatísticas
         st.markdown("### 📊 Estatísticas das Comunidades")
-        st.write(f"Total de comunidades detectadas: {len(community_sizes)}")
+        st.write(f"Total de comunidades detectadas: {particao.count}")
         st.write(f"Comunidades com ≥{min_community_size} nós: {len(communities_to_keep)}")
+        st.write(f"Modularidade da partição: {particao.modularity:.4f}")
         
         # Tabela de comunidades
         comm_table = pd.DataFrame(
@@ -768,3 +1544,61 @@ if st.session_state.df is not None:
         ).sort_values("Tamanho", ascending=False)
         
         st.dataframe(comm_table)
+
+        # Drill-down: layout apenas do subgrafo induzido de uma comunidade
+        st.markdown("### 🔍 Explorar uma Comunidade")
+        escolhida = st.selectbox(
+            "Comunidade",
+            [None] + sorted(communities_to_keep),
+            format_func=lambda c: "—" if c is None else f"Comunidade {c} ({community_sizes[c]} nós)",
+            key="community_drilldown",
+        )
+        if escolhida is not None:
+            subgrafo = compacto.subgraph(np.flatnonzero(particao.labels == escolhida))
+            xy = layout_em_cache(
+                ("comunidade", graph_fingerprint, algoritmo, resolucao, escolhida), subgrafo
+            )
+            graus_comunidade = subgrafo.degree()
+
+            fig, ax = plt.subplots(figsize=(12, 8))
+            ax.set_facecolor('#121212')
+            draw_edges(
+                ax, xy, subgrafo.edge_sources(), subgrafo.out_indices,
+                curvature=0.2, color="#CCCCCC", linewidth=0.3, alpha=0.4,
+            )
+            ax.scatter(
+                xy[:, 0], xy[:, 1],
+                s=20 + 200 * graus_comunidade / max(graus_comunidade.max(initial=0), 1),
+                color=community_colors[escolhida], alpha=0.9, zorder=2,
+            )
+            for i in np.argsort(-graus_comunidade)[:15]:
+                ax.text(
+                    xy[i, 0], xy[i, 1], str(subgrafo.labels[i]),
+                    fontsize=6, ha='center', va='center', zorder=3,
+                    bbox=dict(facecolor='black', alpha=0.15, edgecolor='none'),
+                )
+            ax.axis("off")
+            plt.title(
+                f"Comunidade {escolhida}: {subgrafo.number_of_nodes()} nós e "
+                f"{subgrafo.number_of_edges()} arestas internas",
+                color='white'
+            )
+            st.pyplot(fig)
+            plt.close()
+
+        # Varredura de resoluções do Louvain (uma por processo)
+        st.markdown("### 🔁 Comparação de Resoluções (Louvain)")
+        if st.button("Comparar resoluções", key="community_sweep_btn"):
+            with st.spinner("Detectando comunidades em várias resoluções..."):
+                particoes = particoes_por_resolucao(RESOLUCOES_DA_VARREDURA)
+            st.dataframe(
+                pd.DataFrame(
+                    {
+                        "Resolução": [p.resolution for p in particoes],
+                        "Comunidades": [p.count for p in particoes],
+                        "Maior comunidade": [int(p.sizes[0]) if p.count else 0 for p in particoes],
+                        "Modularidade": [round(p.modularity, 4) for p in particoes],
+                    }
+                ),
+                hide_index=True,
+            )
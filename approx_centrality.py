@@ -0,0 +1,213 @@
+"""
+Betweenness e closeness aproximadas por amostragem de pivôs.
+
+Em vez de rodar uma busca em largura a partir de todos os n nós (O(nm)), as
+buscas partem de uma amostra aleatória de k pivôs e o resultado é
+extrapolado. O tamanho da amostra sai de uma meta de erro (epsilon, delta)
+pela desigualdade de Hoeffding, e um orçamento de tempo interrompe a
+amostragem cedo se preciso; o erro efetivamente garantido é recalculado a
+partir do número de pivôs realmente processados.
+"""
+
+import math
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+ApproxResult = namedtuple(
+    "ApproxResult", ["values", "samples", "epsilon", "delta", "exact", "elapsed"]
+)
+ApproxResult.__doc__ = """
+Resultado de uma centralidade aproximada.
+
+Attributes:
+    values: Dict nó -> valor estimado
+    samples: Número de pivôs processados
+    epsilon: Erro máximo garantido com probabilidade 1 - delta (0 se exato)
+    delta: Probabilidade de falha do limite
+    exact: True se todos os nós foram usados como pivô
+    elapsed: Tempo gasto em segundos
+"""
+
+
+def sample_size(n, epsilon=0.05, delta=0.1):
+    """
+    Número de pivôs para erro aditivo epsilon com probabilidade 1 - delta.
+
+    Pelo limite de Hoeffding com união sobre os n nós:
+    k = ln(2n / delta) / (2 * epsilon^2), limitado a n.
+
+    Args:
+        n: Número de nós do grafo
+        epsilon: Erro aditivo máximo (na escala normalizada da métrica)
+        delta: Probabilidade de falha
+
+    Returns:
+        int: Tamanho da amostra
+    """
+    if n <= 1:
+        return n
+    k = math.ceil(math.log(2 * n / delta) / (2 * epsilon**2))
+    return min(n, k)
+
+
+def hoeffding_epsilon(n, k, delta=0.1, value_range=1.0):
+    """Erro aditivo garantido com k pivôs (inverso de `sample_size`)."""
+    if k >= n or k == 0:
+        return 0.0 if k >= n else math.inf
+    return value_range * math.sqrt(math.log(2 * n / delta) / (2 * k))
+
+
+def _choose_pivots(n, k, epsilon, delta, seed):
+    if k is None or k <= 0:
+        k = sample_size(n, epsilon, delta)
+    k = min(k, n)
+    rng = np.random.default_rng(seed)
+    return rng.permutation(n)[:k].tolist()
+
+
+def _bfs_brandes(neighbors, s):
+    """BFS de Brandes a partir de s: ordem de visita, predecessores e sigma."""
+    n = len(neighbors)
+    sigma = [0] * n
+    dist = [-1] * n
+    preds = [[] for _ in range(n)]
+    sigma[s] = 1
+    dist[s] = 0
+    order = []
+    queue = deque([s])
+    while queue:
+        v = queue.popleft()
+        order.append(v)
+        dv = dist[v] + 1
+        sv = sigma[v]
+        for w in neighbors[v]:
+            if dist[w] < 0:
+                dist[w] = dv
+                queue.append(w)
+            if dist[w] == dv:
+                sigma[w] += sv
+                preds[w].append(v)
+    return order, preds, sigma
+
+
+def betweenness(adj, k=None, epsilon=0.05, delta=0.1, time_budget=None, seed=42):
+    """
+    Betweenness aproximada por amostragem de pivôs (Brandes & Pich).
+
+    Os valores seguem a normalização do nx.betweenness_centrality em grafos
+    dirigidos, 1 / ((n-1)(n-2)), extrapolada por n / k.
+
+    Args:
+        adj: CSRAdjacency do grafo (ver sparse_backend)
+        k: Número de pivôs (None ou 0 = derivado de epsilon/delta)
+        epsilon: Erro aditivo alvo quando k não é informado
+        delta: Probabilidade de falha do limite
+        time_budget: Tempo máximo em segundos (None = sem limite)
+        seed: Semente da amostragem
+
+    Returns:
+        ApproxResult: Valores estimados e limite de erro obtido
+    """
+    start = time.perf_counter()
+    n = len(adj)
+    neighbors = adj.successor_lists()
+    pivots = _choose_pivots(n, k, epsilon, delta, seed)
+
+    bc = [0.0] * n
+    processed = 0
+    for s in pivots:
+        if time_budget is not None and processed > 0 and time.perf_counter() - start > time_budget:
+            break
+        order, preds, sigma = _bfs_brandes(neighbors, s)
+        dependency = [0.0] * n
+        for w in reversed(order):
+            coeff = (1.0 + dependency[w]) / sigma[w]
+            for v in preds[w]:
+                dependency[v] += sigma[v] * coeff
+            if w != s:
+                bc[w] += dependency[w]
+        processed += 1
+
+    values = np.asarray(bc)
+    if n > 2 and processed > 0:
+        values *= n / (processed * (n - 1) * (n - 2))
+    return ApproxResult(
+        adj.to_dict(values),
+        processed,
+        hoeffding_epsilon(n, processed, delta, value_range=n / max(n - 1, 1)),
+        delta,
+        processed >= n,
+        time.perf_counter() - start,
+    )
+
+
+def closeness(adj, k=None, epsilon=0.05, delta=0.1, time_budget=None, seed=42):
+    """
+    Closeness aproximada por amostragem de fontes (Eppstein & Wang).
+
+    Cada pivô s faz uma BFS pelas arestas de saída, o que dá d(s, u) para todo u
+    alcançável. A soma das distâncias de entrada e o número de nós que
+    alcançam u são extrapolados por n / k, e o valor final usa a mesma fórmula
+    do nx.closeness_centrality (com a correção de Wasserman-Faust).
+
+    O epsilon retornado limita o erro da distância média até cada nó, em
+    unidades de saltos.
+
+    Args:
+        adj: CSRAdjacency do grafo (ver sparse_backend)
+        k: Número de pivôs (None ou 0 = derivado de epsilon/delta)
+        epsilon: Erro alvo relativo ao diâmetro quando k não é informado
+        delta: Probabilidade de falha do limite
+        time_budget: Tempo máximo em segundos (None = sem limite)
+        seed: Semente da amostragem
+
+    Returns:
+        ApproxResult: Valores estimados e limite de erro obtido
+    """
+    start = time.perf_counter()
+    n = len(adj)
+    neighbors = adj.successor_lists()
+    pivots = _choose_pivots(n, k, epsilon, delta, seed)
+
+    dist_sum = np.zeros(n)
+    reach = np.zeros(n)
+    max_depth = 0
+    processed = 0
+    for s in pivots:
+        if time_budget is not None and processed > 0 and time.perf_counter() - start > time_budget:
+            break
+        dist = {s: 0}
+        queue = deque([s])
+        while queue:
+            v = queue.popleft()
+            dv = dist[v] + 1
+            for w in neighbors[v]:
+                if w not in dist:
+                    dist[w] = dv
+                    queue.append(w)
+        del dist[s]
+        if dist:
+            idx = np.fromiter(dist.keys(), dtype=np.int64, count=len(dist))
+            d = np.fromiter(dist.values(), dtype=np.float64, count=len(dist))
+            dist_sum[idx] += d
+            reach[idx] += 1
+            max_depth = max(max_depth, int(d.max()))
+        processed += 1
+
+    values = np.zeros(n)
+    if processed > 0 and n > 1:
+        scale = n / processed
+        est_sum = dist_sum * scale
+        est_reach = np.minimum(reach * scale, n - 1)
+        ok = est_sum > 0
+        values[ok] = (est_reach[ok] / est_sum[ok]) * (est_reach[ok] / (n - 1))
+    return ApproxResult(
+        adj.to_dict(values),
+        processed,
+        hoeffding_epsilon(n, processed, delta, value_range=max_depth),
+        delta,
+        processed >= n,
+        time.perf_counter() - start,
+    )
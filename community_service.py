@@ -0,0 +1,218 @@
+"""
+Detecção de comunidades sobre a adjacência CSR não dirigida.
+
+As partições são calculadas a partir da mesma CSR simétrica usada pelas
+métricas de distância e memoizadas pelo motor de métricas por (grafo,
+algoritmo, resolução, semente); depois disso, filtrar comunidades por tamanho
+é só uma consulta aos vetores da partição, e o super-grafo das comunidades
+sai dos mesmos vetores. Além do Louvain (python-louvain), há uma propagação
+de rótulos vetorizada, bem mais rápida em grafos grandes, e uma varredura de
+resoluções do Louvain em processos paralelos.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import community as community_louvain
+import networkx as nx
+import numpy as np
+
+ALGORITMOS = ("louvain", "label_propagation")
+
+
+class Partition(NamedTuple):
+    """
+    Partição dos nós em comunidades.
+
+    As comunidades são numeradas por tamanho decrescente (0 = a maior).
+    """
+
+    labels: np.ndarray  # comunidade de cada nó, na ordem dos IDs
+    sizes: np.ndarray  # número de nós de cada comunidade
+    modularity: float
+    algorithm: str
+    resolution: float
+
+    @property
+    def count(self):
+        return len(self.sizes)
+
+    def mask(self, min_size):
+        """Nós que pertencem a comunidades com pelo menos `min_size` nós."""
+        return self.sizes[self.labels] >= min_size
+
+    def to_dict(self, nodes):
+        """Dict rótulo do nó -> comunidade, como o de `best_partition`."""
+        return dict(zip(nodes, self.labels.tolist()))
+
+
+class SuperGraph(NamedTuple):
+    """Grafo quociente das comunidades: cada comunidade vira um super-nó."""
+
+    graph: object  # CompactGraph cujos rótulos são os números das comunidades
+    members: np.ndarray  # número de nós de cada super-nó
+    weights: np.ndarray  # número de arestas entre as comunidades, na ordem do CSR
+
+
+def super_graph(graph, partition, min_size=1):
+    """
+    Contrai cada comunidade da partição num único nó, de forma vetorizada.
+
+    Args:
+        graph: CompactGraph com os mesmos IDs de nó da partição
+        partition: Partition (ver `detect`)
+        min_size: Comunidades menores que isto ficam de fora
+
+    Returns:
+        SuperGraph: Grafo quociente com o tamanho de cada comunidade e o
+        número de arestas entre cada par de comunidades
+    """
+    groups = np.where(partition.mask(min_size), partition.labels, -1)
+    return SuperGraph(*graph.quotient(groups))
+
+
+def modularity(matrix, labels, resolution=1.0):
+    """
+    Modularidade de uma partição, calculada de forma vetorizada.
+
+    Args:
+        matrix: Adjacência simétrica (scipy CSR) do grafo não dirigido
+        labels: Comunidade de cada nó
+        resolution: Parâmetro de resolução (1 = modularidade clássica)
+
+    Returns:
+        float: Mesmo valor de `nx.community.modularity` no grafo não dirigido
+    """
+    total = matrix.sum()  # 2m
+    if total == 0:
+        return 0.0
+    labels = np.asarray(labels)
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    inside = matrix.data[labels[rows] == labels[matrix.indices]].sum()
+    degree_sums = np.bincount(labels, weights=np.asarray(matrix.sum(axis=1)).ravel())
+    return float(inside / total - resolution * (degree_sums**2).sum() / total**2)
+
+
+def _renumber(labels):
+    """Renumera as comunidades por tamanho decrescente."""
+    _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return rank[inverse], counts[order]
+
+
+def louvain(matrix, resolution=1.0, seed=42):
+    """Louvain (python-louvain) sobre um grafo NetworkX montado da CSR simétrica."""
+    n = matrix.shape[0]
+    coo = matrix.tocoo()
+    upper = coo.row < coo.col
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    G.add_edges_from(zip(coo.row[upper].tolist(), coo.col[upper].tolist()))
+    partition = community_louvain.best_partition(G, resolution=resolution, random_state=seed)
+    return np.fromiter((partition[i] for i in range(n)), dtype=np.int64, count=n)
+
+
+def label_propagation(matrix, seed=42, max_iter=100):
+    """
+    Propagação de rótulos semi-síncrona, vetorizada sobre a CSR.
+
+    A cada rodada, metade dos nós (sorteada) adota o rótulo mais frequente
+    entre os vizinhos; empates favorecem o rótulo atual e depois são
+    sorteados. Atualizar só parte dos nós evita a oscilação da versão
+    síncrona em estruturas bipartidas. Para quando nenhum nó muda de rótulo.
+
+    Args:
+        matrix: Adjacência simétrica (scipy CSR)
+        seed: Semente dos sorteios
+        max_iter: Número máximo de rodadas
+
+    Returns:
+        np.ndarray: Rótulo de cada nó
+    """
+    n = matrix.shape[0]
+    rng = np.random.default_rng(seed)
+    labels = np.arange(n, dtype=np.int64)
+    rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(matrix.indptr))
+    if len(rows) == 0:
+        return labels
+
+    for _ in range(max_iter):
+        keys, counts = np.unique(rows * n + labels[matrix.indices], return_counts=True)
+        node, label = keys // n, keys % n
+        score = counts + 0.9 * (label == labels[node]) + 0.1 * rng.random(len(keys))
+        order = np.lexsort((score, node))
+        last = np.flatnonzero(np.r_[node[order][1:] != node[order][:-1], True])
+        best = labels.copy()
+        best[node[order][last]] = label[order][last]
+
+        changed = best != labels
+        if not changed.any():
+            break
+        update = changed & (rng.random(n) < 0.5)
+        labels[update] = best[update]
+    return labels
+
+
+def _detect_matrix(matrix, algorithm, resolution, seed):
+    if algorithm == "louvain":
+        labels = louvain(matrix, resolution=resolution, seed=seed)
+    elif algorithm == "label_propagation":
+        labels = label_propagation(matrix, seed=seed)
+    else:
+        raise ValueError(f"Algoritmo de comunidades desconhecido: {algorithm}")
+    labels, sizes = _renumber(labels)
+    return Partition(labels, sizes, modularity(matrix, labels, resolution), algorithm, resolution)
+
+
+def detect(adj, algorithm="louvain", resolution=1.0, seed=42):
+    """
+    Detecta as comunidades do grafo.
+
+    Args:
+        adj: CSRAdjacency simétrica (representação "csr_undirected")
+        algorithm: "louvain" ou "label_propagation" (esta ignora a resolução
+            na detecção, mas ela ainda entra no cálculo da modularidade)
+        resolution: Resolução do Louvain (maior = comunidades menores)
+        seed: Semente do algoritmo
+
+    Returns:
+        Partition: Partição com as comunidades numeradas por tamanho
+
+    Raises:
+        ValueError: Se o algoritmo for desconhecido
+    """
+    return _detect_matrix(adj.matrix, algorithm, resolution, seed)
+
+
+def sweep(adj, resolutions, algorithm="louvain", seed=42, processes=None):
+    """
+    Detecta as comunidades para várias resoluções, uma por processo.
+
+    Args:
+        adj: CSRAdjacency simétrica
+        resolutions: Sequência de resoluções
+        algorithm: Algoritmo (ver `detect`)
+        seed: Semente do algoritmo
+        processes: Número de processos (None = todos os núcleos; 1 = sequencial)
+
+    Returns:
+        list: Uma Partition por resolução, na mesma ordem
+    """
+    resolutions = list(resolutions)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(resolutions)))
+    if processes == 1:
+        return [_detect_matrix(adj.matrix, algorithm, r, seed) for r in resolutions]
+
+    with ProcessPoolExecutor(
+        max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = [
+            executor.submit(_detect_matrix, adj.matrix, algorithm, r, seed) for r in resolutions
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,300 @@
+"""
+Representação compacta de grafos dirigidos com IDs inteiros.
+
+Os rótulos dos nós (handles do Twitter, títulos da Wikipedia...) são
+internados uma única vez numa tabela de nós; as arestas ficam em vetores
+NumPy int32 no formato CSR (vizinhos de saída) e CSC (vizinhos de entrada).
+Isso ocupa alguns bytes por aresta, contra centenas nos dicionários do
+NetworkX, e permite calcular graus, componentes e centralidades de forma
+vetorizada. A conversão de/para NetworkX é feita sob demanda.
+"""
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+from sparse_backend import CSRAdjacency
+
+
+def _indptr(counts):
+    indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr
+
+
+class CompactGraph:
+    """
+    Grafo dirigido simples (sem arestas paralelas) com nós 0..n-1.
+
+    Attributes:
+        labels: pd.Index com o rótulo de cada ID de nó
+        out_indptr, out_indices: CSR dos vizinhos de saída (int64 / int32)
+        in_indptr, in_indices: CSC dos vizinhos de entrada (int64 / int32)
+    """
+
+    def __init__(self, labels, sources, targets):
+        """
+        Monta o grafo a partir de vetores de IDs de origem e destino.
+
+        Arestas repetidas são colapsadas; auto-laços devem ser removidos antes.
+
+        Args:
+            labels: Sequência de rótulos (posição = ID do nó)
+            sources: Vetor de IDs de origem
+            targets: Vetor de IDs de destino
+        """
+        self.labels = pd.Index(labels)
+        n = len(self.labels)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+
+        # Ordena por (origem, destino) e remove duplicatas numa só passada
+        keys = np.unique(sources * n + targets) if n else np.zeros(0, dtype=np.int64)
+        src = (keys // max(n, 1)).astype(np.int32)
+        dst = (keys % max(n, 1)).astype(np.int32)
+
+        self.out_indptr = _indptr(np.bincount(src, minlength=n))
+        self.out_indices = dst
+        order = np.lexsort((src, dst))
+        self.in_indptr = _indptr(np.bincount(dst, minlength=n))
+        self.in_indices = src[order]
+
+    # -----------------------------------------------------------------
+    # Construção e conversão
+    # -----------------------------------------------------------------
+    @classmethod
+    def from_edge_frame(cls, df, source="source", target="target"):
+        """
+        Constrói o grafo de uma lista de arestas (usado por `graph_cache.build_compact_graph`).
+
+        Linhas sem origem ou destino são ignoradas e os auto-laços removidos
+        (os nós envolvidos são mantidos, como no NetworkX). Colunas categóricas
+        com as mesmas categorias (ver ingest) reaproveitam os códigos
+        diretamente, sem refazer o hash dos rótulos.
+
+        Args:
+            df: DataFrame com as colunas de origem e destino
+            source: Nome da coluna de origem
+            target: Nome da coluna de destino
+
+        Returns:
+            CompactGraph: Grafo compacto
+        """
+        src_col, tgt_col = df[source], df[target]
+        mask = (src_col.notna() & tgt_col.notna()).to_numpy()
+        src_col, tgt_col = src_col[mask], tgt_col[mask]
+
+        same_categories = (
+            isinstance(src_col.dtype, pd.CategoricalDtype)
+            and isinstance(tgt_col.dtype, pd.CategoricalDtype)
+            and src_col.cat.categories.equals(tgt_col.cat.categories)
+        )
+        if same_categories:
+            labels = src_col.cat.categories
+            src = src_col.cat.codes.to_numpy(dtype=np.int64)
+            dst = tgt_col.cat.codes.to_numpy(dtype=np.int64)
+        else:
+            codes, labels = pd.factorize(
+                pd.concat([src_col, tgt_col], ignore_index=True), sort=False
+            )
+            src, dst = codes[: len(src_col)], codes[len(src_col):]
+
+        # Descarta rótulos que não aparecem em nenhuma aresta restante
+        used = np.zeros(len(labels), dtype=bool)
+        used[src] = True
+        used[dst] = True
+        if not used.all():
+            remap = np.cumsum(used) - 1
+            labels = labels[used]
+            src, dst = remap[src], remap[dst]
+
+        loops = src == dst
+        return cls(labels, src[~loops], dst[~loops])
+
+    @classmethod
+    def from_arrays(cls, labels, out_indptr, out_indices, in_indptr, in_indices):
+        """
+        Monta o grafo diretamente dos vetores CSR/CSC, sem reordenar nem copiar.
+
+        Usado ao abrir o formato binário (ver graph_store), onde os vetores
+        podem ser np.memmap somente-leitura.
+        """
+        graph = cls.__new__(cls)
+        graph.labels = pd.Index(labels)
+        graph.out_indptr = out_indptr
+        graph.out_indices = out_indices
+        graph.in_indptr = in_indptr
+        graph.in_indices = in_indices
+        return graph
+
+    @classmethod
+    def from_networkx(cls, G):
+        """Converte um grafo NetworkX (dirigido ou não) em CompactGraph."""
+        labels = pd.Index(list(G.nodes()), tupleize_cols=False)
+        edges = list(G.edges())
+        if edges:
+            src = labels.get_indexer([u for u, _ in edges])
+            dst = labels.get_indexer([v for _, v in edges])
+        else:
+            src = dst = np.zeros(0, dtype=np.int64)
+        if not G.is_directed():
+            src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+        loops = src == dst
+        return cls(labels, src[~loops], dst[~loops])
+
+    def to_networkx(self):
+        """Converte para nx.DiGraph (nós na ordem dos IDs)."""
+        G = nx.DiGraph()
+        G.add_nodes_from(self.labels)
+        labels = self.labels.to_numpy()
+        G.add_edges_from(zip(labels[self.edge_sources()], labels[self.out_indices]))
+        return G
+
+    def to_edge_frame(self, source="source", target="target"):
+        """Lista de arestas como DataFrame categórico (códigos = IDs dos nós)."""
+        return pd.DataFrame(
+            {
+                source: pd.Categorical.from_codes(self.edge_sources(), categories=self.labels),
+                target: pd.Categorical.from_codes(
+                    np.asarray(self.out_indices), categories=self.labels
+                ),
+            }
+        )
+
+    def adjacency(self):
+        """Matriz de adjacência scipy CSR que compartilha os vetores do grafo."""
+        n = self.number_of_nodes()
+        data = np.ones(len(self.out_indices), dtype=np.float64)
+        return sp.csr_array((data, self.out_indices, self.out_indptr), shape=(n, n))
+
+    def undirected_adjacency(self):
+        """Adjacência simétrica sem pesos (u-v existe se u->v ou v->u existir)."""
+        A = self.adjacency()
+        S = sp.csr_array(A + A.T)
+        S.data[:] = 1.0
+        return S
+
+    def subgraph(self, node_ids):
+        """
+        Subgrafo induzido pelos nós dados.
+
+        Args:
+            node_ids: IDs dos nós mantidos; a ordem define os novos IDs
+
+        Returns:
+            CompactGraph: Subgrafo com nós 0..len(node_ids)-1
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        remap = np.full(self.number_of_nodes(), -1, dtype=np.int64)
+        remap[node_ids] = np.arange(len(node_ids))
+        src = remap[self.edge_sources()]
+        dst = remap[np.asarray(self.out_indices)]
+        keep = (src >= 0) & (dst >= 0)
+        return CompactGraph(self.labels[node_ids], src[keep], dst[keep])
+
+    def quotient(self, groups):
+        """
+        Grafo quociente: cada grupo de nós vira um único nó.
+
+        Arestas entre nós do mesmo grupo são descartadas e as arestas entre
+        dois grupos são somadas num peso.
+
+        Args:
+            groups: Vetor com o grupo de cada nó (valores negativos = nó ignorado)
+
+        Returns:
+            tuple: (CompactGraph cujos rótulos são os grupos, número de nós de
+            cada grupo, peso de cada aresta na ordem do CSR de saída)
+        """
+        groups = np.asarray(groups)
+        valid = groups >= 0
+        names, inverse = np.unique(groups[valid], return_inverse=True)
+        ids = np.full(len(groups), -1, dtype=np.int64)
+        ids[valid] = inverse
+        k = len(names)
+
+        src = ids[self.edge_sources()]
+        dst = ids[np.asarray(self.out_indices)]
+        keep = (src >= 0) & (dst >= 0) & (src != dst)
+        keys, weights = np.unique(src[keep] * k + dst[keep], return_counts=True)
+        graph = CompactGraph(names, keys // max(k, 1), keys % max(k, 1))
+        return graph, np.bincount(inverse, minlength=k), weights
+
+    def to_csr_adjacency(self):
+        """CSRAdjacency (ver sparse_backend) para as métricas esparsas."""
+        return CSRAdjacency(self.adjacency(), self.labels)
+
+    # -----------------------------------------------------------------
+    # Consultas básicas
+    # -----------------------------------------------------------------
+    def __len__(self):
+        return len(self.labels)
+
+    def is_directed(self):
+        """Sempre dirigido (mesma interface do NetworkX, ex: para nx.density)."""
+        return True
+
+    def number_of_nodes(self):
+        return len(self.labels)
+
+    def number_of_edges(self):
+        return len(self.out_indices)
+
+    @property
+    def nbytes(self):
+        """Memória ocupada pelos vetores de arestas (sem a tabela de rótulos)."""
+        return sum(
+            a.nbytes for a in (self.out_indptr, self.out_indices, self.in_indptr, self.in_indices)
+        )
+
+    def edge_sources(self):
+        """ID de origem de cada aresta, na ordem do CSR."""
+        return np.repeat(
+            np.arange(self.number_of_nodes(), dtype=np.int32), np.diff(self.out_indptr)
+        )
+
+    def successors(self, node_id):
+        return self.out_indices[self.out_indptr[node_id]:self.out_indptr[node_id + 1]]
+
+    def predecessors(self, node_id):
+        return self.in_indices[self.in_indptr[node_id]:self.in_indptr[node_id + 1]]
+
+    def out_degree(self):
+        return np.diff(self.out_indptr)
+
+    def in_degree(self):
+        return np.diff(self.in_indptr)
+
+    def degree(self):
+        """Grau total (entrada + saída), como G.degree() num DiGraph."""
+        return self.out_degree() + self.in_degree()
+
+    def to_dict(self, values):
+        """Converte um vetor indexado pelos IDs num dict rótulo -> valor."""
+        return dict(zip(self.labels, np.asarray(values).tolist()))
+
+    # -----------------------------------------------------------------
+    # Métricas vetorizadas
+    # -----------------------------------------------------------------
+    def degree_centrality(self):
+        """Centralidade de grau normalizada por n - 1 (como nx.degree_centrality)."""
+        n = self.number_of_nodes()
+        if n <= 1:
+            return np.ones(n)
+        return self.degree() / (n - 1)
+
+    def components(self, connection="weak"):
+        """
+        Componentes fraca ou fortemente conectados.
+
+        Args:
+            connection: "weak" ou "strong"
+
+        Returns:
+            tuple: (número de componentes, vetor com o componente de cada nó)
+        """
+        if self.number_of_nodes() == 0:
+            return 0, np.zeros(0, dtype=np.int32)
+        return connected_components(self.adjacency(), directed=True, connection=connection)
@@ -0,0 +1,233 @@
+"""
+Índice de duplicatas do scraper: um hash de 64 bits por tweet salvo.
+
+Em vez de carregar o CSV inteiro num conjunto de tuplas com o texto dos
+tweets, cada linha (source, target, tweet_text, tweet_date) vira um hash de
+64 bits, com os @ normalizados para minúsculas. Os hashes ficam num vetor
+NumPy ordenado, salvo em .npy e aberto por mapeamento de memória: a
+inicialização só lê o índice (8 bytes por tweet), e a busca de um lote é uma
+busca binária vetorizada. Um filtro de Bloom opcional responde "certamente
+novo" sem tocar no vetor mapeado para a maioria dos tweets.
+
+Um pequeno arquivo .json ao lado do índice guarda o tamanho do CSV coberto;
+se o CSV tiver mudado por fora (ou a coleta tiver caído antes de salvar o
+índice), o índice é reconstruído lendo o CSV em blocos.
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+COLUNAS = ["source", "target", "tweet_text", "tweet_date"]
+# Linhas do CSV lidas por bloco ao reconstruir o índice
+LINHAS_POR_BLOCO = 200_000
+# Hashes novos mantidos em memória antes de regravar o .npy
+MAX_HASHES_RECENTES = 100_000
+# Bits do filtro de Bloom por tweet (~1% de falsos positivos)
+BITS_POR_ITEM = 10
+
+
+def tweet_hashes(rows):
+    """
+    Hash de 64 bits de cada tweet, com source e target em minúsculas.
+
+    Args:
+        rows: DataFrame com as colunas de COLUNAS ou lista de tuplas nessa ordem
+
+    Returns:
+        np.ndarray: Vetor uint64 com um hash por linha
+    """
+    if not isinstance(rows, pd.DataFrame):
+        rows = pd.DataFrame(list(rows), columns=COLUNAS)
+    frame = rows[COLUNAS].fillna("").astype(str)
+    frame["source"] = frame["source"].str.lower()
+    frame["target"] = frame["target"].str.lower()
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(np.uint64)
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre hashes de 64 bits (sem falsos negativos).
+
+    As k posições de cada item saem de hashing duplo com as duas metades do
+    próprio hash de 64 bits.
+    """
+
+    def __init__(self, capacity, bits_per_item=BITS_POR_ITEM):
+        self.capacity = max(1, int(capacity))
+        self.n_bits = max(64, self.capacity * bits_per_item)
+        self.n_hashes = max(1, round(bits_per_item * math.log(2)))
+        self.bits = np.zeros((self.n_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, hashes):
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.n_hashes, dtype=np.uint64)
+        return (h1[:, None] + steps * h2[:, None]) % np.uint64(self.n_bits)
+
+    def add(self, hashes):
+        positions = self._positions(np.asarray(hashes, dtype=np.uint64)).ravel()
+        masks = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), masks)
+        self.count += len(hashes)
+
+    def might_contain(self, hashes):
+        """Falso = certamente ausente; verdadeiro = talvez presente."""
+        positions = self._positions(np.asarray(hashes, dtype=np.uint64))
+        bits = (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=1)
+
+
+class DedupIndex:
+    """
+    Conjunto persistente de hashes de tweets já salvos.
+
+    Attributes:
+        path: Arquivo .npy do índice (None = só em memória)
+        bloom: BloomFilter à frente da busca binária (None = desligado)
+    """
+
+    def __init__(self, hashes=None, path=None, bloom=True):
+        self.path = path
+        self._sorted = np.zeros(0, dtype=np.uint64) if hashes is None else hashes
+        self._recent = np.zeros(0, dtype=np.uint64)  # ordenados, ainda fora do .npy
+        self.bloom = None
+        if bloom:
+            self._rebuild_bloom()
+
+    @classmethod
+    def open(cls, path, csv_path, bloom=True):
+        """
+        Abre o índice de um CSV, reconstruindo-o se estiver desatualizado.
+
+        Args:
+            path: Arquivo .npy do índice
+            csv_path: CSV do scraper que o índice descreve
+            bloom: Usa o filtro de Bloom
+
+        Returns:
+            DedupIndex: Índice com todos os tweets do CSV
+        """
+        csv_size = os.path.getsize(csv_path) if os.path.exists(csv_path) else 0
+        if os.path.exists(path) and _read_meta(path).get("csv_size") == csv_size:
+            return cls(np.load(path, mmap_mode="r"), path, bloom)
+        index = cls(cls.hashes_from_csv(csv_path), path, bloom)
+        index.save(csv_size)
+        return index
+
+    @staticmethod
+    def remove(path):
+        """Apaga o .npy de um índice e os arquivos ao lado dele (.json, .tmp)."""
+        for name in (path, f"{path}.json", f"{path}.tmp"):
+            if os.path.exists(name):
+                os.remove(name)
+
+    @staticmethod
+    def hashes_from_csv(csv_path, chunksize=LINHAS_POR_BLOCO):
+        """Hashes ordenados e únicos de um CSV, lido em blocos."""
+        if not os.path.exists(csv_path):
+            return np.zeros(0, dtype=np.uint64)
+        parts = [
+            tweet_hashes(chunk)
+            for chunk in pd.read_csv(
+                csv_path, usecols=COLUNAS, dtype=str, keep_default_na=False, chunksize=chunksize
+            )
+        ]
+        return np.unique(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self._sorted) + len(self._recent)
+
+    def contains(self, hashes):
+        """Vetor booleano: quais hashes já estão no índice."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        found = np.zeros(len(hashes), dtype=bool)
+        candidates = np.arange(len(hashes))
+        if self.bloom is not None:
+            candidates = candidates[self.bloom.might_contain(hashes)]
+        for keys in (self._sorted, self._recent):
+            if len(keys) and len(candidates):
+                wanted = hashes[candidates]
+                pos = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+                found[candidates] |= keys[pos] == wanted
+        return found
+
+    def missing(self, hashes):
+        """
+        Máscara dos hashes de um lote que ainda não estão no índice.
+
+        Repetições dentro do próprio lote contam só na primeira ocorrência.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        first = np.zeros(len(hashes), dtype=bool)
+        first[np.unique(hashes, return_index=True)[1]] = True
+        return first & ~self.contains(hashes)
+
+    def add(self, hashes):
+        """Registra um lote de hashes (os já presentes são ignorados)."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        fresh = np.sort(hashes[self.missing(hashes)])
+        if len(fresh) == 0:
+            return
+        self._recent = np.insert(self._recent, np.searchsorted(self._recent, fresh), fresh)
+        if self.bloom is not None:
+            if len(self) > self.bloom.capacity:
+                self._rebuild_bloom()
+            else:
+                self.bloom.add(fresh)
+
+    def needs_save(self):
+        return len(self._recent) >= MAX_HASHES_RECENTES
+
+    def save(self, csv_size):
+        """
+        Incorpora os hashes recentes ao vetor ordenado e grava o .npy.
+
+        Args:
+            csv_size: Tamanho atual do CSV (em bytes), guardado para detectar
+                um índice desatualizado na próxima abertura
+        """
+        if not len(self._recent) and isinstance(self._sorted, np.memmap):
+            # Nada novo: o .npy mapeado já está em dia, só o tamanho do CSV muda
+            if self.path:
+                self._write_meta(csv_size)
+            return
+        if len(self._recent):
+            merged = np.insert(
+                np.asarray(self._sorted), np.searchsorted(self._sorted, self._recent), self._recent
+            )
+            self._sorted, self._recent = merged, np.zeros(0, dtype=np.uint64)
+        if not self.path:
+            return
+        if isinstance(self._sorted, np.memmap):
+            # Solta o mapeamento antes de substituir o arquivo (o Windows não
+            # deixa substituir um arquivo mapeado)
+            self._sorted = np.array(self._sorted)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as f:
+            np.save(f, self._sorted)
+        os.replace(temporary, self.path)
+        self._sorted = np.load(self.path, mmap_mode="r")
+        self._write_meta(csv_size)
+
+    def _write_meta(self, csv_size):
+        with open(f"{self.path}.json", "w", encoding="utf-8") as f:
+            json.dump({"csv_size": csv_size, "count": len(self._sorted)}, f)
+
+    def _rebuild_bloom(self):
+        self.bloom = BloomFilter(2 * max(len(self), MAX_HASHES_RECENTES))
+        for keys in (self._sorted, self._recent):
+            for start in range(0, len(keys), LINHAS_POR_BLOCO):
+                self.bloom.add(np.asarray(keys[start:start + LINHAS_POR_BLOCO]))
+
+
+def _read_meta(path):
+    try:
+        with open(f"{path}.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
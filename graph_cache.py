@@ -0,0 +1,138 @@
+"""
+Cache da construção do grafo a partir da lista de arestas.
+
+O Streamlit reexecuta o script inteiro a cada interação com um widget. Para não
+reconstruir o grafo toda vez, o CompactGraph é indexado por um hash do conteúdo
+das colunas 'source'/'target' e guardado num cache LRU limitado por quantidade
+de entradas e por um orçamento aproximado de memória. O DiGraph do NetworkX não
+é guardado aqui: o motor de métricas o constrói sob demanda, só para os
+caminhos que dependem dele (ver metric_engine.MetricEngine.representation).
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from compact_graph import CompactGraph
+
+
+def edge_list_fingerprint(df, source="source", target="target"):
+    """
+    Calcula um hash estável do conteúdo da lista de arestas.
+
+    Apenas as colunas de origem e destino entram no hash; colunas extras
+    (ex: tweet_text) não alteram o grafo e portanto não alteram a chave.
+
+    Args:
+        df: DataFrame com as colunas de origem e destino
+        source: Nome da coluna de origem
+        target: Nome da coluna de destino
+
+    Returns:
+        str: Digest hexadecimal de 32 caracteres
+    """
+    arestas = df[[source, target]]
+    hashes = pd.util.hash_pandas_object(arestas, index=False).to_numpy()
+    digest = hashlib.blake2b(hashes.tobytes(), digest_size=16)
+    digest.update(f"{len(arestas)}|{source}|{target}".encode())
+    return digest.hexdigest()
+
+
+def build_compact_graph(df, source="source", target="target"):
+    """
+    Constrói o grafo compacto (IDs inteiros) da lista de arestas.
+
+    Valores nulos, auto-laços e arestas repetidas são descartados de forma
+    vetorizada (ver compact_graph.CompactGraph.from_edge_frame).
+    """
+    return CompactGraph.from_edge_frame(df, source, target)
+
+
+def estimate_graph_bytes(compact):
+    """Memória ocupada por um CompactGraph: vetores CSR/CSC e tabela de rótulos."""
+    return compact.nbytes + int(compact.labels.memory_usage(deep=True))
+
+
+class GraphCache:
+    """
+    Cache LRU de grafos construídos, indexado pelo hash da lista de arestas.
+
+    Cada entrada guarda só o CompactGraph, usado pelas métricas vetorizadas;
+    o DiGraph é derivado dele sob demanda pelo motor de métricas.
+
+    A evicção acontece quando o número de entradas passa de `max_entries` ou
+    quando a soma das estimativas de memória passa de `max_bytes`. A entrada
+    mais recente nunca é removida, mesmo que sozinha exceda o orçamento.
+    """
+
+    def __init__(self, max_entries=4, max_bytes=2 * 1024**3):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # fingerprint -> (compacto, bytes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self._entries
+
+    @property
+    def total_bytes(self):
+        return sum(entry[-1] for entry in self._entries.values())
+
+    def get(self, fingerprint):
+        """Retorna o CompactGraph em cache (marcando-o como recente) ou None."""
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                return None
+            self._entries.move_to_end(fingerprint)
+            return entry[0]
+
+    def put(self, fingerprint, compact):
+        """Insere um grafo compacto no cache e aplica a política de evicção."""
+        with self._lock:
+            self._entries[fingerprint] = (compact, estimate_graph_bytes(compact))
+            self._entries.move_to_end(fingerprint)
+            self._evict()
+
+    def get_or_build(self, df, source="source", target="target", fingerprint=None):
+        """
+        Retorna o grafo da lista de arestas, construindo-o apenas se necessário.
+
+        Args:
+            df: DataFrame com as colunas de origem e destino
+            source: Nome da coluna de origem
+            target: Nome da coluna de destino
+            fingerprint: Hash já calculado da lista de arestas (opcional)
+
+        Returns:
+            tuple: (fingerprint, CompactGraph)
+        """
+        if fingerprint is None:
+            fingerprint = edge_list_fingerprint(df, source, target)
+        compact = self.get(fingerprint)
+        if compact is not None:
+            self.hits += 1
+            return fingerprint, compact
+        self.misses += 1
+        compact = build_compact_graph(df, source, target)
+        self.put(fingerprint, compact)
+        return fingerprint, compact
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self):
+        total = sum(entry[-1] for entry in self._entries.values())
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or total > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            total -= entry[-1]
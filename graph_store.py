@@ -0,0 +1,247 @@
+"""
+Formato binário (.rgraph) para salvar e reabrir grafos processados.
+
+O arquivo é único e pode ser mapeado em memória: um cabeçalho JSON descreve
+os vetores gravados em seguida (tabela de nós, CSR de saída, CSC de entrada e
+atributos de aresta opcionais), cada um alinhado a 64 bytes. Na leitura os
+vetores viram np.memmap somente-leitura, então abrir o grafo quase não tem
+custo de parsing e várias sessões do Streamlit no mesmo host compartilham as
+mesmas páginas do cache do sistema operacional.
+
+Layout:
+    8 bytes   MAGIC
+    8 bytes   tamanho do cabeçalho (uint64 little-endian)
+    N bytes   cabeçalho JSON (utf-8)
+    ...       região de dados, iniciando no primeiro múltiplo de ALIGNMENT
+              após o cabeçalho; os offsets do cabeçalho são relativos a ela
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from compact_graph import CompactGraph
+
+MAGIC = b"RGRAPH01"
+ALIGNMENT = 64
+FORMAT_VERSION = 1
+EXTENSION = ".rgraph"
+
+_GRAPH_ARRAYS = ("out_indptr", "out_indices", "in_indptr", "in_indices")
+
+
+def _encode_labels(labels):
+    """Tabela de nós como um blob utf-8 e os offsets (em bytes) de cada rótulo."""
+    encoded = [str(label).encode("utf-8") for label in labels]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return blob, offsets
+
+
+def _decode_labels(blob, offsets):
+    data = bytes(blob)
+    bounds = offsets.tolist()
+    return [data[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(len(bounds) - 1)]
+
+
+def _padding(position):
+    return (-position) % ALIGNMENT
+
+
+def _data_start(header_size):
+    """Offset absoluto do início da região de dados."""
+    end = len(MAGIC) + 8 + header_size
+    return end + _padding(end)
+
+
+def save_graph(graph, path, edge_attrs=None, meta=None):
+    """
+    Grava um CompactGraph no formato binário.
+
+    Args:
+        graph: CompactGraph a ser salvo
+        path: Caminho do arquivo de saída (.rgraph)
+        edge_attrs: Dict opcional nome -> vetor com um valor por aresta, na
+            ordem do CSR de saída
+        meta: Dict opcional de metadados serializáveis em JSON (ex: fingerprint)
+
+    Returns:
+        int: Tamanho do arquivo gravado, em bytes
+
+    Raises:
+        ValueError: Se um atributo de aresta não tiver um valor por aresta
+    """
+    label_blob, label_offsets = _encode_labels(graph.labels)
+    arrays = {name: np.ascontiguousarray(getattr(graph, name)) for name in _GRAPH_ARRAYS}
+    arrays["label_offsets"] = label_offsets
+    arrays["label_blob"] = label_blob
+    for name, values in (edge_attrs or {}).items():
+        values = np.ascontiguousarray(values)
+        if len(values) != graph.number_of_edges():
+            raise ValueError(f"O atributo de aresta '{name}' não tem um valor por aresta")
+        arrays[f"edge:{name}"] = values
+
+    layout, position = {}, 0
+    for name, array in arrays.items():
+        position += _padding(position)
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": position}
+        position += array.nbytes
+
+    header = {
+        "version": FORMAT_VERSION,
+        "nodes": graph.number_of_nodes(),
+        "edges": graph.number_of_edges(),
+        "meta": meta or {},
+        "arrays": layout,
+    }
+    raw = json.dumps(header).encode("utf-8")
+    data_start = _data_start(len(raw))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(raw)).tobytes())
+        f.write(raw)
+        for name, array in arrays.items():
+            f.write(b"\0" * (data_start + layout[name]["offset"] - f.tell()))
+            f.write(memoryview(array.reshape(-1).view(np.uint8)))  # inclusive datetime64
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def edge_attrs_from_frame(graph, df, columns, source="source", target="target"):
+    """
+    Atributos de aresta alinhados ao CSR do grafo, a partir da lista de arestas.
+
+    O grafo compacto não tem arestas paralelas: colunas numéricas (ex: peso)
+    são somadas sobre as linhas de cada aresta e colunas de data guardam a
+    primeira data da aresta (em UTC, sem fuso).
+
+    Args:
+        graph: CompactGraph construído de `df`
+        df: Lista de arestas
+        columns: Colunas de `df` a converter
+        source: Coluna de origem
+        target: Coluna de destino
+
+    Returns:
+        dict: Nome -> vetor com um valor por aresta (float64 ou datetime64[ns])
+
+    Raises:
+        ValueError: Se uma coluna não for numérica nem de data
+    """
+    n, m = graph.number_of_nodes(), graph.number_of_edges()
+    src = graph.labels.get_indexer(df[source]).astype(np.int64)
+    dst = graph.labels.get_indexer(df[target]).astype(np.int64)
+    valid = (src >= 0) & (dst >= 0) & (src != dst)
+    # As arestas do CSR estão ordenadas por (origem, destino)
+    keys = graph.edge_sources().astype(np.int64) * n + np.asarray(graph.out_indices)
+    position = np.searchsorted(keys, src[valid] * n + dst[valid])
+
+    attrs = {}
+    for column in columns:
+        values = df[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            times = pd.to_datetime(values, utc=True).dt.tz_localize(None)
+            times = times.to_numpy(dtype="datetime64[ns]").view(np.int64)[valid]
+            known = times != np.iinfo(np.int64).min  # NaT
+            first = np.full(m, np.iinfo(np.int64).max)
+            np.minimum.at(first, position[known], times[known])
+            first[first == np.iinfo(np.int64).max] = np.iinfo(np.int64).min
+            attrs[column] = first.view("datetime64[ns]")
+        elif pd.api.types.is_numeric_dtype(values):
+            weights = values.to_numpy(dtype=np.float64, na_value=0.0)[valid]
+            attrs[column] = np.bincount(position, weights=weights, minlength=m)
+        else:
+            raise ValueError(f"A coluna '{column}' não é numérica nem de data")
+    return attrs
+
+
+def edge_frame(graph, edge_attrs=None, rows=None, source="source", target="target"):
+    """
+    Lista de arestas de um grafo salvo, com os atributos de aresta como colunas.
+
+    Args:
+        graph: CompactGraph
+        edge_attrs: Dict nome -> vetor por aresta (ver `load_graph`); datas
+            voltam como datetime em UTC
+        rows: Número de arestas lidas do início do CSR (None = todas), ex:
+            para uma amostra sem percorrer o grafo inteiro
+        source: Nome da coluna de origem
+        target: Nome da coluna de destino
+
+    Returns:
+        pd.DataFrame: Origem e destino categóricos e uma coluna por atributo
+    """
+    m = graph.number_of_edges() if rows is None else min(rows, graph.number_of_edges())
+    sources = np.searchsorted(graph.out_indptr, np.arange(m), side="right") - 1
+    frame = pd.DataFrame(
+        {
+            source: pd.Categorical.from_codes(sources, categories=graph.labels),
+            target: pd.Categorical.from_codes(np.asarray(graph.out_indices[:m]), categories=graph.labels),
+        }
+    )
+    for name, values in (edge_attrs or {}).items():
+        values = np.asarray(values[:m])
+        frame[name] = pd.to_datetime(values, utc=True) if values.dtype.kind == "M" else values
+    return frame
+
+
+def read_header(path):
+    """Lê apenas o cabeçalho JSON de um arquivo .rgraph."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} não é um arquivo de grafo binário válido")
+        size = int(np.frombuffer(f.read(8), dtype="<u8")[0])
+        header = json.loads(f.read(size).decode("utf-8"))
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Versão de formato não suportada: {header.get('version')}")
+    header["data_start"] = _data_start(size)
+    return header
+
+
+def _map_array(path, spec, data_start):
+    dtype = np.dtype(spec["dtype"])
+    shape = tuple(spec["shape"])
+    if int(np.prod(shape)) == 0:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(
+        path, dtype=dtype, mode="r", offset=data_start + spec["offset"], shape=shape
+    )
+
+
+def load_graph(path):
+    """
+    Abre um arquivo .rgraph mapeando os vetores em memória.
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        tuple: (CompactGraph com vetores np.memmap, dict de atributos de aresta,
+        dict de metadados)
+
+    Raises:
+        ValueError: Se o arquivo não estiver no formato esperado
+    """
+    header = read_header(path)
+    layout = header["arrays"]
+    arrays = {
+        name: _map_array(path, spec, header["data_start"]) for name, spec in layout.items()
+    }
+    labels = _decode_labels(arrays["label_blob"], arrays["label_offsets"])
+    graph = CompactGraph.from_arrays(labels, *(arrays[name] for name in _GRAPH_ARRAYS))
+    edge_attrs = {
+        name.split(":", 1)[1]: array for name, array in arrays.items() if name.startswith("edge:")
+    }
+    return graph, edge_attrs, header["meta"]
+
+
+def list_graphs(directory):
+    """Lista os arquivos .rgraph de um diretório (vazio se ele não existir)."""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(f for f in os.listdir(directory) if f.endswith(EXTENSION))
@@ -0,0 +1,348 @@
+"""
+Atualização incremental do grafo enquanto o scraper acrescenta tweets ao CSV.
+
+O scraper grava o CSV janela a janela, sempre no fim do arquivo. Em vez de
+reler e reconstruir tudo a cada nova janela, o monitor lê só os bytes novos
+(a partir do último deslocamento lido) e aplica as arestas inseridas ao grafo
+em memória, atualizando de forma incremental:
+
+- os graus de entrada e de saída (somas de bincount);
+- os componentes fracamente conectados (union-find vetorizado);
+- o PageRank, com a iteração de potência partindo do vetor anterior.
+
+O estado completo pode ser exportado a qualquer momento como lista de arestas
+para o restante das análises do app.
+"""
+
+import io
+import os
+import time
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from compact_graph import CompactGraph
+from ingest import read_edge_list
+from sparse_backend import pagerank_vector
+
+# Máximo de bytes lidos do CSV por atualização (arquivos grandes entram aos poucos)
+MAX_BYTES_POR_LEITURA = 64 * 1024**2
+
+
+class Update(NamedTuple):
+    """Resumo de uma atualização aplicada ao grafo."""
+
+    rows: int  # linhas lidas do CSV
+    nodes: int  # nós novos
+    edges: int  # arestas novas (repetidas e auto-laços não contam)
+    restarted: bool  # o arquivo foi recriado e o grafo recomeçou do zero
+
+
+class CsvTail:
+    """
+    Leitor do final de um CSV que ainda está sendo escrito.
+
+    Guarda o deslocamento (em bytes) já consumido e o cabeçalho. Só registros
+    completos são lidos: um registro cortado no meio da escrita (inclusive
+    dentro de um texto entre aspas com quebras de linha) fica para a próxima
+    leitura.
+    """
+
+    def __init__(self, path, source="source", target="target", weight=None, time=None):
+        self.path = path
+        self.columns = {"source": source, "target": target, "weight": weight, "time": time}
+        self.offset = 0
+        self.header = None
+
+    def reset(self):
+        self.offset = 0
+        self.header = None
+
+    def read(self, max_bytes=MAX_BYTES_POR_LEITURA):
+        """
+        Lê as arestas acrescentadas desde a última leitura.
+
+        Args:
+            max_bytes: Máximo de bytes consumidos nesta chamada
+
+        Returns:
+            tuple: (DataFrame de arestas no formato de `ingest.read_edge_list`
+            ou None se não houver registros novos completos, True se o arquivo
+            diminuiu de tamanho e foi relido desde o início)
+        """
+        restarted = os.path.getsize(self.path) < self.offset
+        if restarted:
+            self.reset()
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(max_bytes)
+
+        if self.header is None:
+            end = data.find(b"\n") + 1
+            if end == 0:
+                return None, restarted
+            self.header, data = data[:end], data[end:]
+            self.offset += end
+
+        cut = _last_record_end(data)
+        if cut == 0:
+            return None, restarted
+        df = read_edge_list(io.BytesIO(self.header + data[:cut]), **self.columns)
+        self.offset += cut
+        return df, restarted
+
+
+def _last_record_end(data):
+    """
+    Posição logo após a última quebra de linha que encerra um registro.
+
+    Uma quebra de linha só separa registros se houver um número par de aspas
+    antes dela (aspas escapadas no CSV vêm em pares); as demais estão dentro
+    de um texto entre aspas.
+    """
+    raw = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(raw == ord("\n"))
+    quotes = np.cumsum(raw == ord('"'))
+    closed = newlines[quotes[newlines] % 2 == 0]
+    return int(closed[-1]) + 1 if len(closed) else 0
+
+
+def _compress(parent):
+    """Aponta cada nó diretamente para a raiz do seu conjunto."""
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            return parent
+        parent[:] = grandparent
+
+
+def _union(parent, u, v):
+    """
+    Une os conjuntos das arestas u-v, todas de uma vez.
+
+    A cada rodada, a raiz maior de cada par passa a apontar para a menor
+    (`np.minimum.at` resolve conflitos); como os ponteiros só descem, não há
+    ciclos, e em poucas rodadas todos os pares ficam com a mesma raiz.
+    """
+    while True:
+        _compress(parent)
+        ru, rv = parent[u], parent[v]
+        differ = ru != rv
+        if not differ.any():
+            return parent
+        np.minimum.at(parent, np.maximum(ru[differ], rv[differ]), np.minimum(ru[differ], rv[differ]))
+
+
+class IncrementalGraph:
+    """
+    Grafo dirigido simples que só cresce, por inserção de lotes de arestas.
+
+    As arestas ficam num vetor ordenado de chaves (origem << 32 | destino),
+    o que permite descartar repetidas com uma busca binária vetorizada e
+    montar a matriz CSR sem reordenar. Graus, componentes fracos e PageRank
+    são mantidos a cada lote, sem recalcular o grafo inteiro.
+    """
+
+    def __init__(self, alpha=0.85, tol=1.0e-6):
+        self.alpha = alpha
+        self.tol = tol
+        self.reset()
+
+    def reset(self):
+        self._index = {}  # rótulo -> ID
+        self._labels = []
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._out = np.zeros(0, dtype=np.int64)
+        self._in = np.zeros(0, dtype=np.int64)
+        self._parent = np.zeros(0, dtype=np.int64)
+        self._pagerank = np.zeros(0)
+        self._pagerank_dirty = False
+        self.pagerank_iterations = 0
+
+    # -----------------------------------------------------------------
+    # Inserção
+    # -----------------------------------------------------------------
+    def _node_ids(self, values):
+        """IDs dos rótulos, registrando os que ainda não existem."""
+        values = pd.Series(values, dtype="object")
+        ids = values.map(self._index)
+        missing = ids.isna()
+        if missing.any():
+            new = pd.unique(values[missing])
+            first = len(self._labels)
+            self._index.update(zip(new, range(first, first + len(new))))
+            self._labels.extend(new)
+            ids = values.map(self._index)
+        return ids.to_numpy(dtype=np.int64)
+
+    def add_edges(self, sources, targets):
+        """
+        Insere um lote de arestas.
+
+        Como em `CompactGraph.from_edge_frame`, arestas repetidas são
+        colapsadas e auto-laços descartados (mantendo os nós envolvidos).
+
+        Args:
+            sources: Rótulos de origem
+            targets: Rótulos de destino (mesmo tamanho)
+
+        Returns:
+            tuple: (número de nós novos, número de arestas novas)
+        """
+        n_before = len(self._labels)
+        src = self._node_ids(sources)
+        dst = self._node_ids(targets)
+        n = len(self._labels)
+        grow = n - n_before
+        if grow:
+            self._out = np.concatenate([self._out, np.zeros(grow, dtype=np.int64)])
+            self._in = np.concatenate([self._in, np.zeros(grow, dtype=np.int64)])
+            self._parent = np.concatenate([self._parent, np.arange(n_before, n)])
+            self._pagerank_dirty = True
+
+        loops = src == dst
+        keys = np.unique((src[~loops] << 32) | dst[~loops])
+        pos = np.searchsorted(self._keys, keys)
+        known = np.zeros(len(keys), dtype=bool)
+        inside = pos < len(self._keys)
+        known[inside] = self._keys[pos[inside]] == keys[inside]
+        fresh, pos = keys[~known], pos[~known]
+        if len(fresh):
+            self._keys = np.insert(self._keys, pos, fresh)
+            u, v = fresh >> 32, fresh & 0xFFFFFFFF
+            self._out += np.bincount(u, minlength=n)
+            self._in += np.bincount(v, minlength=n)
+            _union(self._parent, u, v)
+            self._pagerank_dirty = True
+        return grow, len(fresh)
+
+    # -----------------------------------------------------------------
+    # Consultas
+    # -----------------------------------------------------------------
+    @property
+    def labels(self):
+        return pd.Index(self._labels, dtype="object")
+
+    def number_of_nodes(self):
+        return len(self._labels)
+
+    def number_of_edges(self):
+        return len(self._keys)
+
+    def out_degree(self):
+        return self._out
+
+    def in_degree(self):
+        return self._in
+
+    def degree(self):
+        """Grau total (entrada + saída), como G.degree() num DiGraph."""
+        return self._out + self._in
+
+    def components(self):
+        """
+        Componentes fracamente conectados.
+
+        Returns:
+            tuple: (número de componentes, vetor com o componente de cada nó)
+        """
+        parent = _compress(self._parent)
+        roots, labels = np.unique(parent, return_inverse=True)
+        return len(roots), labels
+
+    def component_sizes(self):
+        """Tamanho de cada componente fraco, do maior para o menor."""
+        sizes = np.bincount(_compress(self._parent))
+        return np.sort(sizes[sizes > 0])[::-1]
+
+    def adjacency(self):
+        """Matriz CSR montada direto das chaves ordenadas (sem reordenar)."""
+        n = self.number_of_nodes()
+        u, v = self._keys >> 32, self._keys & 0xFFFFFFFF
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(u, minlength=n), out=indptr[1:])
+        data = np.ones(len(v), dtype=np.float64)
+        return sp.csr_array((data, v.astype(np.int32), indptr), shape=(n, n))
+
+    def pagerank(self):
+        """
+        PageRank atual, recalculado só se o grafo mudou.
+
+        A iteração parte do vetor anterior (os nós novos recebem 1/n), que
+        já está perto do novo ponto fixo quando o lote é pequeno perto do
+        grafo; `pagerank_iterations` guarda quantas iterações foram usadas.
+
+        Returns:
+            np.ndarray: PageRank de cada nó, na ordem dos IDs
+        """
+        n = self.number_of_nodes()
+        if self._pagerank_dirty and n:
+            start = np.full(n, 1.0 / n)
+            previous = self._pagerank
+            if len(previous):
+                start[: len(previous)] = previous * len(previous) / n
+            self._pagerank, self.pagerank_iterations = pagerank_vector(
+                self.adjacency(), alpha=self.alpha, tol=self.tol, nstart=start
+            )
+            self._pagerank_dirty = False
+        return self._pagerank
+
+    def to_compact(self):
+        """CompactGraph com o estado atual (mesmos IDs de nó)."""
+        return CompactGraph(self._labels, self._keys >> 32, self._keys & 0xFFFFFFFF)
+
+    def to_edge_frame(self, source="source", target="target"):
+        """Lista de arestas categórica, pronta para o restante do app."""
+        return self.to_compact().to_edge_frame(source, target)
+
+
+class LiveGraph:
+    """
+    Grafo mantido em dia com um CSV que cresce (ex: a saída do scraper).
+
+    Attributes:
+        tail: CsvTail do arquivo
+        graph: IncrementalGraph com tudo o que já foi lido
+        history: Lista de dicts com o tamanho do grafo após cada atualização
+    """
+
+    def __init__(self, path, source="source", target="target", **pagerank_params):
+        self.path = path
+        self.source, self.target = source, target
+        self.tail = CsvTail(path, source, target)
+        self.graph = IncrementalGraph(**pagerank_params)
+        self.history = []
+
+    def poll(self, max_bytes=MAX_BYTES_POR_LEITURA):
+        """
+        Aplica ao grafo as linhas acrescentadas desde a última chamada.
+
+        Returns:
+            Update: O que mudou nesta chamada
+        """
+        df, restarted = self.tail.read(max_bytes)
+        if restarted:
+            self.graph.reset()
+            self.history.clear()
+        if df is None or df.empty:
+            return Update(0, 0, 0, restarted)
+
+        nodes, edges = self.graph.add_edges(
+            df[self.source].astype("object").to_numpy(),
+            df[self.target].astype("object").to_numpy(),
+        )
+        if nodes or edges or not self.history:
+            self.graph.pagerank()
+            self.history.append(
+                {
+                    "time": time.time(),
+                    "nodes": self.graph.number_of_nodes(),
+                    "edges": self.graph.number_of_edges(),
+                    "components": self.graph.components()[0],
+                    "pagerank_iterations": self.graph.pagerank_iterations,
+                }
+            )
+        return Update(len(df), nodes, edges, restarted)
@@ -0,0 +1,204 @@
+"""
+Leitura em blocos (streaming) de listas de arestas em CSV.
+
+Somente as colunas usadas pelo grafo são lidas ('source', 'target' e,
+opcionalmente, uma coluna de peso e/ou de data). Cada bloco tem os rótulos
+dos nós convertidos para categorias (strings internadas), de modo que a
+memória fica limitada pela lista de arestas e não pelo tamanho do arquivo
+bruto, que nos exports de tweets é dominado pela coluna 'tweet_text'.
+
+Diretórios Parquet (ver parquet_store) são lidos pelo `read_edge_parquet`,
+que além de selecionar as colunas filtra um período de datas direto nas
+estatísticas dos arquivos, sem ler as janelas fora dele.
+"""
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional: sem ele, só CSV
+    pc = pq = None
+
+PARQUET_DISPONIVEL = pq is not None
+
+# Tamanho padrão de cada bloco lido do CSV (em linhas)
+CHUNK_ROWS = 250_000
+
+
+def read_edge_list(
+    path_or_buffer,
+    source="source",
+    target="target",
+    weight=None,
+    time=None,
+    chunksize=CHUNK_ROWS,
+    dropna=True,
+):
+    """
+    Lê uma lista de arestas de um CSV em blocos, só com as colunas necessárias.
+
+    Args:
+        path_or_buffer: Caminho, URL ou arquivo aberto (ex: st.file_uploader)
+        source: Nome da coluna de origem
+        target: Nome da coluna de destino
+        weight: Coluna opcional de peso (ignorada se não existir no arquivo)
+        time: Coluna opcional de data (ignorada se não existir no arquivo)
+        chunksize: Número de linhas por bloco
+        dropna: Descarta linhas sem origem ou sem destino
+
+    Returns:
+        pd.DataFrame: Arestas com 'source'/'target' categóricos e com as mesmas
+        categorias (a tabela de nós), mais as colunas opcionais encontradas
+
+    Raises:
+        ValueError: Se as colunas de origem e destino não existirem no arquivo
+    """
+    optional = [c for c in (weight, time) if c]
+    wanted = {source, target, *optional}
+
+    src_parts, tgt_parts, extra_parts = [], [], []
+    header_checked = False
+    for chunk in pd.read_csv(
+        path_or_buffer,
+        usecols=lambda c: c in wanted,
+        dtype={source: "string", target: "string"},
+        chunksize=chunksize,
+    ):
+        if not header_checked:
+            missing = {source, target} - set(chunk.columns)
+            if missing:
+                raise ValueError(
+                    f"Colunas obrigatórias ausentes no CSV: {', '.join(sorted(missing))}"
+                )
+            optional = [c for c in optional if c in chunk.columns]
+            header_checked = True
+        if dropna:
+            chunk = chunk.dropna(subset=[source, target])
+        if chunk.empty:
+            continue
+        src_parts.append(pd.Categorical(chunk[source]))
+        tgt_parts.append(pd.Categorical(chunk[target]))
+        if optional:
+            extra_parts.append(_compact_optional(chunk[optional], weight, time))
+
+    if not header_checked:
+        raise ValueError("O arquivo CSV está vazio")
+    if not src_parts:
+        return pd.DataFrame(
+            {
+                source: pd.Categorical([]),
+                target: pd.Categorical([]),
+                **{c: pd.Series([], dtype="object") for c in optional},
+            }
+        )
+
+    # Tabela única de nós: origem e destino compartilham as mesmas categorias
+    nodes = union_categoricals(src_parts + tgt_parts).categories
+    df = pd.DataFrame(
+        {
+            source: _recode(src_parts, nodes),
+            target: _recode(tgt_parts, nodes),
+        }
+    )
+    if extra_parts:
+        extras = pd.concat(extra_parts, ignore_index=True)
+        for column in optional:
+            df[column] = extras[column].array
+    return df
+
+
+def read_edge_parquet(
+    path_or_buffer,
+    source="source",
+    target="target",
+    weight=None,
+    time=None,
+    since=None,
+    until=None,
+    dropna=True,
+):
+    """
+    Lê uma lista de arestas de um arquivo ou diretório Parquet.
+
+    Só as colunas necessárias são lidas, e um período [since, until] vira um
+    filtro empurrado para o leitor: arquivos e grupos de linhas cujas datas
+    mínima e máxima caem fora dele são pulados.
+
+    Args:
+        path_or_buffer: Arquivo .parquet, diretório particionado ou arquivo aberto
+        source: Nome da coluna de origem
+        target: Nome da coluna de destino
+        weight: Coluna opcional de peso (ignorada se não existir)
+        time: Coluna opcional de data (ignorada se não existir)
+        since: Data inicial (inclusive) ou None
+        until: Data final (inclusive, o dia inteiro) ou None
+        dropna: Descarta linhas sem origem ou sem destino
+
+    Returns:
+        pd.DataFrame: Mesmo formato de `read_edge_list`
+
+    Raises:
+        ImportError: Se o pyarrow não estiver instalado
+        ValueError: Se faltarem colunas, ou a de data quando há período
+    """
+    if pq is None:
+        raise ImportError("pyarrow não está instalado (pip install pyarrow)")
+    dataset = pq.ParquetDataset(path_or_buffer)
+    available = set(dataset.schema.names)
+    missing = {source, target} - available
+    if missing:
+        raise ValueError(f"Colunas obrigatórias ausentes no Parquet: {', '.join(sorted(missing))}")
+    optional = [c for c in (weight, time) if c and c in available]
+
+    filters = []
+    if since is not None or until is not None:
+        if not time or time not in available:
+            raise ValueError("Filtrar por período exige a coluna de data")
+        if since is not None:
+            filters.append((time, ">=", pd.Timestamp(since, tz="UTC")))
+        if until is not None:
+            filters.append((time, "<", pd.Timestamp(until, tz="UTC") + pd.Timedelta(days=1)))
+
+    table = pq.read_table(
+        path_or_buffer,
+        columns=[source, target, *optional],
+        filters=filters or None,
+        read_dictionary=[source, target],
+    )
+    if dropna:
+        table = table.filter(pc.and_(pc.is_valid(table[source]), pc.is_valid(table[target])))
+    table = table.unify_dictionaries()
+
+    src = _as_string_categorical(table.column(source).to_pandas())
+    tgt = _as_string_categorical(table.column(target).to_pandas())
+    nodes = union_categoricals([src, tgt]).categories
+    df = pd.DataFrame({source: _recode([src], nodes), target: _recode([tgt], nodes)})
+    if optional:
+        extras = _compact_optional(table.select(optional).to_pandas(), weight, time)
+        for column in optional:
+            df[column] = extras[column].array
+    return df
+
+
+def _as_string_categorical(series):
+    """Categórico com categorias "string" ordenadas, como os lidos do CSV."""
+    values = pd.Categorical(series)
+    categories = values.categories.astype("string")
+    return values.rename_categories(categories).reorder_categories(categories.sort_values())
+
+
+def _recode(parts, categories):
+    """Concatena blocos categóricos já reindexados para as categorias globais."""
+    return union_categoricals([p.set_categories(categories) for p in parts])
+
+
+def _compact_optional(frame, weight, time):
+    """Converte as colunas opcionais para tipos compactos."""
+    frame = frame.copy()
+    if weight in frame:
+        frame[weight] = pd.to_numeric(frame[weight], errors="coerce").astype("float32")
+    if time in frame:
+        frame[time] = pd.to_datetime(frame[time], errors="coerce", utc=True)
+    return frame.reset_index(drop=True)
@@ -0,0 +1,380 @@
+"""
+Layout força-direcionado escalável (multinível) vetorizado em NumPy.
+
+O `nx.spring_layout` calcula a repulsão entre todos os pares de nós a cada
+iteração (O(n²)). Aqui o grafo é primeiro contraído em níveis cada vez menores
+(coarsening); o nível mais grosso é posicionado com Fruchterman-Reingold exato
+e cada nível mais fino herda as posições dos pais e só é refinado. Nos níveis
+grandes, a repulsão usa uma aproximação do tipo Barnes-Hut de um nível: os
+nós são agrupados numa grade e cada célula age como uma única massa no seu
+centróide.
+
+O layout também pode ser gerado quadro a quadro (`iter_force_layout`): um
+esboço dos níveis grossos sai quase de imediato e é refinado em seguida, e
+cada nível para cedo quando a energia do sistema estabiliza.
+`ProgressiveLayout` roda esse gerador numa thread para que a interface
+desenhe os quadros enquanto o cálculo continua.
+"""
+
+import queue
+import threading
+from typing import NamedTuple
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+# Até este número de nós a repulsão é calculada exatamente (todos os pares)
+MAX_NOS_REPULSAO_EXATA = 2000
+# O coarsening para quando o nível tem menos nós que isto
+MIN_NOS_NIVEL = 50
+# ... ou quando um nível reduz menos que esta fração de nós
+REDUCAO_MINIMA = 0.85
+# Um nível para de iterar quando a energia varia menos que esta fração
+TOLERANCIA_ENERGIA = 1e-3
+
+
+def _coarsen(S, rng):
+    """
+    Contrai o grafo juntando cada nó ao vizinho de maior prioridade aleatória.
+
+    As arestas escolhidas formam uma floresta; cada árvore vira um nó do
+    próximo nível.
+
+    Returns:
+        tuple: (adjacência do nível contraído, vetor nó -> grupo)
+    """
+    n = S.shape[0]
+    priority = rng.random(n)
+    rows = np.repeat(np.arange(n), np.diff(S.indptr))
+    best = np.full(n, -1)
+    if S.nnz:
+        # Para cada linha, o vizinho com maior prioridade
+        order = np.lexsort((priority[S.indices], rows))
+        last_of_row = S.indptr[1:] - 1
+        has_neighbors = np.diff(S.indptr) > 0
+        best[has_neighbors] = S.indices[order[last_of_row[has_neighbors]]]
+    chosen = best >= 0
+    pairs = sp.coo_array(
+        (np.ones(chosen.sum()), (np.arange(n)[chosen], best[chosen])), shape=(n, n)
+    )
+    n_groups, groups = connected_components(pairs, directed=False)
+    P = sp.csr_array((np.ones(n), (np.arange(n), groups)), shape=(n, n_groups))
+    coarse = sp.csr_array(P.T @ S @ P)
+    coarse.setdiag(0)
+    coarse.eliminate_zeros()
+    coarse.data[:] = 1.0
+    return coarse, groups
+
+
+def _repulsion_exact(xy, k):
+    delta = xy[:, None, :] - xy[None, :, :]
+    dist2 = np.maximum((delta**2).sum(axis=-1), 1e-9)
+    return (delta * (k * k / dist2)[:, :, None]).sum(axis=1)
+
+
+def _repulsion_grid(xy, k, cells, shift):
+    """
+    Repulsão aproximada: cada célula da grade é uma massa no centróide.
+
+    A grade é deslocada por `shift` (fração de célula) a cada iteração para
+    que os limites das células não deixem marcas regulares no layout.
+    """
+    n = len(xy)
+    lo = xy.min(axis=0)
+    span = np.maximum(xy.max(axis=0) - lo, 1e-9)
+    ij = np.floor((xy - lo) / span * (cells - 1) + shift).astype(np.int64)
+    cell = ij[:, 0] * cells + ij[:, 1]
+    n_cells = cells * cells
+    mass = np.bincount(cell, minlength=n_cells).astype(np.float64)
+    sums = np.column_stack(
+        [np.bincount(cell, weights=xy[:, d], minlength=n_cells) for d in range(2)]
+    )
+    occupied = np.flatnonzero(mass)
+    centroids = sums[occupied] / mass[occupied, None]
+    masses = mass[occupied]
+
+    force = np.zeros_like(xy)
+    # Processa em blocos para limitar a matriz n x células em memória
+    block = max(1, 4_000_000 // max(len(occupied), 1))
+    own_slot = np.searchsorted(occupied, cell)
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        delta = xy[start:stop, None, :] - centroids[None, :, :]
+        m = np.broadcast_to(masses, (stop - start, len(occupied))).copy()
+        rows = np.arange(stop - start)
+        own = own_slot[start:stop]
+        # Na célula do próprio nó, usa o centróide dos demais nós da célula
+        others = masses[own] - 1
+        with np.errstate(invalid="ignore", divide="ignore"):
+            own_centroid = (sums[cell[start:stop]] - xy[start:stop]) / others[:, None]
+        own_centroid = np.where(others[:, None] > 0, own_centroid, xy[start:stop])
+        delta[rows, own] = xy[start:stop] - own_centroid
+        m[rows, own] = others
+        dist2 = np.maximum((delta**2).sum(axis=-1), 1e-9)
+        force[start:stop] = (delta * (m * k * k / dist2)[:, :, None]).sum(axis=1)
+    return force
+
+
+def _fruchterman_reingold(xy, S, k, iterations, temperature, rng, tol=TOLERANCIA_ENERGIA):
+    """
+    Iterações de Fruchterman-Reingold com resfriamento linear.
+
+    Gera (posições, energia) a cada iteração, onde a energia é a soma dos
+    quadrados das forças. Para antes de `iterations` quando a variação
+    relativa da energia entre duas iterações fica abaixo de `tol`.
+    """
+    n = len(xy)
+    if n <= 1 or iterations <= 0:
+        return
+    coo = S.tocoo()
+    upper = coo.row < coo.col
+    src, dst = coo.row[upper], coo.col[upper]
+    cells = int(np.clip(np.sqrt(n) / 4, 4, 32))
+    cooling = temperature / (iterations + 1)
+
+    previous = None
+    for _ in range(iterations):
+        if n <= MAX_NOS_REPULSAO_EXATA:
+            disp = _repulsion_exact(xy, k)
+        else:
+            disp = _repulsion_grid(xy, k, cells, rng.random(2))
+        if len(src):
+            delta = xy[src] - xy[dst]
+            dist = np.sqrt(np.maximum((delta**2).sum(axis=1), 1e-9))
+            pull = delta * (dist / k)[:, None]
+            for d in range(2):
+                disp[:, d] -= np.bincount(src, weights=pull[:, d], minlength=n)
+                disp[:, d] += np.bincount(dst, weights=pull[:, d], minlength=n)
+        length2 = np.maximum((disp**2).sum(axis=1), 1e-9)
+        length = np.sqrt(length2)
+        xy = xy + disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+        energy = float(length2.sum())
+        yield xy, energy
+        if previous is not None and abs(energy - previous) <= tol * previous:
+            return
+        previous = energy
+
+
+def _rescale(xy, scale=1.0):
+    """Centraliza na origem e ajusta ao quadrado [-scale, scale] (como o NetworkX)."""
+    if len(xy) == 0:
+        return xy
+    xy = xy - xy.mean(axis=0)
+    lim = np.abs(xy).max()
+    if lim > 0:
+        xy = xy * (scale / lim)
+    return xy
+
+
+class LayoutFrame(NamedTuple):
+    """Quadro intermediário do layout progressivo."""
+
+    positions: np.ndarray  # n x 2, na ordem dos IDs, em [-1, 1]
+    level: int  # nível atual (0 = grafo original)
+    iteration: int  # iteração dentro do nível
+    energy: float  # soma dos quadrados das forças na última iteração
+    done: bool  # True apenas no quadro final
+
+
+def iter_force_layout(
+    graph, k=None, iterations=100, seed=42, initial=None, every=0, tol=TOLERANCIA_ENERGIA
+):
+    """
+    Layout força-direcionado multinível, gerado quadro a quadro.
+
+    Os níveis grossos são expandidos para todos os nós (cada nó fica na
+    posição do seu representante), então o primeiro quadro já é um esboço
+    completo do grafo, disponível após poucas iterações do nível mais grosso.
+
+    Args:
+        graph: CompactGraph (as arestas são tratadas como não dirigidas)
+        k: Distância ideal entre nós (None = 1 / sqrt(n), como no NetworkX)
+        iterations: Iterações no nível mais grosso (os níveis finos usam menos)
+        seed: Semente para posições iniciais e coarsening
+        initial: Matriz n x 2 opcional de posições iniciais; nesse caso o
+            coarsening é pulado e o layout apenas é refinado
+        every: Emite um quadro a cada `every` iterações (0 = só o final)
+        tol: Variação relativa de energia abaixo da qual um nível para
+
+    Yields:
+        LayoutFrame: Quadros intermediários e, por último, o quadro final
+    """
+    n = graph.number_of_nodes()
+    if n <= 1:
+        yield LayoutFrame(np.zeros((n, 2)), 0, 0, 0.0, True)
+        return
+    rng = np.random.default_rng(seed)
+    S = graph.undirected_adjacency()
+    if k is None:
+        k = 1.0 / np.sqrt(n)
+
+    # Hierarquia de níveis: levels[0] é o grafo original
+    levels, mappings = [S], []
+    if initial is not None:
+        xy = (_rescale(np.asarray(initial, dtype=np.float64)) + 1) / 2
+        plan = [(0, k, max(10, iterations // 4), 0.05)]
+    else:
+        while levels[-1].shape[0] > MIN_NOS_NIVEL:
+            coarse, groups = _coarsen(levels[-1], rng)
+            if coarse.shape[0] > REDUCAO_MINIMA * levels[-1].shape[0]:
+                break
+            levels.append(coarse)
+            mappings.append(groups)
+
+        # k cresce nos níveis grossos, onde cada nó representa vários nós originais
+        def level_k(level):
+            return k * np.sqrt(n / levels[level].shape[0])
+
+        top = len(levels) - 1
+        xy = rng.random((levels[top].shape[0], 2))
+        plan = [(top, level_k(top), iterations, 0.1)] + [
+            (level, level_k(level), max(15, iterations // 4), level_k(level) * 2)
+            for level in range(top - 1, -1, -1)
+        ]
+
+    # Representante de cada nó original em cada nível
+    owners = [np.arange(n)]
+    for groups in mappings:
+        owners.append(groups[owners[-1]])
+
+    energy = 0.0
+    for level, lk, level_iterations, temperature in plan:
+        if level < len(mappings) and xy.shape[0] != levels[level].shape[0]:
+            size = levels[level].shape[0]
+            xy = xy[mappings[level]] + rng.normal(scale=lk * 0.1, size=(size, 2))
+        steps = _fruchterman_reingold(xy, levels[level], lk, level_iterations, temperature, rng, tol)
+        for iteration, (xy, energy) in enumerate(steps):
+            if every and iteration % every == 0:
+                yield LayoutFrame(_rescale(xy[owners[level]]), level, iteration, energy, False)
+    yield LayoutFrame(_rescale(xy), 0, 0, energy, True)
+
+
+def force_layout(graph, k=None, iterations=100, seed=42, initial=None, tol=TOLERANCIA_ENERGIA):
+    """
+    Layout força-direcionado multinível (ver `iter_force_layout`).
+
+    Returns:
+        np.ndarray: Matriz n x 2 de posições em [-1, 1], na ordem dos IDs
+    """
+    for frame in iter_force_layout(
+        graph, k=k, iterations=iterations, seed=seed, initial=initial, tol=tol
+    ):
+        pass
+    return frame.positions
+
+
+def compute_layout(graph, method="force", seed=42, k=None, iterations=100):
+    """
+    Calcula um layout do grafo e devolve o dict nó -> posição.
+
+    Args:
+        graph: CompactGraph
+        method: "force" (multinível), "circular" ou "random"
+        seed: Semente do layout
+        k: Distância ideal (apenas para "force")
+        iterations: Iterações (apenas para "force")
+
+    Returns:
+        dict: Rótulo do nó -> np.ndarray([x, y])
+    """
+    n = graph.number_of_nodes()
+    if method == "force":
+        xy = force_layout(graph, k=k, iterations=iterations, seed=seed)
+    elif method == "circular":
+        theta = np.linspace(0, 2 * np.pi, n, endpoint=False)
+        xy = np.column_stack([np.cos(theta), np.sin(theta)])
+    elif method == "random":
+        xy = np.random.default_rng(seed).random((n, 2))
+    else:
+        raise ValueError(f"Layout desconhecido: {method}")
+    return dict(zip(graph.labels, xy))
+
+
+def subgraph_positions(pos, nodes, rescale=True):
+    """
+    Reaproveita as coordenadas do layout do grafo completo para um subgrafo.
+
+    Args:
+        pos: Dict nó -> posição do layout do grafo completo
+        nodes: Nós do subgrafo
+        rescale: Reajusta as posições para ocupar o quadrado [-1, 1]
+
+    Returns:
+        dict: Nó -> posição
+    """
+    nodes = list(nodes)
+    if not nodes:
+        return {}
+    xy = np.array([pos[node] for node in nodes], dtype=np.float64)
+    if rescale and len(nodes) > 1:
+        xy = _rescale(xy)
+    return dict(zip(nodes, xy))
+
+
+class ProgressiveLayout:
+    """
+    Calcula o layout multinível numa thread e entrega os quadros à interface.
+
+    O consumidor itera `frames()` no seu próprio ritmo: se ele demorar para
+    desenhar um quadro, os quadros intermediários acumulados são descartados e
+    só o mais recente é entregue; o quadro final nunca é descartado.
+    """
+
+    _FIM = object()
+
+    def __init__(self, graph, every=10, **params):
+        """
+        Args:
+            graph: CompactGraph
+            every: Emite um quadro a cada `every` iterações
+            **params: Parâmetros de `iter_force_layout` (k, iterations, seed...)
+        """
+        self._queue = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(graph, every, params), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, graph, every, params):
+        try:
+            for frame in iter_force_layout(graph, every=every, **params):
+                if self._cancelled.is_set():
+                    return
+                self._queue.put(frame)
+        except Exception as exc:
+            self._queue.put(exc)
+        finally:
+            self._queue.put(self._FIM)
+
+    def frames(self):
+        """
+        Gera os quadros conforme ficam prontos, terminando no quadro final.
+
+        Raises:
+            Exception: A exceção ocorrida no cálculo do layout, se houver
+        """
+        try:
+            finished = False
+            while not finished:
+                items = [self._queue.get()]
+                while True:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                finished = items[-1] is self._FIM
+                for item in items:
+                    if isinstance(item, Exception):
+                        raise item
+                latest = [item for item in items if isinstance(item, LayoutFrame)]
+                if latest:
+                    yield latest[-1]
+        finally:
+            # Interrompido (ex: o Streamlit reexecutou o script): para a thread
+            self.cancel()
+
+    def cancel(self):
+        self._cancelled.set()
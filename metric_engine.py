@@ -0,0 +1,320 @@
+"""
+Motor de métricas memoizado, compartilhado por todos os painéis do app.
+
+Cada resultado é indexado por (fingerprint do grafo, nome da métrica,
+parâmetros). Assim, trocar uma opção num selectbox ou abrir outro painel
+reaproveita uma métrica já calculada em vez de rodar o algoritmo de novo.
+
+As métricas iterativas (PageRank, autovetor) também guardam o último vetor
+convergido: mudar um parâmetro (ex: o fator de amortecimento), filtrar o
+grafo ou acrescentar arestas gera um novo cálculo, mas ele parte desse vetor,
+alinhado pelos rótulos dos nós, e converge em poucas iterações.
+
+As métricas de caminhos (varreduras de todos os pares) aceitam um
+`threading.Event` de cancelamento; uma varredura interrompida não é
+memoizada, e o próximo pedido começa do zero.
+"""
+
+import threading
+from collections import OrderedDict
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+import approx_centrality
+import community_service
+import layout
+import parallel_paths
+import sparse_backend
+import triangles
+from compact_graph import CompactGraph
+
+
+def undirected_copy(G):
+    """
+    Versão não dirigida do grafo, materializada uma única vez por grafo.
+
+    Diferente de `G.to_undirected()`, não faz deepcopy dos dicionários de
+    atributos: só nós e arestas são copiados. A view `as_view=True` do
+    NetworkX não serve aqui, pois num DiGraph ela expõe apenas os sucessores
+    de cada nó.
+    """
+    if not G.is_directed():
+        return G
+    H = nx.Graph()
+    H.add_nodes_from(G)
+    H.add_edges_from(G.edges())
+    return H
+
+
+# Representações derivadas do grafo, construídas uma vez por fingerprint:
+# nome -> (representação de origem, função)
+DEFAULT_REPRESENTATIONS = {
+    "compact": ("graph", CompactGraph.from_networkx),
+    "networkx": ("compact", CompactGraph.to_networkx),
+    "csr": ("compact", CompactGraph.to_csr_adjacency),
+    "csr_undirected": ("csr", sparse_backend.to_undirected),
+    "undirected": ("graph", undirected_copy),
+}
+
+# Métricas disponíveis por padrão: nome -> (representação de entrada, função).
+# A função recebe a representação indicada ("graph" = o próprio grafo NetworkX)
+# e os parâmetros da métrica.
+DEFAULT_METRICS = {
+    "degree": ("compact", lambda cg: cg.to_dict(cg.degree_centrality())),
+    "closeness": ("graph", lambda G: nx.closeness_centrality(G)),
+    "betweenness": ("csr", parallel_paths.betweenness),
+    "closeness_approx": ("csr", approx_centrality.closeness),
+    "betweenness_approx": ("csr", approx_centrality.betweenness),
+    "eigenvector": ("csr", sparse_backend.eigenvector),
+    "pagerank": ("csr", sparse_backend.pagerank),
+    "katz": ("csr", sparse_backend.katz),
+    "scc": ("compact", lambda cg: cg.components("strong")),
+    "wcc": ("compact", lambda cg: cg.components("weak")),
+    "clustering": ("csr_undirected", triangles.clustering),
+    "partition": ("csr_undirected", community_service.detect),
+    # Distâncias sobre o grafo não dirigido (como no app original) e, acima,
+    # betweenness sobre o dirigido: são varreduras distintas de parallel_paths
+    "distances": ("csr_undirected", parallel_paths.distance_metrics),
+    "layout": ("compact", layout.compute_layout),
+}
+
+# Métricas cujas funções aceitam `nstart` (vetor inicial alinhado aos nós da
+# representação) e devolvem um dict nó -> valor
+DEFAULT_WARM_STARTS = ("eigenvector", "pagerank")
+
+# Métricas cujas funções aceitam `cancel` (threading.Event) e levantam
+# parallel_paths.SweepCancelled quando ele é sinalizado
+DEFAULT_CANCELLABLE = ("betweenness", "distances")
+
+
+_MISSING = object()
+
+
+class _CachedError:
+    """Guarda uma exceção para que falhas (ex: não convergência) também sejam memoizadas."""
+
+    def __init__(self, exc):
+        self.exc = exc
+
+
+class MetricEngine:
+    """
+    Calcula cada métrica uma única vez por grafo e serve os painéis do cache.
+
+    Os resultados ficam num LRU limitado a `max_entries` entradas. Os contadores
+    `hits` e `misses` permitem acompanhar a eficácia do cache.
+    """
+
+    def __init__(
+        self,
+        metrics=None,
+        representations=None,
+        max_entries=256,
+        max_graphs=4,
+        warm_starts=None,
+        cancellable=None,
+    ):
+        self.metrics = dict(DEFAULT_METRICS if metrics is None else metrics)
+        self.representations = dict(
+            DEFAULT_REPRESENTATIONS if representations is None else representations
+        )
+        self.warm_starts = set(DEFAULT_WARM_STARTS if warm_starts is None else warm_starts)
+        self.cancellable = set(DEFAULT_CANCELLABLE if cancellable is None else cancellable)
+        self._vectors = OrderedDict()  # (fingerprint, métrica) -> (rótulos, vetor)
+        self.max_entries = max_entries
+        self.max_graphs = max_graphs
+        self._results = OrderedDict()
+        self._derived = OrderedDict()  # (fingerprint, representação) -> objeto
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, name, func, representation="graph", warm_start=False, cancellable=False):
+        """
+        Registra (ou substitui) uma métrica com assinatura func(rep, **params).
+
+        Com `warm_start=True`, a função também recebe `nstart` (ver
+        DEFAULT_WARM_STARTS) e a representação precisa ter o atributo `nodes`.
+        Com `cancellable=True`, ela recebe `cancel` (ver DEFAULT_CANCELLABLE).
+        """
+        self.metrics[name] = (representation, func)
+        for flag, names in ((warm_start, self.warm_starts), (cancellable, self.cancellable)):
+            if flag:
+                names.add(name)
+            else:
+                names.discard(name)
+
+    def register_representation(self, name, func, source="graph"):
+        """Registra uma representação derivada com assinatura func(rep_de_origem)."""
+        self.representations[name] = (source, func)
+
+    def attach(self, fingerprint, kind, value):
+        """Registra uma representação já construída (ex: o CompactGraph do cache)."""
+        with self._lock:
+            self._derived[(fingerprint, kind)] = value
+            self._derived.move_to_end((fingerprint, kind))
+
+    def representation(self, G, fingerprint, kind):
+        """
+        Retorna uma representação derivada do grafo, construída uma única vez.
+
+        O grafo de origem pode ser um CompactGraph: nesse caso ele é a
+        representação "compact", e o DiGraph (kind="graph") só é construído,
+        uma vez, quando alguma métrica ou painel precisar dele.
+
+        Args:
+            G: Grafo NetworkX ou CompactGraph
+            fingerprint: Identificador do conteúdo do grafo
+            kind: "graph" ou o nome de uma representação registrada (ex: "csr")
+
+        Returns:
+            O grafo NetworkX (kind="graph") ou a representação derivada
+        """
+        if isinstance(G, CompactGraph):
+            if kind == "compact":
+                return G
+            if kind == "graph":
+                kind = "networkx"
+        elif kind == "graph":
+            return G
+        key = (fingerprint, kind)
+        with self._lock:
+            if key in self._derived:
+                self._derived.move_to_end(key)
+                return self._derived[key]
+        source_kind, func = self.representations[kind]
+        value = func(self.representation(G, fingerprint, source_kind))
+        with self._lock:
+            self._derived[key] = value
+            self._derived.move_to_end(key)
+            max_derived = self.max_graphs * max(1, len(self.representations))
+            while len(self._derived) > max_derived:
+                self._derived.popitem(last=False)
+        return value
+
+    @staticmethod
+    def make_key(fingerprint, name, params):
+        return (fingerprint, name, tuple(sorted(params.items())))
+
+    def is_cached(self, fingerprint, name, **params):
+        return self.make_key(fingerprint, name, params) in self._results
+
+    def store(self, fingerprint, name, value, **params):
+        """Guarda um resultado calculado fora do motor (ex: layout progressivo)."""
+        key = self.make_key(fingerprint, name, params)
+        with self._lock:
+            self._results[key] = value
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def compute(self, G, fingerprint, name, cancel=None, **params):
+        """
+        Retorna a métrica `name` do grafo, calculando-a só na primeira chamada.
+
+        Args:
+            G: Grafo NetworkX ou CompactGraph (ver `representation`)
+            fingerprint: Identificador do conteúdo do grafo (ver graph_cache)
+            name: Nome da métrica registrada
+            cancel: threading.Event opcional, repassado às métricas canceláveis
+            **params: Parâmetros repassados para a função da métrica
+
+        Returns:
+            Resultado da métrica (normalmente um dict nó -> valor)
+
+        Raises:
+            KeyError: Se a métrica não estiver registrada
+            parallel_paths.SweepCancelled: Se `cancel` for sinalizado (não memoizada)
+            Exception: A mesma exceção do cálculo original, também memoizada
+        """
+        if name not in self.metrics:
+            raise KeyError(f"Métrica desconhecida: {name}")
+        key = self.make_key(fingerprint, name, params)
+
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                self._results.move_to_end(key)
+                value = self._results[key]
+            else:
+                value = _MISSING
+        if value is _MISSING:
+            kind, func = self.metrics[name]
+            extra = {"cancel": cancel} if cancel is not None and name in self.cancellable else {}
+            try:
+                rep = self.representation(G, fingerprint, kind)
+                if name in self.warm_starts:
+                    value = func(rep, nstart=self._start_vector(fingerprint, name, rep.nodes), **params)
+                    self._keep_vector(fingerprint, name, value)
+                else:
+                    value = func(rep, **extra, **params)
+            except parallel_paths.SweepCancelled:
+                raise
+            except Exception as exc:
+                value = _CachedError(exc)
+            with self._lock:
+                self.misses += 1
+                self._results[key] = value
+                self._results.move_to_end(key)
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+
+        if isinstance(value, _CachedError):
+            raise value.exc
+        return value
+
+    def _keep_vector(self, fingerprint, name, value):
+        """Guarda o vetor convergido de uma métrica iterativa."""
+        labels = pd.Index(list(value.keys()), tupleize_cols=False)
+        vector = np.fromiter(value.values(), dtype=np.float64, count=len(value))
+        with self._lock:
+            self._vectors[(fingerprint, name)] = (labels, vector)
+            self._vectors.move_to_end((fingerprint, name))
+            while len(self._vectors) > self.max_graphs * max(1, len(self.warm_starts)):
+                self._vectors.popitem(last=False)
+
+    def _start_vector(self, fingerprint, name, nodes):
+        """
+        Vetor inicial para a métrica `name`, alinhado a `nodes`.
+
+        Usa o último vetor do mesmo grafo (ex: outro fator de amortecimento)
+        ou, se não houver, o mais recente de qualquer grafo (versão filtrada
+        ou com arestas novas). Nós sem valor anterior recebem a média.
+
+        Returns:
+            np.ndarray ou None: None se não houver nenhum nó em comum
+        """
+        with self._lock:
+            previous = self._vectors.get((fingerprint, name))
+            if previous is None:
+                previous = next(
+                    (v for (_, n), v in reversed(self._vectors.items()) if n == name), None
+                )
+        if previous is None:
+            return None
+        labels, vector = previous
+        position = labels.get_indexer(pd.Index(nodes, tupleize_cols=False))
+        found = position >= 0
+        if not found.any():
+            return None
+        start = np.full(len(position), vector[position[found]].mean())
+        start[found] = vector[position[found]]
+        return start
+
+    def invalidate(self, fingerprint=None):
+        """Remove os resultados de um grafo (ou todos, se fingerprint for None)."""
+        with self._lock:
+            if fingerprint is None:
+                self._results.clear()
+                self._derived.clear()
+                self._vectors.clear()
+                return
+            for cache in (self._results, self._derived, self._vectors):
+                for key in [k for k in cache if k[0] == fingerprint]:
+                    del cache[key]
+
+    def stats(self):
+        """Retorna os contadores do cache como dict."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._results)}
@@ -0,0 +1,136 @@
+"""
+Cálculo de métricas em segundo plano, sem bloquear a reexecução do app.
+
+Cada sessão do Streamlit tem a sua fila de tarefas (um pool de threads) que
+chama o motor de métricas. O script só enfileira o que precisa e desenha o
+que já estiver pronto; os resultados vão para o cache do motor, então uma
+reexecução (ou outro painel) encontra o trabalho concluído em vez de
+recomeçar. Trocar de conjunto de dados cancela as tarefas do grafo antigo
+que ainda estão na fila e interrompe as varreduras de caminhos em andamento.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobState(NamedTuple):
+    """Situação de uma métrica pedida à fila."""
+
+    status: str  # QUEUED, RUNNING, DONE ou FAILED
+    value: object = None
+    error: Exception = None
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+
+class MetricJobs:
+    """
+    Fila de métricas de uma sessão, ligada a um grafo por vez.
+
+    Threads não podem ser interrompidas: ao cancelar, as tarefas na fila são
+    descartadas e o pool é trocado por um novo, para que o grafo seguinte não
+    espere atrás delas. As métricas canceláveis do motor (varreduras de
+    caminhos, que rodam num pool de processos) recebem o evento `cancel` da
+    fila e param assim que ele é sinalizado; as demais terminam sozinhas e só
+    deixam o resultado no cache do motor.
+    """
+
+    def __init__(self, engine, max_workers=2):
+        self.engine = engine
+        self.max_workers = max_workers
+        self.G = None
+        self.fingerprint = None
+        self.cancelled = 0
+        self._executor = None
+        self._futures = {}
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def bind(self, G, fingerprint):
+        """Associa a fila ao grafo atual; um grafo diferente cancela as pendentes."""
+        if fingerprint != self.fingerprint:
+            self.cancel()
+        self.G, self.fingerprint = G, fingerprint
+
+    def submit(self, name, **params):
+        """
+        Enfileira uma métrica (se ainda não estiver calculada nem na fila).
+
+        Returns:
+            JobState: Situação atual da métrica
+        """
+        key = self.engine.make_key(self.fingerprint, name, params)
+        with self._lock:
+            if key not in self._futures and not self.engine.is_cached(
+                self.fingerprint, name, **params
+            ):
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="metricas"
+                    )
+                self._futures[key] = self._executor.submit(
+                    self.engine.compute, self.G, self.fingerprint, name, cancel=self._cancel, **params
+                )
+        return self.state(name, **params)
+
+    def submitted(self, name, **params):
+        """Se a métrica já está calculada ou foi enfileirada para o grafo atual."""
+        return self.engine.is_cached(self.fingerprint, name, **params) or (
+            self.engine.make_key(self.fingerprint, name, params) in self._futures
+        )
+
+    def state(self, name, **params):
+        """Situação de uma métrica, sem enfileirá-la."""
+        if self.engine.is_cached(self.fingerprint, name, **params):
+            try:
+                return JobState(DONE, self.engine.compute(self.G, self.fingerprint, name, **params))
+            except Exception as exc:
+                return JobState(FAILED, error=exc)
+        future = self._futures.get(self.engine.make_key(self.fingerprint, name, params))
+        if future is None or future.cancelled():
+            return JobState(QUEUED)
+        if not future.done():
+            return JobState(RUNNING if future.running() else QUEUED)
+        if future.exception() is not None:
+            return JobState(FAILED, error=future.exception())
+        return JobState(DONE, future.result())
+
+    def result(self, name, **params):
+        """
+        Valor da métrica, calculado na hora se não estiver na fila.
+
+        Se a métrica já estiver na fila, espera por ela em vez de calculá-la
+        uma segunda vez em paralelo.
+
+        Raises:
+            Exception: A mesma exceção do cálculo
+        """
+        future = self._futures.get(self.engine.make_key(self.fingerprint, name, params))
+        if future is not None and not future.cancelled():
+            return future.result()
+        return self.engine.compute(self.G, self.fingerprint, name, **params)
+
+    def pending(self):
+        """Número de tarefas do grafo atual ainda não concluídas."""
+        with self._lock:
+            return sum(not f.done() for f in self._futures.values())
+
+    def cancel(self):
+        """Descarta as tarefas na fila, interrompe as varreduras e libera o pool."""
+        with self._lock:
+            self.cancelled += sum(f.cancel() for f in self._futures.values())
+            self._futures.clear()
+            # As tarefas em andamento guardaram o evento antigo; as próximas usam um novo
+            self._cancel.set()
+            self._cancel = threading.Event()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
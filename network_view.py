@@ -0,0 +1,304 @@
+"""
+Visualização interativa (vis-network) gerada a partir dos arquivos em lib/.
+
+O grafo é reduzido no servidor antes de ir para o navegador, para que o
+número de elementos fique limitado qualquer que seja o tamanho da entrada:
+o k-core mais interno que cabe no limite, os nós mais centrais ou as
+comunidades colapsadas em super-nós. O resultado é serializado num JSON
+colunar compacto, com as posições já calculadas (ver layout) e a física
+desligada nos grafos maiores, e embutido num HTML autocontido junto com o
+vis-network, o tom-select e o bindings/utils.js locais (sem CDN).
+"""
+
+import functools
+import json
+import os
+from typing import NamedTuple
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib import colors as mcolors
+
+from layout import force_layout
+
+LIB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lib")
+
+# Limite padrão de nós enviados ao navegador
+MAX_NOS_INTERATIVO = 300
+# Limite de arestas enviadas (as de maior peso são mantidas)
+MAX_ARESTAS_INTERATIVO = 4000
+# Acima deste número de nós a física do vis-network fica desligada
+MAX_NOS_COM_FISICA = 150
+# Escala das posições do layout ([-1, 1]) para pixels do canvas
+ESCALA_POR_NO = 30
+
+REDUCOES = ("kcore", "top", "communities")
+
+
+class ReducedView(NamedTuple):
+    """Grafo reduzido pronto para ser desenhado."""
+
+    graph: object  # CompactGraph reduzido
+    original_ids: np.ndarray  # ID no grafo completo (nós) ou grupo (super-nós)
+    members: np.ndarray  # nós originais representados por cada nó
+    weights: np.ndarray  # peso de cada aresta, na ordem do CSR de saída
+    note: str  # descrição da redução aplicada
+
+
+def core_numbers(graph):
+    """
+    Número de core de cada nó (grafo tratado como não dirigido).
+
+    Remove em rodadas vetorizadas todos os nós com grau <= k, como no
+    algoritmo de Batagelj-Zaversnik, mas sem fila de prioridade.
+
+    Args:
+        graph: CompactGraph
+
+    Returns:
+        np.ndarray: Core de cada nó, na ordem dos IDs (igual a nx.core_number)
+    """
+    S = graph.undirected_adjacency()
+    degree = np.diff(S.indptr).astype(np.int64)
+    core = np.zeros(len(degree), dtype=np.int64)
+    alive = np.ones(len(degree), dtype=bool)
+    k = 0
+    while alive.any():
+        k = max(k, int(degree[alive].min()))
+        while True:
+            peel = alive & (degree <= k)
+            if not peel.any():
+                break
+            core[peel] = k
+            alive[peel] = False
+            degree -= np.rint(S @ peel.astype(np.float64)).astype(np.int64)
+    return core
+
+
+def _top(values, count):
+    """IDs dos `count` maiores valores (empates desfeitos pelo menor ID)."""
+    order = np.lexsort((np.arange(len(values)), -np.asarray(values, dtype=np.float64)))
+    return np.sort(order[:count])
+
+
+def reduce_graph(graph, method="kcore", max_nodes=MAX_NOS_INTERATIVO, scores=None, groups=None):
+    """
+    Reduz o grafo a no máximo `max_nodes` nós.
+
+    Args:
+        graph: CompactGraph completo
+        method: "kcore" (maior k-core que cabe no limite), "top" (nós com
+            maior `scores`) ou "communities" (cada grupo de `groups` vira um
+            super-nó; só os `max_nodes` maiores grupos são mantidos)
+        max_nodes: Número máximo de nós no resultado
+        scores: Vetor de pontuação por nó (padrão: grau total); também
+            desempata o corte do k-core
+        groups: Vetor com a comunidade de cada nó (obrigatório em "communities")
+
+    Returns:
+        ReducedView: Grafo reduzido e metadados
+
+    Raises:
+        ValueError: Se o método for desconhecido ou faltar `groups`
+    """
+    n = graph.number_of_nodes()
+    if scores is None:
+        scores = graph.degree()
+
+    if method == "communities":
+        if groups is None:
+            raise ValueError("A redução por comunidades requer o vetor de grupos")
+        groups = np.asarray(groups, dtype=np.int64)
+        sizes = np.bincount(groups)
+        kept = _top(sizes, max_nodes)
+        kept = kept[sizes[kept] > 0]
+        mask = np.zeros(len(sizes), dtype=bool)
+        mask[kept] = True
+        quotient, members, weights = graph.quotient(np.where(mask[groups], groups, -1))
+        note = f"{len(kept)} de {int((sizes > 0).sum())} comunidades como super-nós"
+        return ReducedView(quotient, np.asarray(quotient.labels), members, weights, note)
+
+    if n <= max_nodes:
+        ids = np.arange(n)
+        note = "grafo completo"
+    elif method == "top":
+        ids = _top(scores, max_nodes)
+        note = f"{max_nodes} nós de maior pontuação de {n}"
+    elif method == "kcore":
+        core = core_numbers(graph)
+        for k in np.unique(core):
+            inside = np.flatnonzero(core >= k)
+            if len(inside) <= max_nodes:
+                ids = inside
+                note = f"{k}-core ({len(ids)} de {n} nós)"
+                break
+        else:
+            # Nem o core mais interno cabe: fica com os seus nós de maior pontuação
+            inside = np.flatnonzero(core == core.max())
+            ids = np.sort(inside[_top(np.asarray(scores)[inside], max_nodes)])
+            note = f"{max_nodes} nós do {core.max()}-core ({len(inside)} nós) de {n}"
+    else:
+        raise ValueError(f"Redução desconhecida: {method}")
+
+    sub = graph.subgraph(ids)
+    weights = np.ones(sub.number_of_edges(), dtype=np.int64)
+    return ReducedView(sub, ids, np.ones(len(ids), dtype=np.int64), weights, note)
+
+
+def value_colors(values, cmap="plasma"):
+    """Cores hexadecimais de um vetor de valores numa escala de cores."""
+    values = np.asarray(values, dtype=np.float64)
+    span = np.ptp(values) if len(values) else 0
+    scaled = (values - values.min()) / span if span > 0 else np.zeros(len(values))
+    return [mcolors.to_hex(c) for c in colormaps[cmap](scaled)]
+
+
+def build_payload(
+    view, values, titles, colors=None, directed=True, max_edges=MAX_ARESTAS_INTERATIVO, seed=42
+):
+    """
+    Serializa a visão reduzida num dict colunar pronto para o vis-network.
+
+    Args:
+        view: ReducedView
+        values: Valor de cada nó (define o tamanho)
+        titles: Texto do tooltip de cada nó
+        colors: Cor de cada nó (padrão: escala de `values`)
+        directed: Desenha setas nas arestas
+        max_edges: Máximo de arestas enviadas (as de maior peso primeiro)
+        seed: Semente do layout e do desempate das arestas
+
+    Returns:
+        dict: Payload com nós, arestas e opções
+    """
+    graph = view.graph
+    n = graph.number_of_nodes()
+    physics = n <= MAX_NOS_COM_FISICA
+    xy = force_layout(graph, seed=seed) * (ESCALA_POR_NO * np.sqrt(max(n, 1)))
+
+    src, dst, weights = graph.edge_sources(), np.asarray(graph.out_indices), view.weights
+    if len(src) > max_edges:
+        tiebreak = np.random.default_rng(seed).random(len(src))
+        keep = np.lexsort((tiebreak, -weights))[:max_edges]
+        src, dst, weights = src[keep], dst[keep], weights[keep]
+
+    return {
+        "directed": bool(directed),
+        "physics": bool(physics),
+        "nodes": {
+            "id": list(range(n)),
+            "label": [str(label) for label in graph.labels],
+            "title": list(titles),
+            "value": np.round(np.asarray(values, dtype=np.float64), 6).tolist(),
+            "color": list(colors) if colors is not None else value_colors(values),
+            "x": np.round(xy[:, 0], 1).tolist(),
+            "y": np.round(xy[:, 1], 1).tolist(),
+        },
+        "edges": {
+            "from": src.tolist(),
+            "to": dst.tolist(),
+            "value": np.asarray(weights).tolist(),
+        },
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _asset(*parts):
+    with open(os.path.join(LIB_DIR, *parts), encoding="utf-8") as f:
+        return f.read()
+
+
+_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>{vis_css}</style>
+<style>{tom_css}</style>
+<style>
+  body {{ margin: 0; background: #0D1117; font-family: sans-serif; }}
+  #mynetwork {{ width: 100%; height: {height}px; background: #0D1117; }}
+  #busca {{ padding: 6px 0; }}
+  div.vis-tooltip {{ white-space: pre; }}
+</style>
+<script>{vis_js}</script>
+<script>{tom_js}</script>
+<script>{utils_js}</script>
+</head>
+<body>
+<div id="busca"><select id="select-node" placeholder="Buscar nó..."></select></div>
+<div id="mynetwork"></div>
+<script>
+  var payload = {payload};
+  var nodeColors = {{}};
+  var allNodes, allEdges;
+  var highlightActive = false;
+  var filterActive = false;
+  var columns = payload.nodes;
+  var nodeList = columns.id.map(function (id, i) {{
+    nodeColors[id] = columns.color[i];
+    return {{
+      id: id, label: columns.label[i], title: columns.title[i], value: columns.value[i],
+      color: columns.color[i], x: columns.x[i], y: columns.y[i]
+    }};
+  }});
+  var edgeList = payload.edges.from.map(function (source, i) {{
+    return {{ from: source, to: payload.edges.to[i], value: payload.edges.value[i] }};
+  }});
+  var nodes = new vis.DataSet(nodeList);
+  var edges = new vis.DataSet(edgeList);
+  var options = {{
+    nodes: {{ shape: "dot", scaling: {{ min: 4, max: 30 }}, font: {{ color: "#FFFFFF", size: 12 }} }},
+    edges: {{
+      arrows: {{ to: {{ enabled: payload.directed, scaleFactor: 0.4 }} }},
+      color: {{ color: "#888888", opacity: 0.5 }},
+      scaling: {{ min: 0.5, max: 6 }},
+      smooth: payload.physics ? {{ type: "continuous" }} : false
+    }},
+    physics: {{
+      enabled: payload.physics,
+      barnesHut: {{ gravitationalConstant: -3000, springLength: 120 }},
+      stabilization: {{ iterations: 150 }}
+    }},
+    interaction: {{ hideEdgesOnDrag: true, tooltipDelay: 100 }}
+  }};
+  var network = new vis.Network(
+    document.getElementById("mynetwork"), {{ nodes: nodes, edges: edges }}, options
+  );
+  network.on("click", neighbourhoodHighlight);
+  new TomSelect("#select-node", {{
+    options: nodeList.map(function (node) {{ return {{ value: node.id, text: node.label }}; }}),
+    onChange: function (value) {{
+      if (value !== "") {{
+        selectNode([Number(value)]);
+        network.focus(Number(value), {{ scale: 1.2, animation: true }});
+      }}
+    }}
+  }});
+</script>
+</body>
+</html>
+"""
+
+
+def render_html(payload, height=700):
+    """
+    Gera o HTML autocontido da visualização, com os scripts de lib/ embutidos.
+
+    Args:
+        payload: Dict gerado por `build_payload`
+        height: Altura do canvas, em pixels
+
+    Returns:
+        str: Documento HTML para `st.components.v1.html`
+    """
+    # "</" dentro de um <script> encerraria a tag antes da hora
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    return _TEMPLATE.format(
+        vis_css=_asset("vis-9.1.2", "vis-network.css"),
+        tom_css=_asset("tom-select", "tom-select.css"),
+        vis_js=_asset("vis-9.1.2", "vis-network.min.js"),
+        tom_js=_asset("tom-select", "tom-select.complete.min.js"),
+        utils_js=_asset("bindings", "utils.js"),
+        payload=data,
+        height=int(height),
+    )
@@ -0,0 +1,272 @@
+"""
+Varredura paralela de caminhos mínimos a partir de todos os nós.
+
+Uma passada de BFS por nó de origem produz a excentricidade, a soma das
+distâncias e, quando pedido, o acúmulo de dependências de Brandes de cada
+origem, com as origens divididas entre processos.
+
+As duas métricas que usam a varredura são calculadas separadamente porque o
+app as mostra com direções diferentes: `distance_metrics` (diâmetro, caminho
+médio, excentricidade) sobre a adjacência não dirigida, sem o acúmulo de
+Brandes, e `betweenness` sobre a adjacência dirigida, como o NetworkX faz
+num DiGraph.
+
+As varreduras podem ser interrompidas: com um `threading.Event` em `cancel`,
+os blocos ainda na fila são descartados, os processos são encerrados e
+`SweepCancelled` é levantada assim que o evento é sinalizado.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from scipy.sparse.csgraph import connected_components
+
+# Abaixo deste número de nós o custo de subir os processos não compensa
+MIN_NODES_PARALELO = 2000
+# Intervalo (s) com que o processo principal confere o pedido de cancelamento
+INTERVALO_CANCELAMENTO = 0.2
+
+# Adjacência do processo trabalhador (preenchida por _init_worker)
+_neighbors = None
+
+
+class SweepCancelled(Exception):
+    """A varredura foi interrompida por um pedido de cancelamento."""
+
+
+def _check_cancel(cancel):
+    if cancel is not None and cancel.is_set():
+        raise SweepCancelled()
+
+
+def _neighbor_lists(indptr, indices):
+    indices = indices.tolist()
+    return [indices[indptr[i]:indptr[i + 1]] for i in range(len(indptr) - 1)]
+
+
+def _init_worker(indptr, indices):
+    global _neighbors
+    _neighbors = _neighbor_lists(indptr, indices)
+
+
+def _bfs(s, neighbors, n):
+    """Distâncias a partir de `s` e os nós alcançados, na ordem da BFS."""
+    dist = [-1] * n
+    dist[s] = 0
+    order = [s]
+    for v in order:
+        dv = dist[v] + 1
+        for w in neighbors[v]:
+            if dist[w] < 0:
+                dist[w] = dv
+                order.append(w)
+    return dist, order
+
+
+def _sweep(sources, neighbors=None, cancel=None, accumulate=True):
+    """
+    BFS (de Brandes, com `accumulate`) a partir de cada origem do bloco.
+
+    `cancel` só é usado na execução sequencial (no processo principal).
+
+    Returns:
+        tuple: (excentricidade, soma das distâncias e alcance de cada origem,
+        e o vetor de dependências acumuladas sobre todos os nós, ou None sem
+        `accumulate`)
+    """
+    if neighbors is None:
+        neighbors = _neighbors
+    n = len(neighbors)
+    ecc = np.zeros(len(sources), dtype=np.int64)
+    dist_sum = np.zeros(len(sources), dtype=np.int64)
+    reach = np.zeros(len(sources), dtype=np.int64)
+    bc = [0.0] * n if accumulate else None
+
+    for i, s in enumerate(sources):
+        _check_cancel(cancel)
+        if not accumulate:
+            dist, order = _bfs(s, neighbors, n)
+            ecc[i] = dist[order[-1]]
+            dist_sum[i] = sum(dist[v] for v in order)
+            reach[i] = len(order) - 1
+            continue
+
+        sigma = [0] * n
+        dist = [-1] * n
+        preds = [[] for _ in range(n)]
+        sigma[s] = 1
+        dist[s] = 0
+        order = []
+        queue = deque([s])
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            dv = dist[v] + 1
+            sv = sigma[v]
+            for w in neighbors[v]:
+                if dist[w] < 0:
+                    dist[w] = dv
+                    queue.append(w)
+                if dist[w] == dv:
+                    sigma[w] += sv
+                    preds[w].append(v)
+
+        ecc[i] = dist[order[-1]]
+        dist_sum[i] = sum(dist[v] for v in order)
+        reach[i] = len(order) - 1
+
+        dependency = [0.0] * n
+        for w in reversed(order):
+            coeff = (1.0 + dependency[w]) / sigma[w]
+            for v in preds[w]:
+                dependency[v] += sigma[v] * coeff
+            if w != s:
+                bc[w] += dependency[w]
+
+    return ecc, dist_sum, reach, np.asarray(bc) if accumulate else None
+
+
+def all_pairs_sweep(adj, processes=None, cancel=None, accumulate=True):
+    """
+    Executa a varredura de BFS a partir de todos os nós, em paralelo.
+
+    Args:
+        adj: CSRAdjacency do grafo (ver sparse_backend); as arestas são
+            percorridas no sentido da matriz
+        processes: Número de processos (None = todos os núcleos; 1 = sequencial)
+        cancel: threading.Event opcional que interrompe a varredura
+        accumulate: Se False, pula o acúmulo de Brandes ("betweenness" = None)
+
+    Returns:
+        dict: Vetores indexados pelas linhas da matriz — "eccentricity",
+        "distance_sum", "reach" — e "betweenness" bruta (não normalizada)
+
+    Raises:
+        SweepCancelled: Se `cancel` for sinalizado antes do fim
+    """
+    n = len(adj)
+    indptr = adj.matrix.indptr
+    indices = adj.matrix.indices
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, n))
+
+    if processes == 1 or n < MIN_NODES_PARALELO:
+        ecc, dist_sum, reach, bc = _sweep(
+            range(n), _neighbor_lists(indptr, indices), cancel, accumulate
+        )
+        return {"eccentricity": ecc, "distance_sum": dist_sum, "reach": reach, "betweenness": bc}
+
+    # Blocos intercalados equilibram a carga entre os processos
+    n_chunks = processes * 4
+    chunks = [np.arange(c, n, n_chunks) for c in range(n_chunks)]
+    ecc = np.zeros(n, dtype=np.int64)
+    dist_sum = np.zeros(n, dtype=np.int64)
+    reach = np.zeros(n, dtype=np.int64)
+    bc = np.zeros(n) if accumulate else None
+    executor = ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(indptr, indices),
+    )
+    finished = False
+    try:
+        futures = {
+            executor.submit(_sweep, chunk.tolist(), accumulate=accumulate): chunk
+            for chunk in chunks
+        }
+        pending = set(futures)
+        while pending:
+            _check_cancel(cancel)
+            done, pending = wait(pending, timeout=INTERVALO_CANCELAMENTO, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = futures[future]
+                c_ecc, c_sum, c_reach, c_bc = future.result()
+                ecc[chunk] = c_ecc
+                dist_sum[chunk] = c_sum
+                reach[chunk] = c_reach
+                if accumulate:
+                    bc += c_bc
+        finished = True
+    finally:
+        if finished:
+            executor.shutdown(wait=True)
+        else:
+            _abort(executor)
+    return {"eccentricity": ecc, "distance_sum": dist_sum, "reach": reach, "betweenness": bc}
+
+
+def _abort(executor):
+    """Descarta os blocos na fila e encerra os processos sem esperar os que estão rodando."""
+    terminate = getattr(executor, "terminate_workers", None)  # Python 3.14+
+    if terminate is not None:
+        terminate()
+        return
+    # Antes do 3.14 não há API pública: `shutdown` esquece os processos, então
+    # eles são guardados antes e encerrados em seguida
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def _normalized_betweenness(raw, n):
+    if n <= 2:
+        return raw
+    return raw / ((n - 1) * (n - 2))
+
+
+def distance_metrics(adj, processes=None, cancel=None):
+    """
+    Diâmetro, caminho médio e excentricidade numa única varredura.
+
+    Deve receber a adjacência não dirigida (simétrica). Como no app original,
+    as métricas de distância só são definidas para grafos conexos. A
+    betweenness não é calculada aqui (ver `betweenness`).
+
+    Args:
+        adj: CSRAdjacency simétrica do grafo
+        processes: Número de processos (None = todos os núcleos)
+        cancel: threading.Event opcional que interrompe a varredura
+
+    Returns:
+        dict: "diameter", "average_path", "eccentricity_avg" e "eccentricity"
+        (nó -> valor), ou None se o grafo não for conexo
+    """
+    n = len(adj)
+    if n == 0:
+        return None
+    n_components, _ = connected_components(adj.matrix, directed=False)
+    if n_components != 1:
+        return None
+    sweep = all_pairs_sweep(adj, processes, cancel, accumulate=False)
+    ecc = sweep["eccentricity"]
+    return {
+        "diameter": int(ecc.max()),
+        "average_path": float(sweep["distance_sum"].sum()) / (n * (n - 1)) if n > 1 else 0.0,
+        "eccentricity_avg": float(ecc.mean()),
+        "eccentricity": adj.to_dict(ecc),
+    }
+
+
+def betweenness(adj, processes=None, cancel=None):
+    """
+    Betweenness exata (normalizada como no NetworkX) com a varredura paralela.
+
+    Args:
+        adj: CSRAdjacency do grafo (dirigida ou simétrica)
+        processes: Número de processos (None = todos os núcleos)
+        cancel: threading.Event opcional que interrompe a varredura
+
+    Returns:
+        dict: Nó -> betweenness
+    """
+    n = len(adj)
+    if n == 0:
+        return {}
+    sweep = all_pairs_sweep(adj, processes, cancel)
+    return adj.to_dict(_normalized_betweenness(sweep["betweenness"], n))
@@ -0,0 +1,141 @@
+"""
+Gravação dos tweets coletados em Parquet, particionado por janela de datas.
+
+Cada janela do scraper vira um ou mais arquivos na partição
+`janela=AAAA-MM-DD` (data de início), no formato de diretórios do Hive. Os
+arquivos são gravados em lotes de registros Arrow, com `source`/`target`
+codificados por dicionário (cada @ é guardado uma vez por arquivo) e
+`tweet_date` como timestamp: as estatísticas de mínimo e máximo de cada
+arquivo deixam a leitura (`ingest.read_edge_parquet`) pular as janelas fora
+do período pedido sem abri-las.
+
+O pyarrow é opcional: sem ele, `PARQUET_DISPONIVEL` é False e o scraper
+grava só o CSV.
+"""
+
+import os
+import uuid
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional
+    pa = pq = None
+
+PARQUET_DISPONIVEL = pa is not None
+
+COLUNAS = ["source", "target", "tweet_text", "tweet_date"]
+PARTICAO = "janela"
+# Linhas por lote de registros (e por grupo de linhas do Parquet)
+LINHAS_POR_LOTE = 100_000
+
+
+def tweet_schema():
+    """Esquema Arrow dos tweets: @ por dicionário e data como timestamp UTC."""
+    return pa.schema(
+        [
+            ("source", pa.dictionary(pa.int32(), pa.string())),
+            ("target", pa.dictionary(pa.int32(), pa.string())),
+            ("tweet_text", pa.string()),
+            ("tweet_date", pa.timestamp("ms", tz="UTC")),
+        ]
+    )
+
+
+def _record_batches(frame, batch_rows):
+    """Divide um DataFrame de tweets em lotes de registros Arrow."""
+    schema = tweet_schema()
+    for start in range(0, len(frame), batch_rows):
+        part = frame.iloc[start:start + batch_rows]
+        yield pa.RecordBatch.from_arrays(
+            [
+                pa.array(part["source"], type=pa.string()).dictionary_encode(),
+                # Tweet sem menção: destino nulo, como a célula vazia do CSV
+                pa.array(part["target"].replace("", None), type=pa.string()).dictionary_encode(),
+                pa.array(part["tweet_text"], type=pa.string()),
+                pa.array(
+                    pd.to_datetime(part["tweet_date"], errors="coerce", utc=True),
+                    type=schema.field("tweet_date").type,
+                ),
+            ],
+            schema=schema,
+        )
+
+
+class ParquetWindowWriter:
+    """
+    Grava lotes de tweets num diretório Parquet particionado por janela.
+
+    Cada chamada a `write` gera um arquivo novo (nome aleatório), escrito
+    com um nome temporário começando com "_" (ignorado pelos leitores) e
+    renomeado ao final: leitores nunca veem um arquivo pela metade, e
+    gravações de vários navegadores não colidem.
+    """
+
+    def __init__(self, root, batch_rows=LINHAS_POR_LOTE, compression="zstd"):
+        if not PARQUET_DISPONIVEL:
+            raise ImportError("pyarrow não está instalado (pip install pyarrow)")
+        self.root = root
+        self.batch_rows = batch_rows
+        self.compression = compression
+
+    def partition_dir(self, window_start):
+        label = "desconhecida" if pd.isna(window_start) else pd.Timestamp(window_start).date()
+        return os.path.join(self.root, f"{PARTICAO}={label}")
+
+    def write(self, tweets, window_start):
+        """
+        Grava os tweets de uma janela.
+
+        Args:
+            tweets: Lista de tuplas (source, target, tweet_text, tweet_date)
+                ou DataFrame com essas colunas
+            window_start: Data de início da janela (nome da partição)
+
+        Returns:
+            str ou None: Caminho do arquivo gravado (None se não havia tweets)
+        """
+        frame = tweets if isinstance(tweets, pd.DataFrame) else pd.DataFrame(list(tweets), columns=COLUNAS)
+        if frame.empty:
+            return None
+        frame = frame[COLUNAS].astype({"source": str, "tweet_text": str}).fillna({"target": ""})
+
+        directory = self.partition_dir(window_start)
+        os.makedirs(directory, exist_ok=True)
+        name = f"part-{uuid.uuid4().hex}.parquet"
+        temporary, path = os.path.join(directory, f"_{name}"), os.path.join(directory, name)
+        with pq.ParquetWriter(temporary, tweet_schema(), compression=self.compression) as writer:
+            for batch in _record_batches(frame, self.batch_rows):
+                writer.write_batch(batch)
+        os.replace(temporary, path)
+        return path
+
+
+def csv_to_parquet(csv_path, root, freq="M", chunksize=LINHAS_POR_LOTE):
+    """
+    Converte um CSV do scraper para o formato particionado, em blocos.
+
+    Como o CSV não guarda as janelas da coleta, as partições são períodos
+    de calendário da data do tweet (mensais por padrão).
+
+    Args:
+        csv_path: CSV com as colunas de COLUNAS
+        root: Diretório Parquet de destino
+        freq: Frequência de período do pandas que define as partições ("M" = mês)
+        chunksize: Linhas do CSV lidas por bloco
+
+    Returns:
+        int: Linhas gravadas
+    """
+    writer = ParquetWindowWriter(root, batch_rows=chunksize)
+    total = 0
+    for chunk in pd.read_csv(csv_path, usecols=COLUNAS, dtype=str, keep_default_na=False, chunksize=chunksize):
+        dates = pd.to_datetime(chunk["tweet_date"], errors="coerce", utc=True)
+        periods = dates.dt.tz_localize(None).dt.to_period(freq).dt.start_time
+        # Datas inválidas vão para a partição "desconhecida" em vez de se perderem
+        for period, part in chunk.groupby(periods, sort=True, dropna=False):
+            writer.write(part, period)
+            total += len(part)
+    return total
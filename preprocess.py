@@ -0,0 +1,278 @@
+"""
+Pré-processamento de listas de arestas: limpeza vetorizada e em blocos.
+
+Substitui o `solo_node_remover.py` (que filtrava linha a linha com
+csv.DictReader) por um estágio reutilizável, com API Python e linha de
+comando. Cada bloco do arquivo passa por operações vetorizadas do pandas:
+
+- remove linhas sem origem ou sem destino (tweets sem menção);
+- normaliza os @ (espaços nas pontas e, opcionalmente, minúsculas);
+- remove auto-laços;
+- remove linhas repetidas, mesmo em blocos diferentes (hashes de 64 bits
+  guardados num DedupIndex em memória, não as linhas);
+- opcionalmente, colapsa arestas paralelas numa coluna de peso.
+
+Uso pela linha de comando:
+
+    python preprocess.py tweets_rouanet_graph.csv -o tweets_rouanet_graph_filtrado.csv
+    python preprocess.py tweets_rouanet_graph.csv --pesos
+
+O app aplica o mesmo estágio ao DataFrame carregado (`preprocess_frame`),
+dispensando as cópias *_filtrado.csv.
+"""
+
+import argparse
+import os
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from dedup_index import DedupIndex
+
+# Linhas lidas por bloco do arquivo de entrada
+LINHAS_POR_BLOCO = 250_000
+# Arestas parciais acumuladas antes de reagregar os pesos
+MAX_ARESTAS_PARCIAIS = 2_000_000
+
+
+class PreprocessStats(NamedTuple):
+    """Contagens de uma execução do pré-processamento."""
+
+    rows_in: int
+    empty: int  # linhas sem origem ou sem destino
+    self_loops: int
+    duplicates: int  # linhas repetidas removidas
+    rows_out: int  # linhas gravadas (arestas distintas, com pesos)
+
+    def summary(self):
+        return (
+            f"{self.rows_in} linhas lidas | {self.empty} sem origem/destino | "
+            f"{self.self_loops} auto-laços | {self.duplicates} duplicatas | {self.rows_out} mantidas"
+        )
+
+
+def _normalize(values, lowercase):
+    """@ sem espaços nas pontas (e em minúsculas); vazios viram nulos."""
+    values = values.str.strip()
+    if lowercase:
+        values = values.str.lower()
+    return values.astype("string").replace("", pd.NA)
+
+
+def clean_chunk(frame, source="source", target="target", lowercase=False, drop_self_loops=True):
+    """
+    Normaliza os @ e remove linhas sem origem/destino e auto-laços.
+
+    Args:
+        frame: Bloco da lista de arestas (colunas de texto ou categóricas)
+        source: Coluna de origem
+        target: Coluna de destino
+        lowercase: Converte os @ para minúsculas
+        drop_self_loops: Remove arestas de um nó para ele mesmo
+
+    Returns:
+        tuple: (bloco limpo, linhas vazias removidas, auto-laços removidos)
+    """
+    src = _normalize(frame[source], lowercase)
+    tgt = _normalize(frame[target], lowercase)
+    empty = (src.isna() | tgt.isna()).to_numpy()
+    loops = np.zeros(len(frame), dtype=bool)
+    if drop_self_loops:
+        loops = ~empty & (src == tgt).fillna(False).to_numpy()
+    keep = ~(empty | loops)
+    cleaned = frame.loc[keep].copy()
+    cleaned[source] = src[keep]
+    cleaned[target] = tgt[keep]
+    return cleaned, int(empty.sum()), int(loops.sum())
+
+
+def drop_seen(frame, seen):
+    """
+    Remove as linhas já vistas (neste ou em blocos anteriores).
+
+    Args:
+        frame: Bloco já limpo
+        seen: DedupIndex com os hashes das linhas mantidas até agora
+
+    Returns:
+        tuple: (bloco sem repetidas, número de linhas removidas)
+    """
+    hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy(np.uint64)
+    new = seen.missing(hashes)
+    seen.add(hashes[new])
+    return frame.loc[new], int((~new).sum())
+
+
+def collapse_weights(frame, source="source", target="target", weight="weight"):
+    """
+    Colapsa arestas paralelas numa só, com peso igual à soma dos pesos.
+
+    Sem a coluna `weight`, cada linha vale 1 (o peso é a contagem).
+
+    Returns:
+        pd.DataFrame: Colunas source, target e weight
+    """
+    values = frame[weight] if weight in frame else pd.Series(1.0, index=frame.index)
+    grouped = (
+        pd.DataFrame({source: frame[source], target: frame[target], weight: values.astype("float64")})
+        .groupby([source, target], observed=True, sort=False)[weight]
+        .sum()
+    )
+    return grouped.reset_index()
+
+
+def preprocess(
+    input_path,
+    output_path,
+    source="source",
+    target="target",
+    lowercase=False,
+    drop_self_loops=True,
+    dedupe=True,
+    weights=False,
+    weight="weight",
+    chunksize=LINHAS_POR_BLOCO,
+):
+    """
+    Limpa uma lista de arestas em CSV, em blocos, gravando o resultado.
+
+    Sem `weights`, as demais colunas (ex: tweet_text) são mantidas e o
+    arquivo é gravado bloco a bloco; com `weights`, a saída tem só origem,
+    destino e peso, e a memória fica proporcional às arestas distintas.
+
+    Args:
+        input_path: CSV de entrada (caminho ou arquivo aberto)
+        output_path: CSV de saída
+        source: Coluna de origem
+        target: Coluna de destino
+        lowercase: Converte os @ para minúsculas
+        drop_self_loops: Remove auto-laços
+        dedupe: Remove linhas repetidas
+        weights: Colapsa arestas paralelas numa coluna de peso
+        weight: Nome da coluna de peso (somada se já existir na entrada)
+        chunksize: Linhas por bloco
+
+    Returns:
+        PreprocessStats: Contagens da execução
+
+    Raises:
+        ValueError: Se as colunas de origem e destino não existirem
+    """
+    seen = DedupIndex(bloom=False) if dedupe else None
+    rows_in = empty = self_loops = duplicates = rows_out = 0
+    partials = []
+    header = True
+    for chunk in pd.read_csv(input_path, dtype=str, keep_default_na=False, chunksize=chunksize):
+        missing = {source, target} - set(chunk.columns)
+        if missing:
+            raise ValueError(f"Colunas obrigatórias ausentes no CSV: {', '.join(sorted(missing))}")
+        rows_in += len(chunk)
+        chunk, n_empty, n_loops = clean_chunk(chunk, source, target, lowercase, drop_self_loops)
+        empty += n_empty
+        self_loops += n_loops
+        if seen is not None:
+            chunk, n_duplicates = drop_seen(chunk, seen)
+            duplicates += n_duplicates
+
+        if weights:
+            partials.append(collapse_weights(chunk, source, target, weight))
+            # Reagrega quando as parciais passam do dobro da última agregação
+            # (custo amortizado linear mesmo com milhões de arestas distintas)
+            if sum(len(p) for p in partials) > max(MAX_ARESTAS_PARCIAIS, 2 * len(partials[0])):
+                partials = [collapse_weights(pd.concat(partials), source, target, weight)]
+        else:
+            chunk.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+            header = False
+            rows_out += len(chunk)
+
+    if weights:
+        edges = (
+            collapse_weights(pd.concat(partials), source, target, weight)
+            if partials
+            else pd.DataFrame(columns=[source, target, weight])
+        )
+        edges.to_csv(output_path, index=False)
+        rows_out = len(edges)
+    elif header:
+        pd.DataFrame(columns=[source, target]).to_csv(output_path, index=False)
+    return PreprocessStats(rows_in, empty, self_loops, duplicates, rows_out)
+
+
+def preprocess_frame(
+    df,
+    source="source",
+    target="target",
+    lowercase=False,
+    drop_self_loops=True,
+    dedupe=True,
+    weights=False,
+    weight="weight",
+):
+    """
+    Aplica o mesmo estágio a uma lista de arestas já carregada.
+
+    Args:
+        df: DataFrame no formato de `ingest.read_edge_list`
+        (demais argumentos como em `preprocess`)
+
+    Returns:
+        tuple: (DataFrame limpo, com origem e destino categóricos e as
+        mesmas categorias; PreprocessStats)
+    """
+    cleaned, empty, self_loops = clean_chunk(df, source, target, lowercase, drop_self_loops)
+    duplicates = 0
+    if dedupe:
+        cleaned, duplicates = drop_seen(cleaned, DedupIndex(bloom=False))
+    if weights:
+        cleaned = collapse_weights(cleaned, source, target, weight)
+        cleaned[weight] = cleaned[weight].astype("float32")
+
+    nodes = pd.Index(pd.unique(pd.concat([cleaned[source], cleaned[target]])), dtype="string").sort_values()
+    cleaned = cleaned.reset_index(drop=True)
+    cleaned[source] = pd.Categorical(cleaned[source], categories=nodes)
+    cleaned[target] = pd.Categorical(cleaned[target], categories=nodes)
+    return cleaned, PreprocessStats(len(df), empty, self_loops, duplicates, len(cleaned))
+
+
+def default_output(input_path, weights=False):
+    """Nome de saída no padrão dos arquivos já existentes (*_filtrado.csv)."""
+    stem, _ = os.path.splitext(input_path)
+    return f"{stem}_pesos.csv" if weights else f"{stem}_filtrado.csv"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Limpa uma lista de arestas (CSV) em blocos: remove linhas sem destino, "
+        "auto-laços e duplicatas e normaliza os @."
+    )
+    parser.add_argument("entrada", help="CSV de entrada")
+    parser.add_argument("-o", "--saida", help="CSV de saída (padrão: <entrada>_filtrado.csv)")
+    parser.add_argument("--source", default="source", help="Coluna de origem")
+    parser.add_argument("--target", default="target", help="Coluna de destino")
+    parser.add_argument("--minusculas", action="store_true", help="Converte os @ para minúsculas")
+    parser.add_argument("--manter-auto-lacos", action="store_true", help="Mantém arestas de um nó para ele mesmo")
+    parser.add_argument("--manter-duplicatas", action="store_true", help="Mantém linhas repetidas")
+    parser.add_argument("--pesos", action="store_true", help="Colapsa arestas paralelas numa coluna 'weight'")
+    parser.add_argument("--linhas-por-bloco", type=int, default=LINHAS_POR_BLOCO)
+    args = parser.parse_args(argv)
+
+    output_path = args.saida or default_output(args.entrada, args.pesos)
+    stats = preprocess(
+        args.entrada,
+        output_path,
+        source=args.source,
+        target=args.target,
+        lowercase=args.minusculas,
+        drop_self_loops=not args.manter_auto_lacos,
+        dedupe=not args.manter_duplicatas,
+        weights=args.pesos,
+        chunksize=args.linhas_por_bloco,
+    )
+    print(stats.summary())
+    print(f"Arquivo filtrado salvo como {output_path}")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Desenho de arestas em lote, com nível de detalhe (LOD) para grafos grandes.
+
+Em vez de um FancyArrowPatch por aresta, todas as arestas viram uma única
+LineCollection, com a geometria das curvas calculada de forma vetorizada.
+Acima de um limite de arestas o desenho passa a usar uma amostra aleatória e,
+em grafos muito grandes, uma rasterização da densidade de arestas; assim o
+tempo de desenho fica praticamente constante conforme o grafo cresce.
+"""
+
+import numpy as np
+from matplotlib import colors as mcolors
+from matplotlib.collections import LineCollection
+
+# Até este número de arestas todas são desenhadas individualmente
+MAX_ARESTAS_DETALHADAS = 20_000
+# Acima de MAX * este fator, a amostra dá lugar ao mapa de densidade
+FATOR_RASTER = 10
+# Pontos por curva (quanto mais, mais suave)
+PONTOS_POR_CURVA = 12
+
+
+def positions_array(pos, nodes):
+    """Matriz n x 2 com as coordenadas de `nodes` na ordem dada."""
+    return np.array([pos[node] for node in nodes], dtype=np.float64).reshape(-1, 2)
+
+
+def edge_segments(xy, src, dst, curvature=0.0, points=PONTOS_POR_CURVA):
+    """
+    Geometria das arestas como vetor (m, k, 2) de polilinhas.
+
+    Com curvatura, cada aresta é uma Bézier quadrática cujo ponto de controle
+    segue a mesma convenção do `connectionstyle="arc3,rad=..."` do matplotlib:
+    fica na mediatriz do segmento, a `curvature` vezes o comprimento dele.
+
+    Args:
+        xy: Matriz n x 2 de posições
+        src: Índices de origem
+        dst: Índices de destino
+        curvature: Curvatura (0 = retas)
+        points: Número de pontos por curva
+
+    Returns:
+        np.ndarray: Vetor (m, k, 2) com k = 2 (retas) ou `points`
+    """
+    p0 = xy[src]
+    p2 = xy[dst]
+    if curvature == 0:
+        return np.stack([p0, p2], axis=1)
+    d = p2 - p0
+    control = (p0 + p2) / 2 + curvature * np.column_stack([d[:, 1], -d[:, 0]])
+    t = np.linspace(0.0, 1.0, points)[None, :, None]
+    return (
+        (1 - t) ** 2 * p0[:, None, :]
+        + 2 * (1 - t) * t * control[:, None, :]
+        + t**2 * p2[:, None, :]
+    )
+
+
+def _density_image(ax, segments, color, alpha, bins=512):
+    """Rasteriza os pontos das arestas num histograma 2D em escala log."""
+    points = segments.reshape(-1, 2)
+    (xmin, ymin), (xmax, ymax) = points.min(axis=0), points.max(axis=0)
+    counts, xedges, yedges = np.histogram2d(
+        points[:, 0], points[:, 1], bins=bins, range=[[xmin, xmax + 1e-9], [ymin, ymax + 1e-9]]
+    )
+    intensity = np.log1p(counts.T)
+    if intensity.max() > 0:
+        intensity /= intensity.max()
+    rgba = np.zeros(intensity.shape + (4,))
+    rgba[..., :3] = mcolors.to_rgb(color)
+    rgba[..., 3] = intensity * alpha
+    ax.imshow(
+        rgba,
+        origin="lower",
+        extent=(xedges[0], xedges[-1], yedges[0], yedges[-1]),
+        interpolation="bilinear",
+        aspect="auto",
+        zorder=0,
+    )
+
+
+def draw_edges(
+    ax,
+    xy,
+    src,
+    dst,
+    curvature=0.0,
+    color="#BBBBBB",
+    linewidth=0.4,
+    alpha=0.5,
+    max_edges=MAX_ARESTAS_DETALHADAS,
+    seed=42,
+):
+    """
+    Desenha as arestas no eixo escolhendo o nível de detalhe pelo tamanho.
+
+    - até `max_edges`: todas as arestas numa única LineCollection;
+    - até `max_edges * FATOR_RASTER`: amostra aleatória de `max_edges` arestas;
+    - acima disso: mapa de densidade rasterizado das arestas.
+
+    Args:
+        ax: Eixo do matplotlib
+        xy: Matriz n x 2 de posições
+        src: Índices de origem das arestas
+        dst: Índices de destino das arestas
+        curvature: Curvatura das arestas (0 = retas)
+        color: Cor das arestas
+        linewidth: Espessura das linhas (um valor ou um por aresta)
+        alpha: Transparência
+        max_edges: Limite de arestas desenhadas individualmente
+        seed: Semente da amostragem
+
+    Returns:
+        str: Modo usado — "completo", "amostra" ou "densidade"
+    """
+    m = len(src)
+    if m == 0:
+        return "completo"
+
+    if m > max_edges * FATOR_RASTER:
+        # Poucos pontos por aresta bastam para a densidade
+        segments = edge_segments(xy, src, dst, curvature, points=6)
+        _density_image(ax, segments, color, alpha)
+        ax.update_datalim(xy)
+        ax.autoscale_view()
+        return "densidade"
+
+    mode = "completo"
+    if m > max_edges:
+        keep = np.random.default_rng(seed).choice(m, size=max_edges, replace=False)
+        src, dst = src[keep], dst[keep]
+        if np.ndim(linewidth):
+            linewidth = np.asarray(linewidth)[keep]
+        mode = "amostra"
+
+    segments = edge_segments(xy, src, dst, curvature)
+    lines = LineCollection(
+        segments, colors=color, linewidths=linewidth, alpha=alpha, zorder=0
+    )
+    ax.add_collection(lines)
+    ax.autoscale_view()
+    return mode
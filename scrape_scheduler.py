@@ -0,0 +1,270 @@
+"""
+Agendador paralelo e retomável das janelas de data do scraper.
+
+As janelas de `daterange` são distribuídas entre vários navegadores
+independentes (uma thread e um driver por trabalhador). Cada trabalhador tem
+o seu próprio recuo exponencial quando o site limita as requisições, sem
+parar os demais. A situação de cada janela fica num arquivo JSON, gravado a
+cada mudança: uma coleta interrompida recomeça da primeira janela não
+concluída em vez de voltar ao início do período.
+
+O módulo não depende do Selenium: o driver vem de uma fábrica e o trabalho de
+cada janela é uma função recebida de fora, o que permite rodá-lo contra um
+servidor HTML local ou com drivers falsos.
+"""
+
+import json
+import os
+import queue
+import random
+import threading
+from datetime import datetime
+from typing import NamedTuple
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Tentativas de uma janela (erros que não são rate limit) antes de desistir nesta execução
+MAX_TENTATIVAS_POR_JANELA = 3
+# Recuo após um rate limit: começa em 5 minutos e dobra até 1 hora
+RECUO_INICIAL = 300
+RECUO_MAXIMO = 3600
+# Pausa entre janelas de um mesmo trabalhador (segundos)
+PAUSA_ENTRE_JANELAS = (10, 40)
+
+
+class RateLimited(Exception):
+    """Levantada pelo trabalho de uma janela quando o site limita as requisições."""
+
+
+class Window(NamedTuple):
+    """Janela de datas [start, end] da busca."""
+
+    start: datetime
+    end: datetime
+
+    @property
+    def key(self):
+        return f"{self.start.date()}/{self.end.date()}"
+
+
+class WindowState:
+    """
+    Situação de cada janela, persistida num arquivo JSON.
+
+    O arquivo é reescrito por inteiro (arquivo temporário + `os.replace`) a
+    cada mudança, então nunca fica pela metade se a coleta for interrompida.
+    Só janelas DONE são puladas ao retomar: as que estavam RUNNING quando o
+    processo parou, e as FAILED de execuções anteriores, voltam para a fila.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.windows = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.windows = json.load(f).get("windows", {})
+
+    def status(self, window):
+        return self.windows.get(window.key, {}).get("status", PENDING)
+
+    def pending(self, windows):
+        """Janelas ainda não concluídas, na ordem recebida."""
+        return [w for w in windows if self.status(w) != DONE]
+
+    def mark(self, window, status, **info):
+        """
+        Registra a nova situação de uma janela e grava o arquivo.
+
+        Args:
+            window: Window
+            status: PENDING, RUNNING, DONE ou FAILED (RUNNING soma uma
+                tentativa ao histórico da janela)
+            **info: Campos extras guardados com a janela (ex: saved, error)
+        """
+        with self._lock:
+            entry = self.windows.setdefault(window.key, {"attempts": 0, "saved": 0})
+            entry.update(info)
+            entry["status"] = status
+            entry["updated"] = datetime.now().isoformat(timespec="seconds")
+            if status == RUNNING:
+                entry["attempts"] = entry.get("attempts", 0) + 1
+            self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"windows": self.windows}, f, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
+
+
+class Backoff:
+    """Recuo exponencial com variação aleatória, de um único trabalhador."""
+
+    def __init__(self, initial=RECUO_INICIAL, maximum=RECUO_MAXIMO, rng=None):
+        self.initial = initial
+        self.maximum = maximum
+        self.failures = 0
+        self.rng = rng or random.Random()
+
+    def failure(self):
+        """Registra um rate limit e devolve quantos segundos esperar."""
+        delay = min(self.maximum, self.initial * 2**self.failures)
+        self.failures += 1
+        return delay * self.rng.uniform(0.75, 1.0)
+
+    def success(self):
+        self.failures = 0
+
+
+class WindowScheduler:
+    """
+    Distribui janelas entre trabalhadores, cada um com o seu navegador.
+
+    Attributes:
+        state: WindowState com a situação de cada janela
+        total: Itens salvos nesta execução (soma dos retornos de `process`)
+    """
+
+    def __init__(
+        self,
+        process,
+        driver_factory,
+        workers=2,
+        state_path=None,
+        max_items=None,
+        max_attempts=MAX_TENTATIVAS_POR_JANELA,
+        pause=PAUSA_ENTRE_JANELAS,
+        backoff=(RECUO_INICIAL, RECUO_MAXIMO),
+    ):
+        """
+        Args:
+            process: Função (driver, Window) -> número de itens salvos; levanta
+                RateLimited quando o site limita as requisições
+            driver_factory: Função sem argumentos que cria um driver (com `quit()`)
+            workers: Número de navegadores em paralelo
+            state_path: Arquivo JSON da situação das janelas (None = só em memória)
+            max_items: Para de distribuir janelas ao atingir este total
+            max_attempts: Erros de uma janela nesta execução antes de marcá-la FAILED
+            pause: Intervalo (mín, máx) em segundos entre janelas de um trabalhador
+            backoff: (recuo inicial, recuo máximo) em segundos após um rate limit
+        """
+        self.process = process
+        self.driver_factory = driver_factory
+        self.workers = workers
+        self.state = WindowState(state_path)
+        self.max_items = max_items
+        self.max_attempts = max_attempts
+        self.pause = pause
+        self.backoff = backoff
+        self.total = 0
+        self._errors = {}  # erros de cada janela nesta execução
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def run(self, windows):
+        """
+        Processa as janelas ainda não concluídas e espera todos os trabalhadores.
+
+        Um Ctrl+C pede a parada: cada trabalhador termina a janela atual e
+        fecha o seu navegador; as janelas restantes ficam para a próxima
+        execução.
+
+        Args:
+            windows: Janelas do período completo (as já concluídas são puladas)
+
+        Returns:
+            int: Itens salvos nesta execução
+        """
+        todo = self.state.pending(windows)
+        print(f"🗓️ {len(windows) - len(todo)} de {len(windows)} janelas já concluídas")
+        for window in todo:
+            self._queue.put(window)
+
+        threads = [
+            threading.Thread(target=self._worker, args=(i,), name=f"coleta-{i}", daemon=True)
+            for i in range(min(self.workers, len(todo)))
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            print("🛑 Interrompido - aguardando os navegadores terminarem a janela atual")
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+        return self.total
+
+    def stop(self):
+        self._stop.set()
+
+    def _limit_reached(self):
+        return self.max_items is not None and self.total >= self.max_items
+
+    def _worker(self, worker_id):
+        driver = None
+        backoff = Backoff(*self.backoff)
+        try:
+            while not self._stop.is_set() and not self._limit_reached():
+                try:
+                    window = self._queue.get_nowait()
+                except queue.Empty:
+                    return
+                if driver is None:
+                    driver = self.driver_factory()
+
+                self.state.mark(window, RUNNING, worker=worker_id)
+                print(f"\n📅 [{worker_id}] Período: {window.start.date()} a {window.end.date()}")
+                try:
+                    saved = self.process(driver, window)
+                except RateLimited:
+                    # A janela volta para a fila (outro trabalhador pode pegá-la)
+                    # e só este trabalhador recua
+                    delay = backoff.failure()
+                    self.state.mark(window, PENDING)
+                    self._queue.put(window)
+                    print(f"⏳ [{worker_id}] Rate limit - aguardando {delay:.0f} segundos")
+                    self._stop.wait(delay)
+                    continue
+                except Exception as e:
+                    error = str(e)[:200]
+                    with self._lock:
+                        self._errors[window.key] = self._errors.get(window.key, 0) + 1
+                        retry = self._errors[window.key] < self.max_attempts
+                    if retry:
+                        self.state.mark(window, PENDING, error=error)
+                        self._queue.put(window)
+                    else:
+                        self.state.mark(window, FAILED, error=error)
+                    print(f"⚠️ [{worker_id}] Erro na janela {window.key}: {error[:100]}")
+                    # O navegador pode ter caído: o próximo é criado do zero
+                    _quit(driver)
+                    driver = None
+                    continue
+
+                backoff.success()
+                self.state.mark(window, DONE, saved=saved, error=None)
+                with self._lock:
+                    self.total += saved
+                intervalo = random.uniform(*self.pause)
+                print(f"⏸️ [{worker_id}] Aguardando {intervalo:.1f} segundos antes da próxima janela...")
+                self._stop.wait(intervalo)
+        finally:
+            if driver is not None:
+                _quit(driver)
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
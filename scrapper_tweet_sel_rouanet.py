@@ -1,15 +1,25 @@
 from datetime import datetime, timedelta
 import time  # Adicionar no início do arquivo
 import csv
+import json
 import os
 import pandas as pd
 import random
+import threading
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+import tweet_records
+from dedup_index import DedupIndex, tweet_hashes
+from parquet_store import PARQUET_DISPONIVEL, ParquetWindowWriter
+from scrape_scheduler import (
+    PAUSA_ENTRE_JANELAS, RECUO_INICIAL, RECUO_MAXIMO, RateLimited, Window, WindowScheduler,
+)
+from tweet_records import extrair_usuario_da_url, tweets_de_registros
+
 SEARCH_TERMS = ["rouanet"]
 SINCE = "2017-01-20"
 UNTIL = "2022-10-30"
@@ -17,14 +27,31 @@ UNTIL = "2022-10-30"
 MAX_TWEETS = 10000
 MAX_RETRIES = 6
 RETRY_INTERVAL = 120
-SCROLL_PAUSE = 6
+SCROLL_PAUSE = (6, 12)  # pausa entre rolagens: intervalo (mín, máx) em segundos
 WINDOW_DAYS = 23
-
+NUM_NAVEGADORES = 2  # janelas coletadas em paralelo, cada uma no seu navegador
+EXTRACAO_EM_LOTE = True  # um execute_script por página em vez de consultas por tweet
+
+# Esperas da navegação, em segundos (intervalos são sorteados a cada uso). Os
+# testes contra um servidor HTML local zeram todas elas
+PAUSA_APOS_ABRIR = (10, 30)  # depois de abrir a busca de uma janela
+PAUSA_APOS_RECARREGAR = (16, 40)  # depois de recarregar uma busca que não abriu
+PAUSA_POR_TWEET = (5, 10)  # só no modo antigo (EXTRACAO_EM_LOTE = False)
+PAUSA_APOS_ERRO = 20  # "Something went wrong": antes de recarregar a página
+PAUSA_APOS_ERRO_RECARREGAR = 10  # ... e depois de recarregar
+ESPERA_NOVOS_TWEETS = 10  # tempo máximo esperando a rolagem trazer tweets novos
+MAX_ROLAGENS_SEM_NOVOS = 6  # rolagens seguidas sem tweets novos antes de encerrar
+MAX_ROLAGENS = 50
+
+BASE_URL = "https://x.com"  # troque por um servidor local para testar o scraper
 CSV_PATH = f"tweets_{SEARCH_TERMS[0]}_graph.csv"
+INDICE_PATH = f"tweets_{SEARCH_TERMS[0]}_indice.npy"  # hashes dos tweets já salvos
+# Cópia colunar por janela (lida pelo app); o CSV continua sendo o registro da coleta
+PARQUET_DIR = f"tweets_{SEARCH_TERMS[0]}_parquet"
+SALVAR_PARQUET = PARQUET_DISPONIVEL
+ESTADO_PATH = f"tweets_{SEARCH_TERMS[0]}_janelas.json"  # janelas já concluídas
 
-def extrair_usuario_da_url(href):
-    """Extrai @usuario de uma URL, removendo parâmetros como ?src=..."""
-    return "@" + href.split("/")[-1].split("?")[0]
+_csv_lock = threading.Lock()  # os navegadores gravam no mesmo CSV
 
 def wait_for_tweets(driver):
     for attempt in range(1, MAX_RETRIES + 1):
@@ -42,17 +69,26 @@ def wait_for_tweets(driver):
                 return False
 
 
-def scroll_to_load_all(driver, max_tweets):
+def scroll_to_load_all(driver, max_tweets, on_page=None):
+    """
+    Rola a busca até não aparecerem tweets novos.
+
+    Args:
+        driver: WebDriver com a busca aberta
+        max_tweets: Para ao atingir este número de tweets carregados
+        on_page: Função chamada com o driver a cada página carregada (antes
+            de rolar), ex: para extrair os tweets visíveis em lote
+    """
     previous_count = 0
     no_new_scrolls = 0
-    max_no_new_scrolls = 6
+    max_no_new_scrolls = MAX_ROLAGENS_SEM_NOVOS
     scroll_attempts = 0
-    max_scroll_attempts = 50  # Limite máximo de rolagens
+    max_scroll_attempts = MAX_ROLAGENS  # Limite máximo de rolagens
 
     while no_new_scrolls < max_no_new_scrolls and scroll_attempts < max_scroll_attempts:
         # Espera explícita pelo carregamento
         try:
-            WebDriverWait(driver, 10).until(
+            WebDriverWait(driver, ESPERA_NOVOS_TWEETS).until(
                 lambda d: len(d.find_elements(By.CSS_SELECTOR, 'article[data-testid="tweet"]')) > previous_count or no_new_scrolls >= 1
             )
         except TimeoutException:
@@ -60,6 +96,8 @@ def scroll_to_load_all(driver, max_tweets):
 
         tweets = driver.find_elements(By.CSS_SELECTOR, 'article[data-testid="tweet"]')
         current_count = len(tweets)
+        if on_page is not None:
+            on_page(driver)
 
         if current_count >= max_tweets:
             print(f"✅ Limite de {max_tweets} tweets")
@@ -80,7 +118,7 @@ def scroll_to_load_all(driver, max_tweets):
         driver.execute_script("window.scrollTo({top: document.body.scrollHeight, behavior: 'smooth'})")
         
         # Pausa dinâmica baseada no carregamento
-        wait_time = random.uniform(6, 12)  # Pausa maior entre rolagens
+        wait_time = random.uniform(*SCROLL_PAUSE)  # Pausa maior entre rolagens
         print(f"⏳ Aguardando {wait_time:.1f} segundos para carregamento...")
         time.sleep(wait_time)
         
@@ -88,38 +126,35 @@ def scroll_to_load_all(driver, max_tweets):
         try:   # Verificação adicional de erros do Twitter
             error_msg = driver.find_element(By.XPATH, '//*[contains(text(), "Something went wrong")]')
             if error_msg:
-                print("⚠️ Erro detectado - aguardando 20 segundos")
-                time.sleep(20)
+                print(f"⚠️ Erro detectado - aguardando {PAUSA_APOS_ERRO} segundos")
+                time.sleep(PAUSA_APOS_ERRO)
                 driver.refresh()
-                time.sleep(10)
+                time.sleep(PAUSA_APOS_ERRO_RECARREGAR)
                 no_new_scrolls = 0  # Reseta o contador
         except NoSuchElementException:
             pass
 
-        # Verificação de rate limit
+        # Verificação de rate limit: o agendador recua só este navegador e
+        # devolve a janela para a fila
         if "rate limit" in driver.page_source.lower():
-            print("⏳ Rate limit detectado - aguardando 5 minutos...")
-            time.sleep(300)
-            driver.refresh()
-            time.sleep(10)
-            no_new_scrolls = 0  # Reseta o contador
+            print("⏳ Rate limit detectado")
+            raise RateLimited()
         scroll_attempts += 1
 
     print(f"🛑 Finalizado após {scroll_attempts} rolagens. Total de tweets: {previous_count}")
 
 def should_skip_user(username):
     """Filtra apenas usuários que são exatamente o termo de busca"""
-    username_lower = username.lower()
-    return username_lower == f"@{SEARCH_TERMS[0].lower()}"
+    return tweet_records.should_skip_user(username, SEARCH_TERMS[0])
 
-def fetch_tweets_from_search(driver, existing_tweets):
+def fetch_tweets_from_search(driver):
     tweets_elements = driver.find_elements(By.CSS_SELECTOR, 'article[data-testid="tweet"]')
     results = []
     
     for tweet in tweets_elements:
         try:
             driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", tweet)
-            time.sleep(random.uniform(5, 10))
+            time.sleep(random.uniform(*PAUSA_POR_TWEET))
             
             user_section = WebDriverWait(tweet, 2).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, 'div[data-testid="User-Name"]'))
@@ -181,14 +216,52 @@ def fetch_tweets_from_search(driver, existing_tweets):
     print(f"📊 Tweets encontrados: {len(tweets_elements)}, Após filtro: {len(results)}")
     return results
 
-def salvar_tweets(tweets, existing_tweets, periodo):
+# Extrai de uma vez todos os tweets carregados: mesmos seletores da
+# extração campo a campo, mas sem uma ida e volta ao WebDriver por campo
+EXTRAIR_TWEETS_JS = """
+const perfis = raiz => Array.from(raiz.querySelectorAll('a[href*="/"]'))
+    .map(a => a.href)
+    .filter(href => !href.includes('/status/'));
+return JSON.stringify(
+    Array.from(document.querySelectorAll('article[data-testid="tweet"]')).map(tweet => {
+        const usuario = tweet.querySelector('div[data-testid="User-Name"]');
+        const hora = tweet.querySelector('time');
+        const texto = tweet.querySelector('div[data-testid="tweetText"]');
+        const resposta = tweet.querySelector('div[data-testid="reply"]');
+        return {
+            author: usuario ? (perfis(usuario)[0] || null) : null,
+            date: hora ? (hora.getAttribute('datetime') || '') : '',
+            text: texto ? texto.innerText : '',
+            mentions: perfis(tweet),
+            reply_to: resposta ? perfis(resposta) : [],
+        };
+    })
+);
+"""
+
+
+def extrair_tweets_em_lote(driver):
+    """
+    Lê todos os tweets carregados na página com um único `execute_script`.
+
+    Returns:
+        list: Dicts {author, date, text, mentions, reply_to}, com os links
+        de perfil ainda como URLs
+    """
+    return json.loads(driver.execute_script(EXTRAIR_TWEETS_JS) or "[]")
+
+
+def salvar_tweets(tweets, indice, periodo, parquet=None, inicio=None):
     """
     Salva tweets no arquivo CSV, evitando duplicatas.
     
     Args:
         tweets: Lista de tweets a serem salvos (cada tweet é uma tupla)
-        existing_tweets: Conjunto de tweets já existentes
+        indice: DedupIndex com os tweets já existentes (comparados com os @
+            em minúsculas)
         periodo: String com o período sendo processado (para logs)
+        parquet: ParquetWindowWriter opcional que também recebe os tweets novos
+        inicio: Data de início da janela (partição do Parquet)
     
     Returns:
         int: Número de tweets novos salvos (0 se nenhum novo)
@@ -201,8 +274,10 @@ def salvar_tweets(tweets, existing_tweets, periodo):
                 writer.writerow(["source", "target", "tweet_text", "tweet_date"])
             print(f"🆕 Arquivo CSV criado: {CSV_PATH}")
 
-        # Filtra tweets que ainda não existem
-        new_tweets = [t for t in tweets if t not in existing_tweets]
+        # Filtra tweets que ainda não existem (busca no índice de hashes)
+        hashes = tweet_hashes(tweets)
+        novos = indice.missing(hashes)
+        new_tweets = [t for t, novo in zip(tweets, novos) if novo]
         count = len(new_tweets)
         
         if count > 0:
@@ -210,10 +285,14 @@ def salvar_tweets(tweets, existing_tweets, periodo):
             with open(CSV_PATH, 'a', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 writer.writerows(new_tweets)  # Mais eficiente que writerow em loop
+            if parquet is not None:
+                parquet.write(new_tweets, inicio)
             
             print(f"✅ [{periodo}] {count} tweets novos salvos")
-            # Atualiza o conjunto de tweets existentes
-            existing_tweets.update(new_tweets)
+            # Atualiza o índice só depois de gravar no CSV
+            indice.add(hashes[novos])
+            if indice.needs_save():
+                indice.save(os.path.getsize(CSV_PATH))
         else:
             print(f"ℹ️ [{periodo}] Nenhum tweet novo para salvar")
         
@@ -231,98 +310,164 @@ def daterange(start_date, end_date, step_days):
         current += timedelta(days=step_days + 1)
 
 
-def main():
-    # Configurações do Chrome (mantidas)
+def criar_driver():
+    """Cria um navegador Chrome com as opções da coleta."""
     chrome_options = webdriver.ChromeOptions()
     chrome_options.add_argument("--start-maximized")
     chrome_options.add_argument("--window-size=1200,900")
     chrome_options.add_argument("--disable-infobars")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    
-    driver = webdriver.Chrome(options=chrome_options)
+    return webdriver.Chrome(options=chrome_options)
+
+
+def url_de_busca(start, end, base_url=BASE_URL):
+    """URL da busca ao vivo pelos termos no período [start, end]."""
+    query = " OR ".join([f'"{term}"' if " " in term else term for term in SEARCH_TERMS])
+    return f"{base_url}/search?q={query}%20since%3A{start.date()}%20until%3A{end.date()}&src=typed_query&f=live"
+
+
+def coletar_janela(driver, janela, indice, base_url=BASE_URL, parquet=None):
+    """
+    Coleta e salva os tweets de uma janela de datas.
+
+    Args:
+        driver: WebDriver deste trabalhador
+        janela: Window com o período
+        indice: DedupIndex dos tweets já salvos (compartilhado)
+        base_url: Endereço do site (ex: um servidor HTML local nos testes)
+        parquet: ParquetWindowWriter opcional (cópia colunar da janela)
+
+    Returns:
+        int: Número de tweets novos salvos
+
+    Raises:
+        RateLimited: Se o site limitar as requisições
+        TimeoutException: Se a busca não carregar nem após recarregar a página
+    """
+    driver.get(url_de_busca(janela.start, janela.end, base_url))
+    time.sleep(random.uniform(*PAUSA_APOS_ABRIR))
 
+    try:
+        WebDriverWait(driver, 20).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, 'article[data-testid="tweet"]'))
+        )
+    except TimeoutException:
+        print("⚠️ Timeout ao abrir busca — tentando recarregar")
+        driver.refresh()
+        time.sleep(random.uniform(*PAUSA_APOS_RECARREGAR))
+        # Sem sucesso, a exceção devolve a janela ao agendador (nova tentativa)
+        WebDriverWait(driver, 30).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, 'article[data-testid="tweet"]'))
+        )
+
+    if not wait_for_tweets(driver):
+        raise TimeoutException("tweets não carregaram")
+
+    if EXTRACAO_EM_LOTE:
+        # A linha do tempo descarta tweets que saem da tela: os registros de
+        # cada página carregada são acumulados antes de converter
+        registros = {}
+
+        def coletar_pagina(d):
+            for registro in extrair_tweets_em_lote(d):
+                registros[(registro["author"], registro["date"], registro["text"])] = registro
+
+        scroll_to_load_all(driver, MAX_TWEETS, on_page=coletar_pagina)
+        coletar_pagina(driver)
+        tweets = tweets_de_registros(registros.values(), SEARCH_TERMS[0])
+        print(f"📊 Tweets encontrados: {len(registros)}, Após filtro: {len(tweets)}")
+    else:
+        scroll_to_load_all(driver, MAX_TWEETS)
+        tweets = fetch_tweets_from_search(driver)
+    with _csv_lock:
+        return salvar_tweets(
+            tweets, indice, f"{janela.start.date()} a {janela.end.date()}", parquet, janela.start
+        )
+
+
+def criar_csv(state_path=ESTADO_PATH):
+    """
+    (Re)cria o CSV só com o cabeçalho.
+
+    Os tweets das janelas já concluídas não estão mais no CSV novo, então o
+    estado das janelas e o índice de duplicatas também são descartados: a
+    coleta recomeça do início do período.
+    """
+    with open(CSV_PATH, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["source", "target", "tweet_text", "tweet_date"])
+    if state_path and os.path.exists(state_path):
+        os.remove(state_path)
+        print(f"🗑️ Estado das janelas descartado: {state_path}")
+    DedupIndex.remove(INDICE_PATH)
+
+
+def main(workers=NUM_NAVEGADORES, base_url=BASE_URL, driver_factory=criar_driver, state_path=ESTADO_PATH):
+    """
+    Coleta todas as janelas de SINCE a UNTIL com vários navegadores.
+
+    A situação de cada janela fica em `state_path`: rodar de novo retoma a
+    coleta das janelas que ainda não foram concluídas.
+
+    Args:
+        workers: Número de navegadores em paralelo
+        base_url: Endereço do site (ex: um servidor HTML local nos testes)
+        driver_factory: Função que cria um WebDriver
+        state_path: Arquivo JSON com a situação das janelas
+    """
     # 🔧 Garante que o CSV será criado antes de qualquer leitura
     if not os.path.exists(CSV_PATH):
-        with open(CSV_PATH, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(["source", "target", "tweet_text", "tweet_date"])
+        criar_csv(state_path)
         print(f"🆕 Arquivo CSV inicial criado: {CSV_PATH}")
 
-    # Tratamento do CSV existente
-    existing_tweets = set()
+    # Tratamento do CSV existente: só o cabeçalho é lido
     try:
-        df_existing = pd.read_csv(CSV_PATH)
+        df_existing = pd.read_csv(CSV_PATH, nrows=0)
         required_columns = {'source', 'target', 'tweet_text', 'tweet_date'}
         
         if not required_columns.issubset(df_existing.columns):
             print("⚠️ Arquivo CSV corrompido - recriando")
-            os.remove(CSV_PATH)
-            with open(CSV_PATH, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(["source", "target", "tweet_text", "tweet_date"])
-        else:
-            existing_tweets = {
-                (str(row["source"]).lower(),
-                 str(row["target"]).lower() if pd.notna(row["target"]) else "",
-                 str(row["tweet_text"]),
-                 str(row["tweet_date"]))
-                for _, row in df_existing.iterrows()
-            }
-            print(f"📂 {len(existing_tweets)} tweets carregados")
+            criar_csv(state_path)
 
     except Exception as e:
         print(f"⚠️ Erro ao ler CSV: {e} - Recriando")
-        os.remove(CSV_PATH)
-        with open(CSV_PATH, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(["source", "target", "tweet_text", "tweet_date"])
+        criar_csv(state_path)
 
-    # Loop de coleta
+    # As duplicatas são verificadas pelo índice de hashes (reconstruído se
+    # estiver desatualizado). Um índice ilegível é apagado e refeito a partir
+    # do CSV, que nunca é descartado por causa do índice
     try:
-        count = 0
-        for start, end in daterange(datetime.strptime(SINCE, "%Y-%m-%d"), 
-                                    datetime.strptime(UNTIL, "%Y-%m-%d"), 
-                                    WINDOW_DAYS):
-            if count >= MAX_TWEETS:
-                break
-
-            print(f"\n📅 Período: {start.date()} a {end.date()}")
-            
-            query = " OR ".join([f'"{term}"' if " " in term else term for term in SEARCH_TERMS])
-            url = f"https://x.com/search?q={query}%20since%3A{start.date()}%20until%3A{end.date()}&src=typed_query&f=live"
-            driver.get(url)
-            time.sleep(random.uniform(10, 30))
-
-            try:
-                WebDriverWait(driver, 20).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'article[data-testid="tweet"]'))
-                )
-            except TimeoutException:
-                print("⚠️ Timeout ao abrir busca — tentando recarregar")
-                driver.refresh()
-                time.sleep(random.uniform(16, 40))
-                try:
-                    WebDriverWait(driver, 30).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, 'article[data-testid="tweet"]'))
-                    )
-                except TimeoutException:
-                    print("❌ Ainda sem sucesso — pulando período")
-                    continue
-
-            if not wait_for_tweets(driver):
-                continue
-
-            scroll_to_load_all(driver, MAX_TWEETS - count)
-            tweets = fetch_tweets_from_search(driver, existing_tweets)
-            count += salvar_tweets(tweets, existing_tweets, f"{start.date()} a {end.date()}")
-
-            intervalo = random.uniform(10, 40)
-            print(f"⏸️ Aguardando {intervalo:.1f} segundos antes da próxima janela...")
-            time.sleep(intervalo)
-
+        indice = DedupIndex.open(INDICE_PATH, CSV_PATH)
+    except Exception as e:
+        print(f"⚠️ Erro ao abrir o índice: {e} - reconstruindo a partir do CSV")
+        DedupIndex.remove(INDICE_PATH)
+        indice = DedupIndex.open(INDICE_PATH, CSV_PATH)
+    print(f"📂 {len(indice)} tweets no índice")
+
+    parquet = ParquetWindowWriter(PARQUET_DIR) if SALVAR_PARQUET else None
+
+    # Coleta paralela: cada navegador pega a próxima janela pendente
+    janelas = [
+        Window(start, end)
+        for start, end in daterange(datetime.strptime(SINCE, "%Y-%m-%d"),
+                                    datetime.strptime(UNTIL, "%Y-%m-%d"),
+                                    WINDOW_DAYS)
+    ]
+    scheduler = WindowScheduler(
+        lambda driver, janela: coletar_janela(driver, janela, indice, base_url, parquet),
+        driver_factory,
+        workers=workers,
+        state_path=state_path,
+        max_items=MAX_TWEETS,  # janelas já em andamento ainda podem passar um pouco do limite
+        pause=PAUSA_ENTRE_JANELAS,
+        backoff=(RECUO_INICIAL, RECUO_MAXIMO),
+    )
+    try:
+        count = scheduler.run(janelas)
     finally:
-        driver.quit()
-        print(f"\n✅ Total de tweets salvos: {count}")
+        with _csv_lock:
+            indice.save(os.path.getsize(CSV_PATH))
+    print(f"\n✅ Total de tweets salvos: {count}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,330 @@
+"""
+Backend de matriz esparsa (CSR) para PageRank, Katz e centralidade de autovetor.
+
+O grafo é convertido uma única vez numa matriz de adjacência esparsa do SciPy
+(com um índice nó -> linha) e as métricas rodam como iterações de potência
+vetorizadas. A memória fica em O(n + m), ao contrário de
+`nx.katz_centrality_numpy`, que monta uma matriz densa n x n.
+
+PageRank e autovetor aceitam um vetor inicial (`nstart`), normalmente o
+resultado anterior para o mesmo grafo ou para uma versão próxima dele (ver
+metric_engine), e recorrem a um solver de Krylov (BiCGSTAB / ARPACK) quando a
+iteração de potência não converge em `max_iter` passos.
+"""
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import ArpackError, ArpackNoConvergence, bicgstab, eigs
+
+
+class CSRAdjacency:
+    """
+    Matriz de adjacência CSR de um grafo dirigido com seu índice de nós.
+
+    Attributes:
+        matrix: scipy.sparse.csr_array n x n, com A[i, j] = peso da aresta i -> j
+        nodes: Lista de rótulos na ordem das linhas da matriz
+        index: Dict rótulo -> linha
+    """
+
+    def __init__(self, matrix, nodes):
+        self.matrix = matrix
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self._transpose = None
+        self._spectral_radius = None
+        self._successors = None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def transpose(self):
+        """A^T em CSR (arestas de entrada por linha), calculada uma vez."""
+        if self._transpose is None:
+            self._transpose = self.matrix.T.tocsr()
+        return self._transpose
+
+    def successor_lists(self):
+        """Listas Python de sucessores por linha, para buscas nó a nó (BFS)."""
+        if self._successors is None:
+            indptr = self.matrix.indptr
+            indices = self.matrix.indices.tolist()
+            self._successors = [
+                indices[indptr[i]:indptr[i + 1]] for i in range(len(self.nodes))
+            ]
+        return self._successors
+
+    def to_dict(self, values):
+        """Converte um vetor indexado pelas linhas num dict rótulo -> valor."""
+        return dict(zip(self.nodes, values.tolist()))
+
+
+def to_csr(G, weight=None):
+    """
+    Converte um grafo NetworkX numa CSRAdjacency.
+
+    Args:
+        G: Grafo NetworkX (dirigido ou não)
+        weight: Atributo de aresta usado como peso (None = peso 1)
+
+    Returns:
+        CSRAdjacency: Matriz esparsa e índice de nós
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+    if n == 0:
+        return CSRAdjacency(sp.csr_array((0, 0), dtype=np.float64), nodes)
+    matrix = nx.to_scipy_sparse_array(
+        G, nodelist=nodes, weight=weight, dtype=np.float64, format="csr"
+    )
+    return CSRAdjacency(matrix, nodes)
+
+
+def to_undirected(adj):
+    """
+    Adjacência não dirigida (simétrica, sem pesos) de uma CSRAdjacency.
+
+    Args:
+        adj: CSRAdjacency de um grafo dirigido
+
+    Returns:
+        CSRAdjacency: Matriz A + A^T binarizada, com o mesmo índice de nós
+    """
+    A = adj.matrix
+    matrix = sp.csr_array(A + A.T)
+    matrix.data[:] = 1.0
+    return CSRAdjacency(matrix, adj.nodes)
+
+
+def spectral_radius(adj, tol=1e-3):
+    """
+    Estima o raio espectral (maior |autovalor|) da matriz de adjacência.
+
+    Usa o ARPACK; se ele não convergir, recorre ao limite superior
+    min(maior grau de saída, maior grau de entrada), que é sempre seguro
+    para escolher o alfa de Katz.
+
+    Args:
+        adj: CSRAdjacency do grafo
+        tol: Tolerância relativa do ARPACK
+
+    Returns:
+        float: Estimativa do raio espectral (0.0 para grafos sem arestas)
+    """
+    if adj._spectral_radius is not None:
+        return adj._spectral_radius
+
+    A = adj.matrix
+    n = A.shape[0]
+    if A.nnz == 0:
+        radius = 0.0
+    else:
+        upper_bound = min(A.sum(axis=1).max(), A.sum(axis=0).max())
+        try:
+            if n < 3:
+                values = np.linalg.eigvals(A.toarray())
+            else:
+                values = eigs(A, k=1, which="LM", tol=tol, return_eigenvectors=False)
+            radius = float(np.abs(values).max())
+        except (ArpackNoConvergence, ArpackError):
+            radius = float(upper_bound)
+        radius = min(radius, float(upper_bound))
+    adj._spectral_radius = radius
+    return radius
+
+
+def pagerank(adj, alpha=0.85, max_iter=100, tol=1.0e-6, nstart=None):
+    """
+    PageRank por iteração de potência esparsa (mesma convenção do nx.pagerank).
+
+    A massa dos nós sem arestas de saída é redistribuída uniformemente.
+
+    Args:
+        adj: CSRAdjacency do grafo
+        alpha: Fator de amortecimento
+        max_iter: Número máximo de iterações de potência
+        tol: Tolerância (erro L1 < n * tol)
+        nstart: Vetor inicial alinhado às linhas de `adj` (None = uniforme)
+
+    Returns:
+        dict: Nó -> PageRank
+
+    Raises:
+        nx.PowerIterationFailedConvergence: Se nem a iteração nem o solver
+            linear convergirem
+    """
+    if len(adj) == 0:
+        return {}
+    x, _ = pagerank_vector(adj.matrix, alpha=alpha, max_iter=max_iter, tol=tol, nstart=nstart)
+    return adj.to_dict(x)
+
+
+def _start_vector(n, nstart):
+    """Vetor inicial somando 1 (uniforme se `nstart` for None ou nulo)."""
+    if nstart is not None:
+        x = np.abs(np.asarray(nstart, dtype=np.float64))
+        if x.sum() > 0:
+            return x / x.sum()
+    return np.full(n, 1.0 / n)
+
+
+def pagerank_vector(A, alpha=0.85, max_iter=100, tol=1.0e-6, nstart=None):
+    """
+    PageRank sobre uma matriz esparsa, partindo de `nstart`.
+
+    Se a iteração de potência não convergir (ex: alfa perto de 1), resolve o
+    sistema linear equivalente (I - alfa P^T) y = 1, com P sem as linhas dos
+    nós sem saída, por BiCGSTAB a partir do último iterado; y normalizado
+    para somar 1 é o mesmo PageRank.
+
+    Args:
+        A: Matriz de adjacência scipy (n x n, linha = origem)
+        alpha: Fator de amortecimento
+        max_iter: Número máximo de iterações de potência
+        tol: Tolerância (erro L1 < n * tol)
+        nstart: Vetor inicial (ex: o PageRank de uma versão anterior do
+            grafo); é normalizado para somar 1. None = uniforme
+
+    Returns:
+        tuple: (vetor de PageRank, número de iterações usadas)
+
+    Raises:
+        nx.PowerIterationFailedConvergence: Se nem a iteração nem o solver
+            linear convergirem
+    """
+    n = A.shape[0]
+    out_strength = np.asarray(A.sum(axis=1)).ravel()
+    dangling = out_strength == 0
+    inv_out = np.divide(1.0, out_strength, out=np.zeros(n), where=~dangling)
+    # P^T com as linhas de A normalizadas (matriz de transição por coluna)
+    transition_T = (sp.diags_array(inv_out) @ A).T.tocsr()
+
+    x = _start_vector(n, nstart)
+    for iteration in range(1, max_iter + 1):
+        x_last = x
+        x = alpha * (transition_T @ x_last)
+        x += (alpha * x_last[dangling].sum() + (1.0 - alpha)) / n
+        if np.abs(x - x_last).sum() < n * tol:
+            return x, iteration
+
+    steps = []
+    system = sp.identity(n, format="csr") - alpha * transition_T
+    y, info = bicgstab(
+        system, np.ones(n), x0=x * n, rtol=tol, maxiter=10 * max_iter,
+        callback=lambda _: steps.append(1),
+    )
+    if info != 0 or not np.all(np.isfinite(y)) or y.sum() <= 0:
+        raise nx.PowerIterationFailedConvergence(max_iter)
+    return np.maximum(y, 0) / np.maximum(y, 0).sum(), max_iter + len(steps)
+
+
+def katz(adj, alpha=None, beta=1.0, max_iter=1000, tol=1.0e-6, normalized=True):
+    """
+    Centralidade de Katz por iteração esparsa x <- alfa * A^T x + beta.
+
+    Se `alpha` não for informado, usa min(0.1, 0.9 / raio espectral): o padrão
+    do NetworkX quando ele é válido, e um valor que garante convergência caso
+    contrário.
+
+    Args:
+        adj: CSRAdjacency do grafo
+        alpha: Fator de atenuação (None = derivado do raio espectral)
+        beta: Centralidade base de cada nó
+        max_iter: Número máximo de iterações
+        tol: Tolerância (erro L1 < n * tol)
+        normalized: Normaliza o vetor pela norma euclidiana
+
+    Returns:
+        dict: Nó -> centralidade de Katz
+
+    Raises:
+        nx.PowerIterationFailedConvergence: Se não convergir em max_iter
+    """
+    n = len(adj)
+    if n == 0:
+        return {}
+    if alpha is None:
+        radius = spectral_radius(adj)
+        alpha = 0.1 if radius == 0 else min(0.1, 0.9 / radius)
+
+    A_T = adj.transpose
+    x = np.zeros(n)
+    for _ in range(max_iter):
+        x_last = x
+        x = alpha * (A_T @ x_last) + beta
+        if np.abs(x - x_last).sum() < n * tol:
+            if normalized:
+                x = x / np.linalg.norm(x)
+            return adj.to_dict(x)
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+
+def eigenvector(adj, max_iter=100, tol=1.0e-6, nstart=None):
+    """
+    Centralidade de autovetor por iteração de potência esparsa.
+
+    Segue a formulação do nx.eigenvector_centrality: itera x <- (A^T + I) x,
+    cujo deslocamento evita oscilação em grafos bipartidos, e normaliza pela
+    norma euclidiana. Se a iteração estagnar (autovalores dominantes muito
+    próximos), recorre ao ARPACK (Arnoldi implicitamente reiniciado) a partir
+    do último iterado.
+
+    Args:
+        adj: CSRAdjacency do grafo
+        max_iter: Número máximo de iterações de potência
+        tol: Tolerância (erro L1 < n * tol)
+        nstart: Vetor inicial alinhado às linhas de `adj` (None = uniforme)
+
+    Returns:
+        dict: Nó -> centralidade de autovetor
+
+    Raises:
+        nx.PowerIterationFailedConvergence: Se nem a iteração nem o ARPACK
+            encontrarem um autovetor de Perron bem definido
+    """
+    n = len(adj)
+    if n == 0:
+        raise nx.NetworkXPointlessConcept("não é possível calcular a centralidade de um grafo vazio")
+    A_T = adj.transpose
+    x = _start_vector(n, nstart)
+    for _ in range(max_iter):
+        x_last = x
+        x = x_last + A_T @ x_last
+        norm = np.linalg.norm(x)
+        x = x / (norm if norm > 0 else 1.0)
+        if np.abs(x - x_last).sum() < n * tol:
+            return adj.to_dict(x)
+    return adj.to_dict(_perron_vector(A_T, x, max_iter, tol))
+
+
+def _perron_vector(A_T, v0, max_iter, tol):
+    """
+    Autovetor dominante (de Perron) de A^T pelo ARPACK.
+
+    Raises:
+        nx.PowerIterationFailedConvergence: Se o ARPACK não convergir ou o
+            autovetor não for bem definido (raio espectral nulo, como num
+            grafo acíclico, ou autovalor dominante repetido)
+    """
+    n = A_T.shape[0]
+    # Sem ciclos (todo componente forte é um nó só) o raio espectral é zero
+    if connected_components(A_T, directed=True, connection="strong")[0] == n:
+        raise nx.PowerIterationFailedConvergence(max_iter)
+    try:
+        if n < 3:
+            values, vectors = np.linalg.eig(A_T.toarray())
+        else:
+            values, vectors = eigs(A_T, k=1, which="LR", v0=v0, tol=tol, maxiter=10 * max_iter)
+    except (ArpackNoConvergence, ArpackError):
+        raise nx.PowerIterationFailedConvergence(max_iter)
+
+    best = int(np.argmax(values.real))
+    x = vectors[:, best].real
+    x = x * np.sign(x.sum())
+    if abs(values[best].imag) > tol or (x < -tol * np.abs(x).max()).any():
+        raise nx.PowerIterationFailedConvergence(max_iter)
+    x = np.maximum(x, 0)
+    return x / np.linalg.norm(x)
@@ -0,0 +1,117 @@
+"""
+Fixtures compartilhadas: servidor HTML local que imita a busca do X e um
+navegador headless para os testes do scraper.
+
+Os testes que precisam do Selenium (ou de um Chrome instalado) são pulados
+quando eles não estão disponíveis; os do agendador rodam só com a biblioteca
+padrão.
+"""
+
+import html
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def artigo(autor, data, texto, resposta_a=(), mencoes=()):
+    """HTML de um tweet com a mesma estrutura (data-testid) da página do X."""
+    respostas = "".join(f'<a href="/{u}">@{u}</a> ' for u in resposta_a)
+    links = "".join(f'<a href="/{u}?src=hashtag_click">@{u}</a> ' for u in mencoes)
+    return (
+        '<article data-testid="tweet">'
+        f'<div data-testid="User-Name"><a href="/{autor}">{autor}</a>'
+        f'<a href="/{autor}/status/1"><time datetime="{data}">{data[:10]}</time></a></div>'
+        + (f'<div data-testid="reply">Em resposta a {respostas}</div>' if resposta_a else "")
+        + f'<div data-testid="tweetText">{html.escape(texto)} {links}</div>'
+        "</article>"
+    )
+
+
+def pagina(artigos, aviso=""):
+    return f"<html><body><main>{''.join(artigos)}<div>{aviso}</div></main></body></html>"
+
+
+class StubSearchServer:
+    """
+    Servidor HTTP local com uma página de busca por janela de datas.
+
+    Cada requisição a /search é registrada pela data `since:` da URL. As
+    janelas em `rate_limited` respondem uma vez com o aviso de rate limit
+    (junto com os tweets, como o site faz ao rolar) e depois normalmente.
+
+    Attributes:
+        url: Endereço base (http://127.0.0.1:porta)
+        requests: Datas `since` pedidas, na ordem
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.rate_limited = set()
+        self._lock = threading.Lock()
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                since = re.search(r"since:(\d{4}-\d{2}-\d{2})", unquote(self.path))
+                body = servidor.responder(since.group(1) if since else None).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def responder(self, since):
+        with self._lock:
+            self.requests.append(since)
+            limitado = since in self.rate_limited
+            self.rate_limited.discard(since)
+        artigos = [
+            artigo(f"autor_{since}", f"{since}T12:00:00.000Z", f"tweet de {since}", mencoes=["alvo"])
+        ]
+        return pagina(artigos, "Rate limit exceeded" if limitado else "")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    with StubSearchServer() as servidor:
+        yield servidor
+
+
+@pytest.fixture
+def chrome_factory():
+    """Fábrica de Chrome headless; pula o teste sem Selenium ou sem navegador."""
+    webdriver = pytest.importorskip("selenium.webdriver")
+
+    def criar():
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        return webdriver.Chrome(options=options)
+
+    try:
+        criar().quit()
+    except Exception as e:
+        pytest.skip(f"Chrome indisponível: {e}")
+    return criar
@@ -0,0 +1,105 @@
+"""
+Índice de duplicatas do scraper (DedupIndex e BloomFilter), sem navegador:
+lotes novos e repetidos, gravação, reabertura pelo .npy mapeado e
+reconstrução quando o CSV muda por fora.
+"""
+
+import csv
+
+import numpy as np
+
+from dedup_index import BloomFilter, DedupIndex, tweet_hashes
+
+TWEETS = [
+    ("@ana", "@bia", "Lei Rouanet", "2021-03-01T10:00:00.000Z"),
+    ("@ana", "@caio", "Lei Rouanet", "2021-03-01T10:00:00.000Z"),
+    ("@davi", "", "Sem menção", "2021-03-02T09:30:00.000Z"),
+]
+
+
+def escrever_csv(caminho, linhas):
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["source", "target", "tweet_text", "tweet_date"])
+        writer.writerows(linhas)
+
+
+def test_missing_e_add():
+    indice = DedupIndex()
+    hashes = tweet_hashes(TWEETS)
+
+    # Repetição dentro do lote conta só na primeira ocorrência
+    lote = np.concatenate([hashes, hashes[:1]])
+    assert indice.missing(lote).tolist() == [True, True, True, False]
+
+    indice.add(lote)
+    assert len(indice) == 3
+    assert not indice.missing(hashes).any()
+    novo = tweet_hashes([("@eva", "@ana", "Outro", "2021-03-03T00:00:00.000Z")])
+    assert indice.missing(novo).tolist() == [True]
+
+
+def test_caixa_dos_arrobas_nao_diferencia():
+    maiusculas = [(s.upper(), t.upper(), texto, data) for s, t, texto, data in TWEETS]
+    assert (tweet_hashes(maiusculas) == tweet_hashes(TWEETS)).all()
+
+
+def test_indice_vazio():
+    indice = DedupIndex()
+    assert len(indice) == 0
+    assert indice.contains(tweet_hashes(TWEETS)).tolist() == [False] * 3
+
+
+def test_salva_e_reabre_mapeado(tmp_path):
+    csv_path, npy = tmp_path / "tweets.csv", str(tmp_path / "indice.npy")
+    escrever_csv(csv_path, TWEETS[:2])
+
+    indice = DedupIndex.open(npy, str(csv_path))
+    assert len(indice) == 2
+    indice.add(tweet_hashes(TWEETS[2:]))
+    escrever_csv(csv_path, TWEETS)
+    indice.save(csv_path.stat().st_size)
+
+    reaberto = DedupIndex.open(npy, str(csv_path))
+    assert isinstance(reaberto._sorted, np.memmap)
+    assert len(reaberto) == 3
+    assert not reaberto.missing(tweet_hashes(TWEETS)).any()
+
+    # Sem hashes novos, salvar de novo só atualiza o tamanho do CSV
+    reaberto.save(csv_path.stat().st_size)
+    assert isinstance(reaberto._sorted, np.memmap)
+
+
+def test_reconstroi_quando_o_csv_muda(tmp_path):
+    csv_path, npy = tmp_path / "tweets.csv", str(tmp_path / "indice.npy")
+    escrever_csv(csv_path, TWEETS[:1])
+    assert len(DedupIndex.open(npy, str(csv_path))) == 1
+
+    # Linhas gravadas no CSV sem passar pelo índice (ex: coleta interrompida)
+    escrever_csv(csv_path, TWEETS)
+    reconstruido = DedupIndex.open(npy, str(csv_path))
+    assert len(reconstruido) == 3
+    assert not reconstruido.missing(tweet_hashes(TWEETS)).any()
+
+
+def test_remove_apaga_os_arquivos_do_indice(tmp_path):
+    csv_path, npy = tmp_path / "tweets.csv", tmp_path / "indice.npy"
+    escrever_csv(csv_path, TWEETS)
+    DedupIndex.open(str(npy), str(csv_path))
+
+    DedupIndex.remove(str(npy))
+    assert not npy.exists()
+    assert not (tmp_path / "indice.npy.json").exists()
+    assert csv_path.exists()
+
+
+def test_bloom_sem_falsos_negativos():
+    rng = np.random.default_rng(0)
+    presentes = rng.integers(0, 2**63, size=5000, dtype=np.uint64)
+    ausentes = rng.integers(0, 2**63, size=5000, dtype=np.uint64)
+    bloom = BloomFilter(len(presentes))
+    bloom.add(presentes)
+
+    assert bloom.might_contain(presentes).all()
+    # ~1% de falsos positivos com BITS_POR_ITEM = 10
+    assert bloom.might_contain(ausentes).mean() < 0.05
@@ -0,0 +1,47 @@
+"""
+Extração em lote (EXTRAIR_TWEETS_JS + tweets_de_registros) contra a extração
+campo a campo (fetch_tweets_from_search) numa página fixa de busca.
+
+Precisa do Selenium e de um Chrome; sem eles o teste é pulado.
+"""
+
+import os
+
+import pytest
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "busca.html")
+
+ESPERADO = sorted(
+    [
+        ("@ana", "@bruno", "Lei Rouanet @bruno @carla", "2021-03-01T10:00:00.000Z"),
+        ("@ana", "@carla", "Lei Rouanet @bruno @carla", "2021-03-01T10:00:00.000Z"),
+        ("@ana", "@davi", "Lei Rouanet @bruno @carla", "2021-03-01T10:00:00.000Z"),
+        # Autor @rouanet (termo de busca) ignorado; auto-menção e @Rouanet filtrados
+        ("@eva", "", "Eu mesma @eva", "2021-03-02T09:30:00.000Z"),
+        ("@fabio", "", "Sem ninguém marcado", "2021-03-03T18:45:00.000Z"),
+        ("@gil", "@ana", "Concordo @hugo", "2021-03-04T07:15:00.000Z"),
+        ("@gil", "@hugo", "Concordo @hugo", "2021-03-04T07:15:00.000Z"),
+    ]
+)
+
+
+@pytest.fixture
+def pagina_de_busca(chrome_factory):
+    driver = chrome_factory()
+    try:
+        driver.get(f"file://{FIXTURE}")
+        yield driver
+    finally:
+        driver.quit()
+
+
+def test_lote_igual_a_extracao_por_campo(pagina_de_busca, monkeypatch):
+    scraper = pytest.importorskip("scrapper_tweet_sel_rouanet")
+    monkeypatch.setattr(scraper, "PAUSA_POR_TWEET", (0, 0))
+
+    em_lote = scraper.tweets_de_registros(
+        scraper.extrair_tweets_em_lote(pagina_de_busca), scraper.SEARCH_TERMS[0]
+    )
+    por_campo = scraper.fetch_tweets_from_search(pagina_de_busca)
+
+    assert sorted(em_lote) == sorted(por_campo) == ESPERADO
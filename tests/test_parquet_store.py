@@ -0,0 +1,37 @@
+"""
+Gravação particionada por janela (ParquetWindowWriter) e leitura de volta
+com o filtro de período de ingest.read_edge_parquet. Precisa do pyarrow.
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from ingest import read_edge_parquet
+from parquet_store import ParquetWindowWriter
+
+TWEETS = [
+    ("@ana", "@bia", "Lei Rouanet", "2021-03-01T10:00:00.000Z"),
+    ("@davi", "", "Sem menção", "2021-03-02T09:30:00.000Z"),
+    ("@eva", "@ana", "Outra janela", "2021-04-10T08:00:00.000Z"),
+]
+
+
+def test_grava_por_janela_e_le_o_periodo(tmp_path):
+    writer = ParquetWindowWriter(str(tmp_path), batch_rows=1)
+    primeiro = writer.write(TWEETS[:2], "2021-03-01")
+    writer.write(TWEETS[2:], "2021-04-10")
+
+    assert os.path.basename(os.path.dirname(primeiro)) == "janela=2021-03-01"
+    assert writer.write([], "2021-05-01") is None
+    # Nenhum arquivo temporário sobra depois da gravação
+    assert not [n for _, _, arquivos in os.walk(tmp_path) for n in arquivos if n.startswith("_")]
+
+    todos = read_edge_parquet(str(tmp_path), time="tweet_date", dropna=False)
+    assert sorted(todos["source"].astype(str)) == ["@ana", "@davi", "@eva"]
+
+    marco = read_edge_parquet(str(tmp_path), time="tweet_date", since="2021-03-01", until="2021-03-31")
+    # Tweet sem menção: destino nulo, descartado como no CSV
+    assert list(zip(marco["source"].astype(str), marco["target"].astype(str))) == [("@ana", "@bia")]
@@ -0,0 +1,105 @@
+"""
+Agendador de janelas contra o servidor HTML local (ver conftest): retomada de
+uma coleta interrompida e janela devolvida à fila após um rate limit.
+"""
+
+import csv
+from datetime import datetime
+from urllib.request import urlopen
+
+import pytest
+
+from scrape_scheduler import DONE, RateLimited, Window, WindowScheduler, WindowState
+
+JANELAS = [
+    Window(datetime(2020, 1, 1), datetime(2020, 1, 3)),
+    Window(datetime(2020, 1, 4), datetime(2020, 1, 6)),
+    Window(datetime(2020, 1, 7), datetime(2020, 1, 9)),
+    Window(datetime(2020, 1, 10), datetime(2020, 1, 12)),
+]
+
+
+class DriverFalso:
+    def quit(self):
+        pass
+
+
+def buscar_no_servidor(servidor):
+    """Trabalho de uma janela: baixa a busca e conta os tweets da página."""
+
+    def process(driver, janela):
+        url = f"{servidor.url}/search?q=rouanet%20since%3A{janela.start.date()}%20until%3A{janela.end.date()}"
+        with urlopen(url) as resposta:
+            html = resposta.read().decode("utf-8")
+        if "rate limit" in html.lower():
+            raise RateLimited()
+        return html.count('data-testid="tweet"')
+
+    return process
+
+
+def agendador(servidor, **kwargs):
+    return WindowScheduler(
+        buscar_no_servidor(servidor), DriverFalso, pause=(0, 0), backoff=(0, 0), **kwargs
+    )
+
+
+def test_retoma_pulando_janelas_concluidas(tmp_path, stub_server):
+    estado = tmp_path / "janelas.json"
+    WindowState(str(estado)).mark(JANELAS[0], DONE, saved=1)
+
+    total = agendador(stub_server, workers=2, state_path=str(estado)).run(JANELAS)
+
+    assert total == 3
+    assert sorted(stub_server.requests) == ["2020-01-04", "2020-01-07", "2020-01-10"]
+    retomado = WindowState(str(estado))
+    assert [retomado.status(j) for j in JANELAS] == [DONE] * 4
+
+
+def test_rate_limit_devolve_janela_para_a_fila(tmp_path, stub_server):
+    stub_server.rate_limited.add("2020-01-04")
+    estado = tmp_path / "janelas.json"
+
+    total = agendador(stub_server, workers=1, state_path=str(estado)).run(JANELAS)
+
+    assert total == 4
+    assert stub_server.requests.count("2020-01-04") == 2
+    assert WindowState(str(estado)).pending(JANELAS) == []
+
+
+def test_main_com_servidor_local(tmp_path, monkeypatch, stub_server, chrome_factory):
+    scraper = pytest.importorskip("scrapper_tweet_sel_rouanet")
+    # Todas as esperas zeradas: o servidor local responde na hora
+    for nome in ("PAUSA_APOS_ABRIR", "PAUSA_APOS_RECARREGAR", "SCROLL_PAUSE", "PAUSA_ENTRE_JANELAS"):
+        monkeypatch.setattr(scraper, nome, (0, 0))
+    for nome in (
+        "PAUSA_APOS_ERRO", "PAUSA_APOS_ERRO_RECARREGAR", "RETRY_INTERVAL",
+        "ESPERA_NOVOS_TWEETS", "RECUO_INICIAL", "RECUO_MAXIMO",
+    ):
+        monkeypatch.setattr(scraper, nome, 0)
+    monkeypatch.setattr(scraper, "MAX_ROLAGENS_SEM_NOVOS", 1)
+    monkeypatch.setattr(scraper, "SINCE", "2020-01-01")
+    monkeypatch.setattr(scraper, "UNTIL", "2020-01-12")
+    monkeypatch.setattr(scraper, "WINDOW_DAYS", 2)
+    monkeypatch.setattr(scraper, "CSV_PATH", str(tmp_path / "tweets.csv"))
+    monkeypatch.setattr(scraper, "INDICE_PATH", str(tmp_path / "indice.npy"))
+    monkeypatch.setattr(scraper, "SALVAR_PARQUET", False)
+
+    # Coleta anterior interrompida depois da primeira janela
+    with open(scraper.CSV_PATH, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(["source", "target", "tweet_text", "tweet_date"])
+    estado = str(tmp_path / "janelas.json")
+    WindowState(estado).mark(JANELAS[0], DONE, saved=0)
+    stub_server.rate_limited.add("2020-01-07")
+
+    scraper.main(workers=1, base_url=stub_server.url, driver_factory=chrome_factory, state_path=estado)
+
+    assert "2020-01-01" not in stub_server.requests
+    assert stub_server.requests.count("2020-01-07") == 2
+    assert WindowState(estado).pending(JANELAS) == []
+    with open(scraper.CSV_PATH, encoding="utf-8") as f:
+        linhas = list(csv.DictReader(f))
+    assert sorted(linha["source"] for linha in linhas) == [
+        "@autor_2020-01-04", "@autor_2020-01-07", "@autor_2020-01-10",
+    ]
+    assert {linha["target"] for linha in linhas} == {"@alvo"}
@@ -0,0 +1,53 @@
+"""
+Conversão dos registros da extração em lote nas linhas do CSV, com dicts
+no formato de EXTRAIR_TWEETS_JS (sem navegador).
+"""
+
+from tweet_records import extrair_usuario_da_url, should_skip_user, tweets_de_registros
+
+
+def perfil(usuario):
+    return f"https://x.com/{usuario}"
+
+
+def registro(autor, texto="", data="", mencoes=(), resposta_a=()):
+    return {
+        "author": perfil(autor) if autor else None,
+        "date": data,
+        "text": texto,
+        # Como no JS: os links do tweet incluem o próprio autor
+        "mentions": [perfil(autor)] + [f"{perfil(u)}?src=hashtag_click" for u in mencoes],
+        "reply_to": [perfil(u) for u in resposta_a],
+    }
+
+
+def test_extrair_usuario_da_url():
+    assert extrair_usuario_da_url("https://x.com/ana") == "@ana"
+    assert extrair_usuario_da_url("https://x.com/ana?src=hashtag_click") == "@ana"
+
+
+def test_termo_de_busca_ignora_caixa():
+    assert should_skip_user("@Rouanet", "rouanet")
+    assert not should_skip_user("@rouanet_fan", "rouanet")
+
+
+def test_tweets_de_registros():
+    registros = [
+        registro("ana", "Lei Rouanet", "2021-03-01", mencoes=["bruno", "carla"], resposta_a=["davi"]),
+        registro("rouanet", "Perfil do termo de busca", "2021-03-01", mencoes=["ana"]),
+        registro("eva", "Eu mesma", "2021-03-02", mencoes=["eva", "Rouanet"]),
+        registro("gil", "Concordo", "2021-03-04", mencoes=["hugo"], resposta_a=["hugo"]),
+        registro(None, "Sem autor"),
+    ]
+
+    assert tweets_de_registros(registros, "rouanet") == [
+        ("@ana", "@bruno", "Lei Rouanet", "2021-03-01"),
+        ("@ana", "@carla", "Lei Rouanet", "2021-03-01"),
+        ("@ana", "@davi", "Lei Rouanet", "2021-03-01"),
+        ("@eva", "", "Eu mesma", "2021-03-02"),
+        ("@gil", "@hugo", "Concordo", "2021-03-04"),
+    ]
+
+
+def test_campos_ausentes_viram_vazios():
+    assert tweets_de_registros([{"author": "https://x.com/ana"}], "rouanet") == [("@ana", "", "", "")]
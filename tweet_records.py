@@ -0,0 +1,58 @@
+"""
+Regras de conversão dos tweets extraídos da busca nas linhas do CSV.
+
+Separadas do scraper para não depender do Selenium: recebem só URLs e
+dicts (ver `scrapper_tweet_sel_rouanet.extrair_tweets_em_lote`), e podem ser
+testadas sem navegador.
+"""
+
+
+def extrair_usuario_da_url(href):
+    """Extrai @usuario de uma URL, removendo parâmetros como ?src=..."""
+    return "@" + href.split("/")[-1].split("?")[0]
+
+
+def should_skip_user(username, search_term):
+    """Filtra apenas usuários que são exatamente o termo de busca"""
+    return username.lower() == f"@{search_term.lower()}"
+
+
+def tweets_de_registros(registros, search_term):
+    """
+    Converte os registros da extração em lote nas tuplas salvas no CSV.
+
+    Aplica as mesmas regras de `fetch_tweets_from_search`: o autor e as
+    menções passam por `extrair_usuario_da_url` e `should_skip_user`, e um
+    tweet sem menções gera uma linha com target vazio. A lista completa de
+    "and others" das respostas (que exige clicar e abrir um modal) não entra
+    neste modo.
+
+    Args:
+        registros: Dicts {author, date, text, mentions, reply_to}, com os
+            links de perfil como URLs
+        search_term: Termo de busca; o perfil com esse nome é ignorado
+
+    Returns:
+        list: Tuplas (source, target, tweet_text, tweet_date)
+    """
+    results = []
+    for registro in registros:
+        if not registro.get("author"):
+            continue
+        author_handle = extrair_usuario_da_url(registro["author"])
+        if should_skip_user(author_handle, search_term):
+            continue
+
+        mentions = set()
+        for href in registro.get("mentions", []) + registro.get("reply_to", []):
+            mention = extrair_usuario_da_url(href)
+            if mention != author_handle and not should_skip_user(mention, search_term):
+                mentions.add(mention)
+
+        content, tweet_date = registro.get("text") or "", registro.get("date") or ""
+        if mentions:
+            for mention in sorted(mentions):
+                results.append((author_handle, mention, content, tweet_date))
+        else:
+            results.append((author_handle, "", content, tweet_date))
+    return results